@@ -4,14 +4,14 @@ import os
 
 import pandas as pd
 import requests
-from dotenv import load_dotenv
-
-load_dotenv()
 
 def get_series_fred(series_id: str) -> pd.DataFrame:
     """
     Descarga una serie temporal desde la API de FRED y la devuelve como DataFrame.
     """
+    from dotenv import load_dotenv
+
+    load_dotenv()
     api_key = os.getenv("FRED_API_KEY")
     if not api_key:
         raise RuntimeError("FRED_API_KEY is required to refresh FRED data.")
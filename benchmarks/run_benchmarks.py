@@ -0,0 +1,512 @@
+"""Benchmark suite for the engine, narrative, export and ETL hot paths.
+
+Run every case and compare against the stored baseline:
+
+    python benchmarks/run_benchmarks.py
+
+Refresh the stored baseline after an intentional performance change:
+
+    python benchmarks/run_benchmarks.py --save-baseline
+
+Import cost is measured in fresh interpreters with ``python -X importtime``
+and checked against ``IMPORT_BUDGETS``.
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, replace
+from functools import cache
+import json
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import pandas as pd
+
+from quant.macro_engine import (
+    MacroShock,
+    ScenarioResult,
+    ShockChannel,
+    baseline_path,
+    result_to_long_frame,
+    shocks_from_frame,
+    shocks_to_frame,
+    simulate_scenario,
+)
+from quant.backtest import realized_paths, run_backtest
+from quant.core import PolicyRule, ShockArrays, extended_profiles, simulate_arrays, simulate_batch
+from quant.incremental import ContributionCache, IncrementalScenario
+from quant.ingest import iter_chunks
+from quant.optimal_policy import optimal_policy
+from quant.portfolio import ASSET_CLASS_BETAS, PositionBook, book_from_frame, worst_scenarios
+from quant.regions import Region, Spillovers, regional_shock_arrays, simulate_regions
+from quant.rules import REGIME_RULES, WARNING_RULES
+from quant.sweep import sweep
+from quant.narrative import generate_markdown_report
+from utils.export import export_scenario
+from utils.library import ScenarioLibrary
+from utils.transform import normalize_series
+
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = BENCHMARK_DIR / "baseline.json"
+
+HORIZONS = (6, 12, 24, 36, 60)
+SHOCK_COUNTS = (1, 5, 10, 25, 50)
+LONG_HORIZONS = (120, 240, 360, 480)
+DEFAULT_THRESHOLD = 0.25
+
+# Cumulative import time budgets in seconds. The array-only entry points must
+# stay close to the NumPy import floor; pandas is only paid by the DataFrame API.
+IMPORT_BUDGETS: dict[str, float] = {
+    "quant": 0.150,
+    "quant.core": 0.150,
+}
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """A timed callable; with ``setup``, ``func`` receives the fixture it builds.
+
+    ``setup`` runs only when the case is selected, so filtered runs skip the
+    large fixtures of the other cases.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    number: int = 1
+    setup: Callable[[], Any] | None = None
+
+
+def synthetic_shocks(count: int, horizon: int) -> list[MacroShock]:
+    """Deterministic shock list cycling through every channel."""
+
+    channels = list(ShockChannel)
+    return [
+        MacroShock(
+            name=f"Shock {i + 1}",
+            channel=channels[i % len(channels)],
+            magnitude=0.4 + 0.1 * (i % 7) if i % 2 == 0 else -0.3 - 0.1 * (i % 5),
+            duration=1 + i % min(6, horizon),
+            persistence=0.6 + 0.05 * (i % 6),
+            start_month=1 + (3 * i) % horizon,
+        )
+        for i in range(count)
+    ]
+
+
+def synthetic_raw_series(years: int = 20) -> pd.DataFrame:
+    dates = pd.date_range("2000-01-01", periods=years * 365, freq="D")
+    values = 2.0 + np.sin(np.arange(len(dates)) / 90.0)
+    return pd.DataFrame({"date": dates, "value": values})
+
+
+def build_cases(output_dir: Path) -> list[BenchmarkCase]:
+    cases: list[BenchmarkCase] = []
+
+    for horizon in HORIZONS:
+        for count in SHOCK_COUNTS:
+            shocks = synthetic_shocks(count, horizon)
+            cases.append(
+                BenchmarkCase(
+                    f"simulate_scenario[h={horizon},shocks={count}]",
+                    lambda shocks=shocks, horizon=horizon: simulate_scenario(shocks, horizon=horizon),
+                    number=5,
+                )
+            )
+        cases.append(BenchmarkCase(f"baseline_path[h={horizon}]", lambda horizon=horizon: baseline_path(horizon), number=20))
+
+    def incremental_scenario() -> tuple[IncrementalScenario, int, MacroShock, Iterator[int]]:
+        incremental = IncrementalScenario(synthetic_shocks(50, 60), horizon=60, cache=ContributionCache())
+        key = incremental.keys()[0]
+        return incremental, key, incremental.shocks[0], iter(range(1_000_000))
+
+    def edit_one_shock(fixture: tuple[IncrementalScenario, int, MacroShock, Iterator[int]]) -> None:
+        # Every edit gets a new magnitude, so each one recomputes its block instead of hitting the cache.
+        incremental, key, shock, edits = fixture
+        incremental.update_shock(key, replace(shock, magnitude=0.5 + 1e-6 * next(edits)))
+        incremental.arrays()
+
+    cases.append(BenchmarkCase("incremental_edit[h=60,shocks=50]", edit_one_shock, number=20, setup=incremental_scenario))
+
+    @cache
+    def batch() -> ShockArrays:
+        return ShockArrays.from_scenarios([synthetic_shocks(5, 60) for _ in range(1000)])
+
+    cases.append(
+        BenchmarkCase("simulate_batch[n=1000,h=60]", lambda shocks: simulate_batch(shocks, horizon=60), number=3, setup=batch)
+    )
+    cases.append(
+        BenchmarkCase("optimal_policy[n=1000,h=60]", lambda shocks: optimal_policy(shocks, horizon=60), number=3, setup=batch)
+    )
+    cases.append(
+        BenchmarkCase(
+            "simulate_batch_policy_rule[n=1000,h=60]",
+            lambda shocks: simulate_batch(shocks, horizon=60, policy_rule=PolicyRule()),
+            number=3,
+            setup=batch,
+        )
+    )
+
+    long_shocks = synthetic_shocks(10, 60)
+    for horizon in LONG_HORIZONS:
+        cases.append(
+            BenchmarkCase(
+                f"simulate_long_horizon[h={horizon},lags={horizon}]",
+                lambda profiles, horizon=horizon: simulate_arrays(long_shocks, horizon, profiles=profiles, long_horizon=True),
+                number=10,
+                setup=lambda horizon=horizon: extended_profiles(horizon),
+            )
+        )
+    cases.append(
+        BenchmarkCase(
+            "simulate_batch_long_horizon[n=1000,h=360]",
+            lambda fixture: simulate_batch(fixture[0], horizon=360, profiles=fixture[1], long_horizon=True),
+            number=3,
+            setup=lambda: (batch(), extended_profiles(360)),
+        )
+    )
+
+    def regional_batch() -> tuple[list[Region], ShockArrays, Spillovers]:
+        regions = [Region(f"R{index:02d}") for index in range(20)]
+        rng = np.random.default_rng(11)
+        weights = rng.uniform(0.0, 0.04, (20, 20))
+        np.fill_diagonal(weights, 0.0)
+        spillovers = Spillovers(weights=weights, lags=rng.integers(1, 4, (20, 20)))
+        regional = regional_shock_arrays(
+            regions,
+            [[(regions[int(rng.integers(20))].name, shock) for shock in synthetic_shocks(3, 60)] for _ in range(1000)],
+        )
+        return regions, regional, spillovers
+
+    cases.append(
+        BenchmarkCase(
+            "simulate_regions[regions=20,n=1000,h=60]",
+            lambda fixture: simulate_regions(fixture[0], fixture[1], fixture[2], horizon=60),
+            number=3,
+            setup=regional_batch,
+        )
+    )
+
+    def history() -> pd.DataFrame:
+        months = pd.date_range("1985-01-01", periods=480, freq="MS")
+        trend = np.arange(len(months), dtype=float)
+        return realized_paths(
+            {
+                "gdp": pd.Series(100.0 * np.exp(0.0012 * trend + 0.01 * np.sin(trend / 20.0)), months),
+                "inflation": pd.Series(100.0 * np.exp(0.0017 * trend + 0.005 * np.sin(trend / 15.0)), months),
+                "policy_rate": pd.Series(2.0 + np.sin(trend / 30.0), months),
+            }
+        )
+
+    backtest_shocks = synthetic_shocks(5, 24)
+    cases.append(
+        BenchmarkCase(
+            "run_backtest[origins=467,h=24]",
+            lambda realized: run_backtest(realized, backtest_shocks, horizon=24),
+            number=10,
+            setup=history,
+        )
+    )
+
+    def million_metrics() -> dict[str, np.ndarray]:
+        rng = np.random.default_rng(11)
+        million = {name: rng.normal(1.0, 2.0, 1_000_000) for name in REGIME_RULES.metrics() | WARNING_RULES.metrics()}
+        million["shock_count"] = rng.integers(0, 4, 1_000_000)
+        return million
+
+    cases.append(
+        BenchmarkCase(
+            "classify_rules[n=1m]",
+            lambda million: (REGIME_RULES.evaluate(million).counts(), WARNING_RULES.evaluate(million).hits()),
+            number=3,
+            setup=million_metrics,
+        )
+    )
+
+    def jsonl_drop() -> Path:
+        rng = np.random.default_rng(11)
+        drop = output_dir / "scenarios.jsonl"
+        channel_names = [channel.value for channel in ShockChannel]
+        with drop.open("w", encoding="utf-8") as handle:
+            for index in range(25_000):
+                shocks = [
+                    {
+                        "name": f"Shock {j + 1}",
+                        "channel": channel_names[(index + j) % len(channel_names)],
+                        "magnitude": round(float(rng.uniform(-3.0, 3.0)), 3),
+                        "duration": 1 + (index + j) % 6,
+                        "persistence": 0.8,
+                        "start_month": 1 + (index * j) % 12,
+                    }
+                    for j in range(4)
+                ]
+                handle.write(json.dumps({"scenario_name": f"S{index}", "horizon": 24, "shocks": shocks}) + "\n")
+        return drop
+
+    cases.append(
+        BenchmarkCase(
+            "ingest_jsonl[rows=100k]",
+            lambda drop: [len(chunk.shocks) for chunk in iter_chunks(drop)],
+            number=3,
+            setup=jsonl_drop,
+        )
+    )
+
+    def random_shocks(count: int) -> ShockArrays:
+        rng = np.random.default_rng(11)
+        return ShockArrays(
+            scenario=np.repeat(np.arange(count), 2),
+            channel=rng.integers(0, 5, 2 * count),
+            magnitude=rng.uniform(-3.0, 3.0, 2 * count),
+            duration=rng.integers(1, 6, 2 * count),
+            persistence=rng.uniform(0.4, 0.9, 2 * count),
+            start_month=rng.integers(1, 12, 2 * count),
+        )
+
+    cases.append(
+        BenchmarkCase(
+            "library_add_batch[n=1000,h=60]",
+            lambda simulated: ScenarioLibrary(":memory:").add_batch(simulated),
+            number=3,
+            setup=lambda: simulate_batch(batch(), horizon=60),
+        )
+    )
+
+    def stored_library() -> ScenarioLibrary:
+        library = ScenarioLibrary(":memory:")
+        count = 50_000
+        library.add_batch(simulate_batch(random_shocks(count), 24, scenarios=count), store_paths=False)
+        return library
+
+    cases.append(
+        BenchmarkCase(
+            "library_query[rows=50k]",
+            lambda library: library.query(
+                [("inflation_peak", ">", 3.5), ("growth_trough", "<", 0.0)], channel=ShockChannel.SUPPLY, limit=1000
+            ),
+            number=10,
+            setup=stored_library,
+        )
+    )
+
+    cases.append(
+        BenchmarkCase(
+            "sweep_metrics[n=200k,h=24,top=100]",
+            lambda shocks: sweep(shocks, 24, top=100),
+            number=3,
+            setup=lambda: random_shocks(200_000),
+        )
+    )
+
+    def position_book() -> tuple[np.ndarray, PositionBook]:
+        rng = np.random.default_rng(11)
+        positions = 100_000
+        book = book_from_frame(
+            pd.DataFrame(
+                {
+                    "portfolio": [f"P{index:03d}" for index in rng.integers(0, 200, positions)],
+                    "asset": [f"A{index:04d}" for index in rng.integers(0, 5000, positions)],
+                    "market_value": rng.uniform(1e4, 1e6, positions),
+                    "asset_class": rng.choice(list(ASSET_CLASS_BETAS), positions),
+                }
+            )
+        )
+        return rng.normal(0.0, 0.3, (10_000, 5, 24)), book
+
+    cases.append(
+        BenchmarkCase(
+            "worst_scenarios[positions=100k,n=10k,h=24]",
+            lambda fixture: worst_scenarios(fixture[0], fixture[1], top=10),
+            number=3,
+            setup=position_book,
+        )
+    )
+
+    @cache
+    def reference() -> ScenarioResult:
+        return simulate_scenario(synthetic_shocks(10, 60), horizon=60)
+
+    cases.extend(
+        [
+            BenchmarkCase("result_to_long_frame[h=60]", result_to_long_frame, number=3, setup=reference),
+            BenchmarkCase(
+                "shocks_from_frame[rows=50]",
+                shocks_from_frame,
+                number=5,
+                setup=lambda: shocks_to_frame(synthetic_shocks(50, 60)),
+            ),
+            BenchmarkCase("generate_markdown_report[h=60]", generate_markdown_report, number=10, setup=reference),
+            BenchmarkCase(
+                "export_scenario[h=60]",
+                lambda result: export_scenario(result, output_dir, stem="bench"),
+                number=3,
+                setup=reference,
+            ),
+            BenchmarkCase(
+                "normalize_series[daily=20y]",
+                lambda raw_series: normalize_series(raw_series, "bench"),
+                number=3,
+                setup=synthetic_raw_series,
+            ),
+        ]
+    )
+    return cases
+
+
+def time_case(case: BenchmarkCase, repeats: int) -> dict[str, float | int]:
+    fixture = () if case.setup is None else (case.setup(),)
+    case.func(*fixture)
+    samples: list[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(case.number):
+            case.func(*fixture)
+        samples.append((time.perf_counter() - start) / case.number)
+
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "repeats": repeats,
+        "number": case.number,
+    }
+
+
+def measure_import_time(module: str, repeats: int = 5) -> dict[str, float | int]:
+    """Cumulative ``-X importtime`` cost of ``module`` in fresh interpreters."""
+
+    samples: list[float] = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=BENCHMARK_DIR.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in completed.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module and not fields[2].startswith("  "):
+                samples.append(int(fields[1]) / 1e6)
+
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "repeats": repeats,
+        "number": 1,
+    }
+
+
+def check_import_budgets(current: dict[str, Any], budgets: dict[str, float] = IMPORT_BUDGETS) -> list[str]:
+    failures: list[str] = []
+    for module, budget in budgets.items():
+        stats = current["results"].get(f"import_time[{module}]")
+        if stats is not None and float(stats["min_s"]) > budget:
+            failures.append(f"import {module} takes {stats['min_s'] * 1e3:.1f} ms (budget {budget * 1e3:.0f} ms)")
+    return failures
+
+
+def run_suite(name_filter: str | None = None, repeats: int = 7) -> dict[str, Any]:
+    results: dict[str, dict[str, float | int]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for case in build_cases(Path(tmp)):
+            if name_filter and name_filter not in case.name:
+                continue
+            results[case.name] = time_case(case, repeats)
+
+    for module in IMPORT_BUDGETS:
+        name = f"import_time[{module}]"
+        if not name_filter or name_filter in name:
+            results[name] = measure_import_time(module)
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """Return one row per shared case, flagging slowdowns above ``threshold``."""
+
+    rows: list[dict[str, Any]] = []
+    for name, stats in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        ratio = float(stats["median_s"]) / max(float(reference["median_s"]), 1e-12)
+        rows.append(
+            {
+                "name": name,
+                "baseline_s": float(reference["median_s"]),
+                "current_s": float(stats["median_s"]),
+                "ratio": ratio,
+                "regression": ratio > 1.0 + threshold,
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the macro scenario hot paths.")
+    parser.add_argument("--filter", default=None, help="Only run cases whose name contains this text.")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown, e.g. 0.25 = 25%%.")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--output", default=None, help="Write machine-readable results to this JSON file.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline.")
+    args = parser.parse_args()
+
+    current = run_suite(args.filter, args.repeats)
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2), encoding="utf-8")
+
+    baseline_file = Path(args.baseline)
+    if args.save_baseline:
+        baseline_file.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {baseline_file} ({len(current['results'])} cases)")
+        return
+
+    if not baseline_file.exists():
+        for name, stats in current["results"].items():
+            print(f"{name:<48} {stats['median_s'] * 1e3:10.3f} ms")
+        print(f"No baseline at {baseline_file}; run with --save-baseline to create one.")
+        return
+
+    rows = compare_results(current, json.loads(baseline_file.read_text(encoding="utf-8")), args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else "ok"
+        print(f"{row['name']:<48} {row['current_s'] * 1e3:10.3f} ms  x{row['ratio']:.2f}  {flag}")
+    compared = {row["name"] for row in rows}
+    for name, stats in current["results"].items():
+        if name not in compared:
+            print(f"{name:<48} {stats['median_s'] * 1e3:10.3f} ms  (no baseline)")
+
+    budget_failures = check_import_budgets(current)
+    for failure in budget_failures:
+        print(failure)
+
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}.")
+    if regressions or budget_failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,7 @@ from typing import Any
 
 import pandas as pd
 
-from api.ecb import get_series_ecb
-from api.fred import get_series_fred
+from utils.instrumentation import span, timed
 from utils.io import save_series
 from utils.transform import normalize_series
 
@@ -28,13 +27,17 @@ def run_etl_pipeline(vars_cfg: dict[str, dict[str, Any]] | None = None) -> dict[
     vars_cfg = vars_cfg or VARIABLES
     outputs: dict[str, pd.DataFrame] = {}
     for name, cfg in vars_cfg.items():
-        raw = _download_series(cfg)
-        normalized = normalize_series(raw, name)
-        save_series(normalized, name)
+        with span(f"etl.download.{name}"):
+            raw = _download_series(cfg)
+        with span(f"etl.normalize.{name}"):
+            normalized = normalize_series(raw, name)
+        with span(f"etl.save.{name}"):
+            save_series(normalized, name)
         outputs[name] = normalized
     return outputs
 
 
+@timed("etl.build_series_dataset")
 def build_series_dataset(data_dir: str | Path = "data") -> dict[str, pd.Series]:
     """Build a unified series dictionary from previously saved ETL files."""
 
@@ -63,10 +66,15 @@ def build_series_dataset(data_dir: str | Path = "data") -> dict[str, pd.Series]:
 
 
 def _download_series(cfg: dict[str, Any]) -> pd.DataFrame:
+    # Network clients (requests, dotenv) are only imported when a download runs.
     source = str(cfg["source"]).upper()
     if source == "FRED":
+        from api.fred import get_series_fred
+
         return get_series_fred(str(cfg["id"]))
     if source == "ECB":
+        from api.ecb import get_series_ecb
+
         return get_series_ecb(str(cfg["dataset"]), str(cfg["key"]))
     raise ValueError(f"Unknown data source: {cfg['source']}")
 
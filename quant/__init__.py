@@ -1,9 +1,47 @@
-from quant.macro_engine import BaselineAssumptions, MacroShock, ScenarioResult, ShockChannel, simulate_scenario
+"""Macro scenario engine.
+
+The NumPy core is imported eagerly; the pandas-based API is resolved lazily on
+first attribute access so ``import quant`` stays cheap for array-only callers.
+"""
+
+from importlib import import_module
+from typing import Any
+
+from quant.core import (
+    BaselineAssumptions,
+    BatchResult,
+    MacroShock,
+    PolicyRule,
+    ScenarioArrays,
+    ShockArrays,
+    ShockAttribution,
+    ShockChannel,
+    simulate_arrays,
+    simulate_batch,
+)
+
+_LAZY_ATTRIBUTES = {
+    "ScenarioResult": "quant.macro_engine",
+    "simulate_scenario": "quant.macro_engine",
+}
 
 __all__ = [
     "BaselineAssumptions",
+    "BatchResult",
     "MacroShock",
+    "PolicyRule",
+    "ScenarioArrays",
     "ScenarioResult",
+    "ShockArrays",
+    "ShockAttribution",
     "ShockChannel",
+    "simulate_arrays",
+    "simulate_batch",
     "simulate_scenario",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module 'quant' has no attribute {name!r}")
@@ -0,0 +1,150 @@
+"""Historical backtest: replay the engine from every past month.
+
+Each origin month seeds ``BaselineAssumptions`` from the realized series and
+the configured shocks run over the following months. All origins are computed
+together: one ``(origin, variable, month)`` baseline block from broadcast
+assumptions, plus shock deltas that are identical for every origin and so are
+simulated once. Realized values are gathered with a single fancy index.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from quant.core import (
+    DISPLAY_VARIABLES,
+    BaselineAssumptions,
+    MacroShock,
+    PolicyRule,
+    ShockArrays,
+    _baseline_block,
+    _validate_horizon,
+    simulate_batch,
+)
+from utils.instrumentation import timed
+
+
+# Inverse of the baseline identity gdp_growth = trend_growth + 0.35 * output_gap.
+GAP_SENSITIVITY = 0.35
+
+
+@dataclass
+class BacktestResult:
+    """Forecasts, realizations and errors as ``(origin, variable, horizon)`` arrays.
+
+    Horizon ``h`` (1-based) is the month ``h`` months after the origin; errors
+    are forecast minus realized and NaN where history has not arrived yet.
+    """
+
+    origins: pd.DatetimeIndex
+    forecasts: np.ndarray
+    realized: np.ndarray
+    errors: np.ndarray
+
+    def table(self) -> pd.DataFrame:
+        """Error statistics with one row per variable and horizon."""
+
+        valid = ~np.isnan(self.errors)
+        count = valid.sum(axis=0)
+        filled = np.where(valid, self.errors, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            bias = filled.sum(axis=0) / count
+            mae = np.abs(filled).sum(axis=0) / count
+            rmse = np.sqrt((filled**2).sum(axis=0) / count)
+
+        variables, horizons = count.shape
+        return pd.DataFrame(
+            {
+                "variable": np.repeat(DISPLAY_VARIABLES, horizons),
+                "horizon": np.tile(np.arange(1, horizons + 1), variables),
+                "n": count.reshape(-1),
+                "bias": bias.reshape(-1),
+                "mae": mae.reshape(-1),
+                "rmse": rmse.reshape(-1),
+            }
+        )
+
+    def surface(self, statistic: str = "rmse") -> pd.DataFrame:
+        """One statistic as a variable x horizon grid."""
+
+        return self.table().pivot(index="variable", columns="horizon", values=statistic).loc[DISPLAY_VARIABLES]
+
+
+def realized_paths(series: Mapping[str, pd.Series], trend_growth: float = BaselineAssumptions.trend_growth) -> pd.DataFrame:
+    """Monthly history in engine units from ``build_series_dataset`` output.
+
+    GDP and HICP levels become y/y growth rates; the output gap is backed out
+    of GDP growth with the baseline identity and ``trend_growth``.
+    """
+
+    gdp_growth = 100.0 * (series["gdp"] / series["gdp"].shift(12) - 1.0)
+    inflation = 100.0 * (series["inflation"] / series["inflation"].shift(12) - 1.0)
+    frame = pd.concat(
+        [gdp_growth.rename("gdp_growth"), inflation.rename("inflation"), series["policy_rate"].rename("policy_rate")],
+        axis=1,
+    ).asfreq("MS")
+    frame["real_rate"] = frame["policy_rate"] - frame["inflation"]
+    frame["output_gap"] = (frame["gdp_growth"] - trend_growth) / GAP_SENSITIVITY
+    return frame[DISPLAY_VARIABLES]
+
+
+@timed("backtest.run_backtest")
+def run_backtest(
+    realized: pd.DataFrame,
+    shocks: Sequence[MacroShock] = (),
+    horizon: int = 12,
+    assumptions: BaselineAssumptions | None = None,
+    policy_rule: PolicyRule | None = None,
+    long_horizon: bool = False,
+) -> BacktestResult:
+    """Backtest from every month whose seed values are all observed.
+
+    ``realized`` is a monthly frame with the ``DISPLAY_VARIABLES`` columns, as
+    returned by ``realized_paths``. ``assumptions`` supplies the anchors that
+    are not seeded from history (trend growth, inflation target, neutral rate).
+    """
+
+    assumptions = assumptions or BaselineAssumptions()
+    horizon = _validate_horizon(horizon, long_horizon)
+    history = realized[DISPLAY_VARIABLES].to_numpy(dtype=float)
+    seeds = ["inflation", "policy_rate", "output_gap"]
+    seeded = realized[seeds].notna().all(axis=1).to_numpy()
+    positions = np.flatnonzero(seeded[:-1])
+
+    def seed(column: str) -> np.ndarray:
+        return history[positions, DISPLAY_VARIABLES.index(column)][:, None]
+
+    forecasts = _baseline_block(
+        horizon,
+        trend_growth=assumptions.trend_growth,
+        target_inflation=assumptions.target_inflation,
+        initial_inflation=seed("inflation"),
+        neutral_real_rate=assumptions.neutral_real_rate,
+        initial_policy_rate=seed("policy_rate"),
+        initial_output_gap=seed("output_gap"),
+    )
+    if shocks:
+        batch = simulate_batch(
+            ShockArrays.from_scenarios([list(shocks)]),
+            horizon,
+            assumptions,
+            policy_rule=policy_rule,
+            long_horizon=long_horizon,
+        )
+        forecasts = forecasts + batch.deltas[0]
+
+    targets = positions[:, None] + np.arange(1, horizon + 1)
+    inside = targets < len(history)
+    observed = np.where(inside[..., None], history[np.minimum(targets, len(history) - 1)], np.nan)
+    observed = observed.transpose(0, 2, 1)
+
+    return BacktestResult(
+        origins=pd.DatetimeIndex(realized.index[positions]),
+        forecasts=forecasts,
+        realized=observed,
+        errors=forecasts - observed,
+    )
@@ -0,0 +1,898 @@
+"""Pandas-free core of the macro scenario engine.
+
+Everything here depends on NumPy only, so short-lived CLIs and worker
+processes can simulate scenarios without paying for a pandas import. Results
+come back as plain arrays in ``ScenarioArrays``; ``ScenarioArrays.to_frame``
+imports pandas lazily when a DataFrame is actually needed, and
+``quant.macro_engine`` builds the DataFrame-based API on top of this module.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+import numpy as np
+
+from quant.rules import REGIME_RULES, WARNING_RULES, RuleResult, RuleSet
+from utils.instrumentation import increment, timed
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ShockChannel(str, Enum):
+    DEMAND = "Demand"
+    SUPPLY = "Supply / energy"
+    MONETARY = "Monetary policy"
+    RISK = "Financial risk"
+    FISCAL = "Fiscal impulse"
+
+
+VARIABLE_LABELS: dict[str, str] = {
+    "gdp_growth": "GDP growth",
+    "inflation": "Inflation",
+    "policy_rate": "Policy rate",
+    "real_rate": "Real rate",
+    "output_gap": "Output gap",
+}
+
+VARIABLE_UNITS: dict[str, str] = {
+    "gdp_growth": "% y/y",
+    "inflation": "% y/y",
+    "policy_rate": "%",
+    "real_rate": "%",
+    "output_gap": "% potential GDP",
+}
+
+DISPLAY_VARIABLES = ["gdp_growth", "inflation", "policy_rate", "real_rate", "output_gap"]
+
+VARIABLE_INDEX: dict[str, int] = {variable: i for i, variable in enumerate(DISPLAY_VARIABLES)}
+
+ATTRIBUTION_MODES = ("shock", "channel")
+
+CHANNEL_ORDER: tuple[ShockChannel, ...] = tuple(ShockChannel)
+
+# Summary statistics available to the rule tables in ``quant.rules``, as
+# (variable, "scenario" or "delta" path, reduction). ``shock_count`` is added
+# alongside. All but ``policy_peak_delta`` are reported in scenario metrics.
+RULE_METRICS: dict[str, tuple[str, str, str]] = {
+    "inflation_peak": ("inflation", "scenario", "max"),
+    "inflation_peak_delta": ("inflation", "delta", "max"),
+    "growth_trough": ("gdp_growth", "scenario", "min"),
+    "growth_trough_delta": ("gdp_growth", "delta", "min"),
+    "policy_peak": ("policy_rate", "scenario", "max"),
+    "policy_peak_delta": ("policy_rate", "delta", "max"),
+    "real_rate_peak": ("real_rate", "scenario", "max"),
+    "output_gap_trough": ("output_gap", "scenario", "min"),
+}
+
+SCENARIO_METRICS = [name for name in RULE_METRICS if name != "policy_peak_delta"]
+
+MAX_HORIZON = 60
+LONG_MAX_HORIZON = 480
+
+# Kernels with at least this many effective lags are convolved by FFT. The built-in
+# profiles stay below it, so default scenarios always use the exact lag loop.
+FFT_MIN_LAGS = 12
+
+
+@dataclass(frozen=True)
+class BaselineAssumptions:
+    """Starting point and medium-term anchors for the scenario."""
+
+    start_date: str = "2026-06-01"
+    trend_growth: float = 1.3
+    initial_gdp_growth: float = 1.1
+    target_inflation: float = 2.0
+    initial_inflation: float = 2.4
+    neutral_real_rate: float = 1.0
+    initial_policy_rate: float = 3.25
+    initial_output_gap: float = -0.2
+
+    @property
+    def neutral_policy_rate(self) -> float:
+        return self.target_inflation + self.neutral_real_rate
+
+
+@dataclass(frozen=True)
+class MacroShock:
+    """A user-defined shock in economically meaningful units."""
+
+    name: str
+    channel: ShockChannel
+    magnitude: float
+    duration: int = 3
+    persistence: float = 0.75
+    start_month: int = 1
+
+    def normalized(self) -> "MacroShock":
+        return MacroShock(
+            name=self.name.strip() or self.channel.value,
+            channel=self.channel,
+            magnitude=float(self.magnitude),
+            duration=max(1, int(self.duration)),
+            persistence=min(0.98, max(0.0, float(self.persistence))),
+            start_month=max(1, int(self.start_month)),
+        )
+
+
+@dataclass(frozen=True)
+class PolicyRule:
+    """Taylor-type reaction function for the policy-rate deviation.
+
+    ``p_t = smoothing * p_{t-1} + (1 - smoothing) * (inflation * pi_t + output_gap * gap_t)``
+    on deviations from baseline. The rule's rate path is transmitted through
+    the monetary channel's lag profile, so it feeds back into inflation and
+    activity; monetary shocks become deviations from the rule.
+    """
+
+    inflation: float = 1.5
+    output_gap: float = 0.5
+    smoothing: float = 0.7
+
+    def __post_init__(self) -> None:
+        if not 0.0 <= self.smoothing < 1.0:
+            raise ValueError("Policy-rule smoothing must be in [0, 1).")
+        if self.inflation < 0 or self.output_gap < 0:
+            raise ValueError("Policy-rule coefficients must be non-negative.")
+
+
+ResponseProfile = dict[str, tuple[float, ...]]
+
+
+RESPONSE_PROFILES: dict[ShockChannel, ResponseProfile] = {
+    ShockChannel.DEMAND: {
+        "gdp_growth": (0.75, 0.55, 0.36, 0.20, 0.10),
+        "output_gap": (0.60, 0.50, 0.36, 0.22, 0.10),
+        "inflation": (0.06, 0.11, 0.16, 0.14, 0.09, 0.04),
+        "policy_rate": (0.02, 0.05, 0.09, 0.10, 0.07, 0.03),
+    },
+    ShockChannel.SUPPLY: {
+        "inflation": (0.72, 0.62, 0.48, 0.33, 0.20, 0.10),
+        "gdp_growth": (-0.24, -0.30, -0.23, -0.14, -0.06),
+        "output_gap": (-0.18, -0.24, -0.20, -0.12, -0.05),
+        "policy_rate": (0.07, 0.16, 0.24, 0.24, 0.16, 0.08),
+    },
+    ShockChannel.MONETARY: {
+        "policy_rate": (1.00, 0.92, 0.78, 0.58, 0.38, 0.20),
+        "gdp_growth": (0.00, -0.05, -0.14, -0.22, -0.22, -0.16, -0.08),
+        "output_gap": (0.00, -0.04, -0.10, -0.18, -0.20, -0.16, -0.09),
+        "inflation": (0.00, 0.00, -0.03, -0.08, -0.12, -0.12, -0.07, -0.03),
+    },
+    ShockChannel.RISK: {
+        "gdp_growth": (-0.56, -0.45, -0.28, -0.14, -0.06),
+        "output_gap": (-0.42, -0.36, -0.24, -0.12, -0.05),
+        "inflation": (-0.03, -0.06, -0.08, -0.06, -0.03),
+        "policy_rate": (-0.04, -0.10, -0.16, -0.18, -0.12, -0.06),
+    },
+    ShockChannel.FISCAL: {
+        "gdp_growth": (0.52, 0.45, 0.30, 0.16, 0.06),
+        "output_gap": (0.42, 0.36, 0.25, 0.12, 0.05),
+        "inflation": (0.04, 0.08, 0.11, 0.09, 0.04),
+        "policy_rate": (0.00, 0.03, 0.07, 0.08, 0.05),
+    },
+}
+
+
+PRESET_SCENARIOS: dict[str, dict[str, Any]] = {
+    "Energy price shock": {
+        "description": "Inflationary supply shock with a negative activity impulse.",
+        "horizon": 24,
+        "shocks": [
+            MacroShock("Energy price shock", ShockChannel.SUPPLY, 1.6, duration=5, persistence=0.82),
+        ],
+    },
+    "Monetary tightening": {
+        "description": "Front-loaded policy tightening transmitted to output and inflation with lags.",
+        "horizon": 24,
+        "shocks": [
+            MacroShock("Rate shock", ShockChannel.MONETARY, 1.0, duration=4, persistence=0.80),
+        ],
+    },
+    "Demand slowdown": {
+        "description": "Broad demand deterioration with disinflationary pressure.",
+        "horizon": 24,
+        "shocks": [
+            MacroShock("Demand slowdown", ShockChannel.DEMAND, -1.1, duration=4, persistence=0.78),
+        ],
+    },
+    "Soft landing": {
+        "description": "Moderate demand cooling paired with a contained policy response.",
+        "horizon": 24,
+        "shocks": [
+            MacroShock("Demand cooling", ShockChannel.DEMAND, -0.45, duration=4, persistence=0.70),
+            MacroShock("Policy support", ShockChannel.MONETARY, -0.35, duration=3, persistence=0.75, start_month=4),
+        ],
+    },
+    "Risk-off stress": {
+        "description": "Financial conditions shock with weaker activity and easier policy path.",
+        "horizon": 24,
+        "shocks": [
+            MacroShock("Risk-off shock", ShockChannel.RISK, 1.2, duration=4, persistence=0.80),
+        ],
+    },
+}
+
+
+@dataclass
+class ShockAttribution:
+    """Per-shock (or per-channel) contributions to every variable's delta.
+
+    ``contributions`` has shape ``(group, month, variable)`` with variables in
+    ``DISPLAY_VARIABLES`` order; summing over groups reproduces the deltas.
+    """
+
+    by: str
+    labels: list[str]
+    contributions: np.ndarray
+
+
+@dataclass
+class ScenarioArrays:
+    """Simulation output as NumPy arrays keyed by the DataFrame column names."""
+
+    dates: np.ndarray
+    columns: dict[str, np.ndarray]
+    shocks: list[MacroShock]
+    baseline: BaselineAssumptions
+    metrics: dict[str, float | str]
+    warnings: list[str] = field(default_factory=list)
+    attribution: ShockAttribution | None = None
+
+    def to_frame(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.DataFrame({"date": self.dates.astype("datetime64[ns]"), **self.columns})
+
+
+@dataclass
+class ShockArrays:
+    """Columnar shocks for many scenarios; ``scenario`` is each row's owner.
+
+    ``channel`` holds positions in ``CHANNEL_ORDER``. Rows are expected to be
+    normalized the way ``MacroShock.normalized`` would normalize them.
+    """
+
+    scenario: np.ndarray
+    channel: np.ndarray
+    magnitude: np.ndarray
+    duration: np.ndarray
+    persistence: np.ndarray
+    start_month: np.ndarray
+    names: np.ndarray | None = None
+
+    @classmethod
+    def from_scenarios(cls, scenarios: Sequence[Sequence[MacroShock]]) -> "ShockArrays":
+        rows = [(index, shock.normalized()) for index, shocks in enumerate(scenarios) for shock in shocks]
+        return cls(
+            scenario=np.array([index for index, _ in rows], dtype=np.int64),
+            channel=np.array([CHANNEL_ORDER.index(shock.channel) for _, shock in rows], dtype=np.int64),
+            magnitude=np.array([shock.magnitude for _, shock in rows], dtype=float),
+            duration=np.array([shock.duration for _, shock in rows], dtype=np.int64),
+            persistence=np.array([shock.persistence for _, shock in rows], dtype=float),
+            start_month=np.array([shock.start_month for _, shock in rows], dtype=np.int64),
+            names=np.array([shock.name for _, shock in rows], dtype=object),
+        )
+
+    def __len__(self) -> int:
+        return len(self.magnitude)
+
+    def take(self, rows: np.ndarray, scenario: np.ndarray | None = None) -> "ShockArrays":
+        """The shocks at ``rows``, optionally reassigned to new ``scenario`` indices."""
+
+        return ShockArrays(
+            scenario=self.scenario[rows] if scenario is None else scenario,
+            channel=self.channel[rows],
+            magnitude=self.magnitude[rows],
+            duration=self.duration[rows],
+            persistence=self.persistence[rows],
+            start_month=self.start_month[rows],
+            names=self.names[rows] if self.names is not None else None,
+        )
+
+    def shocks_for(self, index: int) -> list[MacroShock]:
+        """Rebuild one scenario's active shocks as ``MacroShock`` objects."""
+
+        rows = np.flatnonzero((self.scenario == index) & (np.abs(self.magnitude) > 1e-9))
+        return [
+            MacroShock(
+                name=str(self.names[row]) if self.names is not None else CHANNEL_ORDER[self.channel[row]].value,
+                channel=CHANNEL_ORDER[self.channel[row]],
+                magnitude=float(self.magnitude[row]),
+                duration=int(self.duration[row]),
+                persistence=float(self.persistence[row]),
+                start_month=int(self.start_month[row]),
+            )
+            for row in rows
+        ]
+
+
+@dataclass
+class BatchResult:
+    """Deltas for many scenarios that share one horizon and baseline."""
+
+    dates: np.ndarray
+    baseline: np.ndarray
+    deltas: np.ndarray
+    shocks: ShockArrays
+    assumptions: BaselineAssumptions
+
+    def __len__(self) -> int:
+        return len(self.deltas)
+
+    def paths(self) -> np.ndarray:
+        """Scenario levels as ``(scenario, variable, month)``."""
+
+        return self.baseline + self.deltas
+
+    def scenario(self, index: int) -> ScenarioArrays:
+        """Full metrics and warnings for one scenario of the batch."""
+
+        baseline = {f"{variable}_baseline": self.baseline[i] for i, variable in enumerate(DISPLAY_VARIABLES)}
+        return _assemble_arrays(baseline, self.deltas[index], self.shocks.shocks_for(index), self.assumptions)
+
+    def metrics(self) -> dict[str, np.ndarray]:
+        """Every ``RULE_METRICS`` value plus ``shock_count``, one entry per scenario."""
+
+        paths = {"scenario": self.paths(), "delta": self.deltas}
+        metrics = {
+            name: getattr(paths[kind][:, VARIABLE_INDEX[variable]], reduction)(axis=-1)
+            for name, (variable, kind, reduction) in RULE_METRICS.items()
+        }
+        active = np.abs(self.shocks.magnitude) > 1e-9
+        metrics["shock_count"] = np.bincount(self.shocks.scenario[active], minlength=len(self))[: len(self)]
+        return metrics
+
+    def regimes(self, rules: RuleSet = REGIME_RULES) -> RuleResult:
+        """Classify every scenario; ``rules`` defaults to the engine's regimes."""
+
+        return rules.evaluate(self.metrics())
+
+    def warnings(self, rules: RuleSet = WARNING_RULES) -> RuleResult:
+        """Coherence flags for every scenario."""
+
+        return rules.evaluate(self.metrics())
+
+
+def month_starts(start_date: str, horizon: int) -> np.ndarray:
+    """Monthly dates from the first month start on or after ``start_date``."""
+
+    day = np.datetime64(start_date, "D")
+    month = day.astype("datetime64[M]")
+    if month.astype("datetime64[D]") < day:
+        month += 1
+    return (month + np.arange(horizon)).astype("datetime64[D]")
+
+
+@timed("engine.baseline_path")
+def baseline_arrays(
+    horizon: int,
+    assumptions: BaselineAssumptions | None = None,
+    long_horizon: bool = False,
+) -> dict[str, np.ndarray]:
+    assumptions = assumptions or BaselineAssumptions()
+    horizon = _validate_horizon(horizon, long_horizon)
+    block = _baseline_block(
+        horizon,
+        trend_growth=assumptions.trend_growth,
+        target_inflation=assumptions.target_inflation,
+        initial_inflation=assumptions.initial_inflation,
+        neutral_real_rate=assumptions.neutral_real_rate,
+        initial_policy_rate=assumptions.initial_policy_rate,
+        initial_output_gap=assumptions.initial_output_gap,
+    )
+    return {f"{variable}_baseline": block[i] for i, variable in enumerate(DISPLAY_VARIABLES)}
+
+
+@timed("engine.simulate_arrays")
+def simulate_arrays(
+    shocks: list[MacroShock],
+    horizon: int = 24,
+    assumptions: BaselineAssumptions | None = None,
+    attribution: str | None = None,
+    policy_rule: PolicyRule | None = None,
+    profiles: Mapping[ShockChannel, ResponseProfile] | None = None,
+    long_horizon: bool = False,
+) -> ScenarioArrays:
+    """Simulate a scenario.
+
+    ``attribution`` adds a "shock" or "channel" decomposition. ``policy_rule``
+    replaces the channels' fixed policy-rate profiles with an endogenous rule.
+    ``profiles`` overrides ``RESPONSE_PROFILES`` per channel and
+    ``long_horizon`` lifts the horizon cap to ``LONG_MAX_HORIZON`` months.
+    """
+
+    assumptions = assumptions or BaselineAssumptions()
+    horizon = _validate_horizon(horizon, long_horizon)
+    if attribution is not None and attribution not in ATTRIBUTION_MODES:
+        raise ValueError(f"Attribution must be one of {', '.join(ATTRIBUTION_MODES)}.")
+    normalized_shocks = [shock.normalized() for shock in shocks if abs(float(shock.magnitude)) > 1e-9]
+    _validate_shocks(normalized_shocks, horizon)
+
+    if attribution is None and policy_rule is None and profiles is None:
+        contributions = np.zeros((len(DISPLAY_VARIABLES), horizon), dtype=float)
+        for shock in normalized_shocks:
+            _apply_shock(contributions, shock, horizon)
+        breakdown = None
+    else:
+        breakdown = _attribute_shocks(normalized_shocks, horizon, attribution or "channel", policy_rule, profiles)
+        contributions = breakdown.contributions.sum(axis=0).T
+        if attribution is None:
+            breakdown = None
+
+    baseline = baseline_arrays(horizon, assumptions, long_horizon)
+    arrays = _assemble_arrays(baseline, contributions, normalized_shocks, assumptions)
+    arrays.attribution = breakdown
+    increment("scenarios_simulated")
+    return arrays
+
+
+@timed("engine.simulate_batch")
+def simulate_batch(
+    shocks: ShockArrays,
+    horizon: int = 24,
+    assumptions: BaselineAssumptions | None = None,
+    policy_rule: PolicyRule | None = None,
+    scenarios: int | None = None,
+    profiles: Mapping[ShockChannel, ResponseProfile] | None = None,
+    long_horizon: bool = False,
+) -> BatchResult:
+    """Simulate many scenarios at once from columnar shocks.
+
+    Impulses are summed per (scenario, channel) before the lag convolution, so
+    the cost scales with ``scenarios x channels`` rather than the shock count.
+    """
+
+    assumptions = assumptions or BaselineAssumptions()
+    horizon = _validate_horizon(horizon, long_horizon)
+    _validate_shock_arrays(shocks, horizon)
+    last = int(shocks.scenario.max()) if len(shocks) else -1
+    count = int(scenarios) if scenarios is not None else last + 1
+    if last >= count:
+        raise ValueError(f"Shock rows reach scenario {last}, beyond {count} scenarios.")
+
+    impulses = _impulse_matrix(shocks.magnitude, shocks.duration, shocks.persistence, shocks.start_month, horizon)
+    grouped = np.zeros((count * len(CHANNEL_ORDER), horizon), dtype=float)
+    np.add.at(grouped, shocks.scenario * len(CHANNEL_ORDER) + shocks.channel, impulses)
+    grouped = grouped.reshape(count, len(CHANNEL_ORDER), horizon)
+
+    kernels = _channel_kernels(profiles, policy_rule is not None)
+    if horizon <= MAX_HORIZON:
+        deltas = (grouped.reshape(count, -1) @ _response_matrix(kernels, horizon)).reshape(count, -1, horizon)
+    else:
+        deltas = np.zeros((count, len(DISPLAY_VARIABLES), horizon), dtype=float)
+        for index, channel in enumerate(CHANNEL_ORDER):
+            if np.any(shocks.channel == index):
+                deltas += _lag_convolve(grouped[:, index], kernels[channel])
+    if policy_rule is not None:
+        deltas += _policy_feedback(deltas, policy_rule, kernels[ShockChannel.MONETARY])
+    deltas[:, VARIABLE_INDEX["real_rate"]] = deltas[:, VARIABLE_INDEX["policy_rate"]] - deltas[:, VARIABLE_INDEX["inflation"]]
+    increment("scenarios_simulated", count)
+
+    baseline = baseline_arrays(horizon, assumptions, long_horizon)
+    return BatchResult(
+        dates=month_starts(assumptions.start_date, horizon),
+        baseline=np.stack([baseline[f"{variable}_baseline"] for variable in DISPLAY_VARIABLES]),
+        deltas=deltas,
+        shocks=shocks,
+        assumptions=assumptions,
+    )
+
+
+def extended_profiles(lags: int, decay: float = 0.9) -> dict[ShockChannel, ResponseProfile]:
+    """``RESPONSE_PROFILES`` with every tail extended geometrically to ``lags``.
+
+    A starting point for long-horizon work, where the calibrated profiles die
+    out within the first year and slower-moving responses are wanted.
+    """
+
+    if not 0.0 <= decay < 1.0:
+        raise ValueError("Profile decay must be in [0, 1).")
+    return {
+        channel: {
+            variable: tuple(coefficients)
+            + tuple(coefficients[-1] * decay ** np.arange(1, max(lags - len(coefficients), 0) + 1))
+            for variable, coefficients in profile.items()
+        }
+        for channel, profile in RESPONSE_PROFILES.items()
+    }
+
+
+def scenario_from_preset(name: str) -> tuple[list[MacroShock], int]:
+    if name not in PRESET_SCENARIOS:
+        raise ValueError(f"Unknown preset scenario: {name}")
+    preset = PRESET_SCENARIOS[name]
+    return list(preset["shocks"]), int(preset["horizon"])
+
+
+def scenario_from_spec(spec: dict[str, Any]) -> tuple[list[MacroShock], int, BaselineAssumptions]:
+    """Parse a scenario in the ``input/scenario_template.json`` schema."""
+
+    assumptions = _assumptions_from_spec(spec.get("baseline") or {})
+    shocks = [
+        MacroShock(
+            name=str(raw.get("name") or raw.get("channel", ShockChannel.DEMAND.value)),
+            channel=ShockChannel(raw.get("channel", ShockChannel.DEMAND.value)),
+            magnitude=float(raw.get("magnitude", 0.0)),
+            duration=int(raw.get("duration", 3)),
+            persistence=float(raw.get("persistence", 0.75)),
+            start_month=int(raw.get("start_month", 1)),
+        )
+        for raw in spec.get("shocks") or []
+    ]
+    return shocks, int(spec.get("horizon", 24)), assumptions
+
+
+def _assumptions_from_spec(raw_baseline: Mapping[str, Any]) -> BaselineAssumptions:
+    unknown = sorted(set(raw_baseline) - set(BaselineAssumptions.__dataclass_fields__))
+    if unknown:
+        raise ValueError(f"Unknown baseline fields: {', '.join(unknown)}")
+    return BaselineAssumptions(
+        **{key: _start_date(value) if key == "start_date" else float(value) for key, value in raw_baseline.items()}
+    )
+
+
+def _start_date(value: Any) -> str:
+    try:
+        day = np.datetime64(value, "D") if isinstance(value, str) else np.datetime64("NaT")
+    except ValueError:
+        day = np.datetime64("NaT")
+    if np.isnat(day):
+        raise ValueError(f"Baseline start_date must be a date, got {value!r}.")
+    return value
+
+
+def _baseline_block(
+    horizon: int,
+    *,
+    trend_growth: Any,
+    target_inflation: Any,
+    initial_inflation: Any,
+    neutral_real_rate: Any,
+    initial_policy_rate: Any,
+    initial_output_gap: Any,
+) -> np.ndarray:
+    """Baseline paths stacked as ``(..., variable, month)``.
+
+    Scalars give a ``(5, horizon)`` block; arrays of assumptions with shape
+    ``(n, 1)`` broadcast to one block per row.
+    """
+
+    t = np.arange(horizon, dtype=float)
+    neutral_policy_rate = np.asarray(target_inflation) + np.asarray(neutral_real_rate)
+    output_gap = np.asarray(initial_output_gap) * (0.91**t)
+    inflation_gap = (np.asarray(initial_inflation) - target_inflation) * (0.94**t)
+    inflation = target_inflation + inflation_gap + 0.08 * output_gap
+    policy_gap = (np.asarray(initial_policy_rate) - neutral_policy_rate) * (0.92**t)
+    policy_rate = neutral_policy_rate + policy_gap + 0.22 * inflation_gap + 0.08 * output_gap
+    gdp_growth = trend_growth + 0.35 * output_gap
+    return np.stack(np.broadcast_arrays(gdp_growth, inflation, policy_rate, policy_rate - inflation, output_gap), axis=-2)
+
+
+@lru_cache(maxsize=None)
+def _response_kernel(channel: ShockChannel, endogenous_policy: bool = False) -> np.ndarray:
+    """Channel response profile as a read-only ``(variable, lag)`` matrix.
+
+    With ``endogenous_policy`` the policy-rate row of every non-monetary
+    channel is dropped; a ``PolicyRule`` supplies that response instead.
+    """
+
+    return _profile_kernel(channel, RESPONSE_PROFILES[channel], endogenous_policy)
+
+
+def _profile_kernel(channel: ShockChannel, profile: ResponseProfile, endogenous_policy: bool) -> np.ndarray:
+    unknown = sorted(set(profile) - set(VARIABLE_INDEX))
+    if unknown:
+        raise ValueError(f"Unknown profile variables for {channel.value}: {', '.join(unknown)}")
+    lags = max((len(coefficients) for coefficients in profile.values()), default=1)
+    kernel = np.zeros((len(DISPLAY_VARIABLES), lags), dtype=float)
+    for variable, coefficients in profile.items():
+        if endogenous_policy and variable == "policy_rate" and channel != ShockChannel.MONETARY:
+            continue
+        kernel[VARIABLE_INDEX[variable], : len(coefficients)] = coefficients
+    kernel.setflags(write=False)
+    return kernel
+
+
+def _channel_kernels(
+    profiles: Mapping[ShockChannel, ResponseProfile] | None,
+    endogenous_policy: bool,
+) -> dict[ShockChannel, np.ndarray]:
+    """Kernels for every channel, with ``profiles`` overriding the calibration."""
+
+    if profiles is None:
+        return {channel: _response_kernel(channel, endogenous_policy) for channel in CHANNEL_ORDER}
+    return {
+        channel: _profile_kernel(channel, profiles[channel], endogenous_policy)
+        if channel in profiles
+        else _response_kernel(channel, endogenous_policy)
+        for channel in CHANNEL_ORDER
+    }
+
+
+def _response_matrix(kernels: Mapping[ShockChannel, np.ndarray], horizon: int) -> np.ndarray:
+    """Cached response matrix for ``kernels`` truncated to ``horizon``."""
+
+    truncated = [np.ascontiguousarray(kernels[channel][:, :horizon], dtype=float) for channel in CHANNEL_ORDER]
+    return _cached_response_matrix(horizon, *((kernel.shape[1], kernel.tobytes()) for kernel in truncated))
+
+
+@lru_cache(maxsize=32)
+def _cached_response_matrix(horizon: int, *kernels: tuple[int, bytes]) -> np.ndarray:
+    """Every channel's lag convolution as one ``(channel x month, variable x month)`` matrix, read-only.
+
+    Within the standard horizon one matrix product over all channels is far
+    cheaper than a lag loop per channel; long horizons keep ``_lag_convolve``.
+    """
+
+    lag = np.arange(horizon) - np.arange(horizon)[:, None]
+    blocks = []
+    for lags, data in kernels:
+        kernel = np.zeros((len(DISPLAY_VARIABLES), horizon), dtype=float)
+        kernel[:, :lags] = np.frombuffer(data, dtype=float).reshape(len(DISPLAY_VARIABLES), lags)
+        blocks.append(np.where(lag >= 0, kernel[:, np.maximum(lag, 0)], 0.0))
+    matrix = np.stack(blocks).transpose(0, 2, 1, 3).reshape(len(CHANNEL_ORDER) * horizon, -1)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def _policy_solver(rule: PolicyRule, horizon: int, monetary: np.ndarray | None = None) -> np.ndarray:
+    """Cached solver for ``rule`` under the given monetary kernel."""
+
+    monetary = _response_kernel(ShockChannel.MONETARY) if monetary is None else monetary
+    rows = [
+        tuple(monetary[VARIABLE_INDEX[variable], :horizon].tolist())
+        for variable in ("policy_rate", "inflation", "output_gap")
+    ]
+    return _cached_policy_solver(rule, horizon, *rows)
+
+
+@lru_cache(maxsize=64)
+def _cached_policy_solver(
+    rule: PolicyRule,
+    horizon: int,
+    policy_row: tuple[float, ...],
+    inflation_row: tuple[float, ...],
+    output_gap_row: tuple[float, ...],
+) -> np.ndarray:
+    """Inverse of the rule's lower-triangular Toeplitz system, read-only.
+
+    With ``u`` the rule-driven monetary impulses and ``T_x`` the monetary
+    channel's lag profile for variable ``x`` as a Toeplitz matrix, the rule
+    reads ``A u = (1 - rho) (phi_pi pi_exo + phi_y gap_exo)`` where
+    ``A = (I - rho L) T_p - (1 - rho) (phi_pi T_pi + phi_y T_gap)``. The policy
+    row leads with 1.0 while inflation and the gap respond with a lag, so
+    ``A`` is unit lower triangular and always invertible.
+    """
+
+    def padded(row: tuple[float, ...]) -> np.ndarray:
+        return np.pad(np.asarray(row, dtype=float), (0, horizon - len(row)))
+
+    policy = padded(policy_row)
+    if abs(policy[0]) < 1e-12:
+        raise ValueError("A policy rule needs a monetary profile with an immediate policy-rate response.")
+    column = policy.copy()
+    column[1:] -= rule.smoothing * policy[:-1]
+    column -= (1.0 - rule.smoothing) * (rule.inflation * padded(inflation_row) + rule.output_gap * padded(output_gap_row))
+
+    offsets = np.subtract.outer(np.arange(horizon), np.arange(horizon))
+    system = np.where(offsets >= 0, column[np.clip(offsets, 0, None)], 0.0)
+    solver = np.linalg.inv(system)
+    solver.setflags(write=False)
+    return solver
+
+
+@timed("engine.policy_feedback")
+def _policy_feedback(blocks: np.ndarray, rule: PolicyRule, monetary: np.ndarray | None = None) -> np.ndarray:
+    """Responses to the rule's rate path for ``(..., variable, month)`` blocks.
+
+    The solve is one matmul against the cached inverse, so any number of
+    scenarios or attribution groups are handled in a single call. The result
+    is linear in ``blocks``, so per-group feedback sums to the total feedback.
+    """
+
+    target = rule.inflation * blocks[..., VARIABLE_INDEX["inflation"], :]
+    target = target + rule.output_gap * blocks[..., VARIABLE_INDEX["output_gap"], :]
+    monetary = _response_kernel(ShockChannel.MONETARY) if monetary is None else monetary
+    impulses = (1.0 - rule.smoothing) * target @ _policy_solver(rule, blocks.shape[-1], monetary).T
+    return _lag_convolve(impulses, monetary)
+
+
+def _assemble_arrays(
+    baseline: dict[str, np.ndarray],
+    contributions: np.ndarray,
+    shocks: list[MacroShock],
+    assumptions: BaselineAssumptions,
+) -> ScenarioArrays:
+    """Combine baseline paths with ``(variable, month)`` shock contributions."""
+
+    columns = dict(baseline)
+    for variable in DISPLAY_VARIABLES:
+        if variable == "real_rate":
+            continue
+        delta = contributions[VARIABLE_INDEX[variable]]
+        columns[f"{variable}_delta"] = delta
+        columns[f"{variable}_scenario"] = columns[f"{variable}_baseline"] + delta
+
+    columns["real_rate_scenario"] = columns["policy_rate_scenario"] - columns["inflation_scenario"]
+    columns["real_rate_delta"] = columns["real_rate_scenario"] - columns["real_rate_baseline"]
+
+    values = _rule_metrics(columns, len(shocks))
+    metrics = _scenario_metrics(values)
+    warnings = _coherence_warnings(values)
+    return ScenarioArrays(
+        dates=month_starts(assumptions.start_date, contributions.shape[-1]),
+        columns=columns,
+        shocks=shocks,
+        baseline=assumptions,
+        metrics=metrics,
+        warnings=warnings,
+    )
+
+
+def _lag_convolve(impulses: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Convolve ``(..., month)`` impulses with a ``(variable, lag)`` kernel.
+
+    Returns ``(..., variable, month)`` responses truncated to the horizon.
+    Short kernels use a direct lag loop; once the effective lag count reaches
+    ``FFT_MIN_LAGS`` the FFT route is cheaper and agrees to rounding error.
+    """
+
+    horizon = impulses.shape[-1]
+    lags = min(kernel.shape[1], horizon)
+    if lags >= FFT_MIN_LAGS:
+        return _fft_convolve(impulses, kernel[:, :lags])
+
+    out = np.zeros((*impulses.shape[:-1], kernel.shape[0], horizon), dtype=float)
+    for lag in range(lags):
+        out[..., lag:] += kernel[:, lag, None] * impulses[..., None, : horizon - lag]
+    return out
+
+
+def _fft_convolve(impulses: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    horizon = impulses.shape[-1]
+    size = 1 << (horizon + kernel.shape[1] - 2).bit_length()
+    spectrum = np.fft.rfft(impulses, size)[..., None, :] * np.fft.rfft(kernel, size)
+    return np.fft.irfft(spectrum, size)[..., :horizon]
+
+
+def _shock_contribution(shock: MacroShock, horizon: int) -> np.ndarray:
+    """One shock's ``(variable, month)`` contribution block."""
+
+    return _lag_convolve(_shock_impulses(shock, horizon), _response_kernel(shock.channel))
+
+
+@timed("engine.apply_shock")
+def _apply_shock(contributions: np.ndarray, shock: MacroShock, horizon: int) -> None:
+    contributions += _shock_contribution(shock, horizon)
+
+
+def _impulse_matrix(
+    magnitude: np.ndarray,
+    duration: np.ndarray,
+    persistence: np.ndarray,
+    start_month: np.ndarray,
+    horizon: int,
+) -> np.ndarray:
+    """Impulse paths for many normalized shocks at once, shape ``(shock, month)``."""
+
+    elapsed = np.arange(horizon) - (np.asarray(start_month)[:, None] - 1)
+    active = (elapsed >= 0) & (elapsed < np.asarray(duration)[:, None])
+    decay = np.asarray(persistence, dtype=float)[:, None] ** np.maximum(elapsed, 0)
+    return np.where(active, np.asarray(magnitude, dtype=float)[:, None] * decay, 0.0)
+
+
+@timed("engine.attribute_shocks")
+def _attribute_shocks(
+    shocks: list[MacroShock],
+    horizon: int,
+    by: str,
+    policy_rule: PolicyRule | None = None,
+    profiles: Mapping[ShockChannel, ResponseProfile] | None = None,
+) -> ShockAttribution:
+    """Decompose deltas by shock or channel in one vectorized pass.
+
+    Impulses are built for all shocks at once and convolved once per channel.
+    Channel mode sums impulses before the convolution, so memory stays at
+    ``channels x variables x months`` however long the shock list is. Under a
+    policy rule each group carries the rate response its own impulse triggers.
+    """
+
+    impulses = _impulse_matrix(
+        np.array([shock.magnitude for shock in shocks], dtype=float),
+        np.array([shock.duration for shock in shocks], dtype=int),
+        np.array([shock.persistence for shock in shocks], dtype=float),
+        np.array([shock.start_month for shock in shocks], dtype=int),
+        horizon,
+    )
+    channels = np.array([CHANNEL_ORDER.index(shock.channel) for shock in shocks], dtype=int)
+    kernels = _channel_kernels(profiles, policy_rule is not None)
+
+    if by == "channel":
+        present = [channel for channel in CHANNEL_ORDER if channel in {shock.channel for shock in shocks}]
+        tensor = np.zeros((len(present), len(DISPLAY_VARIABLES), horizon), dtype=float)
+        for row, channel in enumerate(present):
+            grouped = impulses[channels == CHANNEL_ORDER.index(channel)].sum(axis=0)
+            tensor[row] = _lag_convolve(grouped, kernels[channel])
+        labels = [channel.value for channel in present]
+    else:
+        tensor = np.zeros((len(shocks), len(DISPLAY_VARIABLES), horizon), dtype=float)
+        for index, channel in enumerate(CHANNEL_ORDER):
+            rows = channels == index
+            if rows.any():
+                tensor[rows] = _lag_convolve(impulses[rows], kernels[channel])
+        labels = [shock.name for shock in shocks]
+
+    if policy_rule is not None:
+        tensor += _policy_feedback(tensor, policy_rule, kernels[ShockChannel.MONETARY])
+
+    real_rate = VARIABLE_INDEX["real_rate"]
+    tensor[:, real_rate] = tensor[:, VARIABLE_INDEX["policy_rate"]] - tensor[:, VARIABLE_INDEX["inflation"]]
+    return ShockAttribution(by=by, labels=labels, contributions=np.ascontiguousarray(tensor.transpose(0, 2, 1)))
+
+
+def _shock_impulses(shock: MacroShock, horizon: int) -> np.ndarray:
+    impulses = np.zeros(horizon, dtype=float)
+    start = shock.start_month - 1
+    if start >= horizon:
+        return impulses
+
+    stop = min(horizon, start + shock.duration)
+    impulses[start:stop] = shock.magnitude * (shock.persistence ** np.arange(stop - start))
+    return impulses
+
+
+def _rule_metrics(columns: Mapping[str, Any], shock_count: int) -> dict[str, float]:
+    values = {
+        name: float(getattr(columns[f"{variable}_{kind}"], reduction)())
+        for name, (variable, kind, reduction) in RULE_METRICS.items()
+    }
+    values["shock_count"] = float(shock_count)
+    return values
+
+
+@timed("engine.scenario_metrics")
+def _scenario_metrics(values: Mapping[str, float]) -> dict[str, float | str]:
+    return {"regime": REGIME_RULES.first_match(values), **{name: values[name] for name in SCENARIO_METRICS}}
+
+
+@timed("engine.coherence_warnings")
+def _coherence_warnings(values: Mapping[str, float]) -> list[str]:
+    return WARNING_RULES.matches(values)
+
+
+def _validate_horizon(horizon: int, long_horizon: bool = False) -> int:
+    horizon = int(horizon)
+    limit = LONG_MAX_HORIZON if long_horizon else MAX_HORIZON
+    if horizon < 6 or horizon > limit:
+        raise ValueError(f"Horizon must be between 6 and {limit} months.")
+    return horizon
+
+
+def _validate_shock_arrays(shocks: ShockArrays, horizon: int) -> None:
+    """Vectorized ``_validate_shocks`` for columnar input; reports the first bad row."""
+
+    checks = [
+        ((shocks.channel < 0) | (shocks.channel >= len(CHANNEL_ORDER)), "has an unsupported shock channel"),
+        (np.abs(shocks.magnitude) > 6, "is too large for this calibrated engine"),
+        ((shocks.duration < 1) | (shocks.duration > horizon), "duration must be between 1 and the horizon"),
+        ((shocks.start_month < 1) | (shocks.start_month > horizon), "start month must be inside the horizon"),
+    ]
+    for failed, message in checks:
+        if failed.any():
+            raise ValueError(f"Shock row {int(np.argmax(failed))} {message}.")
+
+
+def _validate_shocks(shocks: list[MacroShock], horizon: int) -> None:
+    for shock in shocks:
+        if shock.channel not in RESPONSE_PROFILES:
+            raise ValueError(f"Unsupported shock channel: {shock.channel}")
+        if abs(shock.magnitude) > 6:
+            raise ValueError(f"Shock '{shock.name}' is too large for this calibrated engine.")
+        if shock.duration < 1 or shock.duration > horizon:
+            raise ValueError(f"Shock '{shock.name}' duration must be between 1 and the horizon.")
+        if shock.start_month < 1 or shock.start_month > horizon:
+            raise ValueError(f"Shock '{shock.name}' start month must be inside the horizon.")
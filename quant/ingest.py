@@ -0,0 +1,289 @@
+"""Bulk ingestion of scenario specs into columnar shock arrays.
+
+Specs use the ``input/scenario_template.json`` schema, one per JSONL line.
+Lines are parsed in chunks and every shock field of a chunk is converted,
+normalized and validated as one array, the way ``MacroShock.normalized`` and
+``_validate_shocks`` treat a single shock. A bad row does not stop the file:
+its scenario is dropped and an ``IngestError`` names the line, the shock and
+the reason. Valid scenarios come out as ``ShockArrays`` ready for
+``simulate_batch``, grouped by horizon and baseline.
+
+    for chunk in iter_chunks("drop.jsonl"):
+        for scenarios, batch in chunk.batches():
+            ...
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from itertools import islice
+import json
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+import numpy as np
+
+from quant.core import (
+    CHANNEL_ORDER,
+    LONG_MAX_HORIZON,
+    MAX_HORIZON,
+    BaselineAssumptions,
+    BatchResult,
+    ShockArrays,
+    _assumptions_from_spec,
+    simulate_batch,
+)
+from utils.instrumentation import increment, timed
+
+
+CHANNEL_CODES = {channel.value: code for code, channel in enumerate(CHANNEL_ORDER)}
+SHOCK_DEFAULTS = {"magnitude": 0.0, "duration": 3, "persistence": 0.75, "start_month": 1}
+DEFAULT_CHUNK_SIZE = 20_000
+
+
+@dataclass(frozen=True)
+class IngestError:
+    """A rejected spec; ``shock`` is the row within its ``shocks`` list, or None for the spec itself."""
+
+    line: int
+    shock: int | None
+    message: str
+
+
+@dataclass
+class IngestChunk:
+    """Valid scenarios of one chunk; ``baselines`` indexes into ``assumptions``."""
+
+    shocks: ShockArrays
+    names: np.ndarray
+    lines: np.ndarray
+    horizons: np.ndarray
+    baselines: np.ndarray
+    assumptions: list[BaselineAssumptions]
+    errors: list[IngestError] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def groups(self) -> list[np.ndarray]:
+        """Chunk positions of the scenarios in each (horizon, baseline) group."""
+
+        keys = self.horizons * len(self.assumptions) + self.baselines
+        groups, inverse = np.unique(keys, return_inverse=True)
+        return [np.flatnonzero(inverse == group) for group in range(len(groups))]
+
+    def simulate_group(self, scenarios: np.ndarray, **options: Any) -> BatchResult:
+        """Simulate one entry of ``groups`` with ``simulate_batch``.
+
+        ``options`` are passed on, e.g. ``policy_rule`` or ``long_horizon``.
+        """
+
+        rows = np.flatnonzero(np.isin(self.shocks.scenario, scenarios))
+        position = np.zeros(len(self), dtype=np.int64)
+        position[scenarios] = np.arange(len(scenarios))
+        first = int(scenarios[0])
+        return simulate_batch(
+            self.shocks.take(rows, position[self.shocks.scenario[rows]]),
+            horizon=int(self.horizons[first]),
+            assumptions=self.assumptions[int(self.baselines[first])],
+            scenarios=len(scenarios),
+            **options,
+        )
+
+    def batches(self, **options: Any) -> Iterator[tuple[np.ndarray, BatchResult]]:
+        """Simulate the chunk one (horizon, baseline) group at a time.
+
+        Yields the chunk positions of each group's scenarios with its result.
+        """
+
+        for scenarios in self.groups():
+            yield scenarios, self.simulate_group(scenarios, **options)
+
+
+def iter_chunks(
+    path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE, long_horizon: bool = False
+) -> Iterator[IngestChunk]:
+    """Stream a JSONL file of specs as ``IngestChunk``s of up to ``chunk_size`` lines."""
+
+    with Path(path).open("rb") as handle:
+        numbered = ((line_no, line) for line_no, line in enumerate(handle, start=1) if line.strip())
+        while True:
+            lines = list(islice(numbered, max(1, chunk_size)))
+            if not lines:
+                return
+            specs: list[Any] = []
+            line_numbers: list[int] = []
+            errors: list[IngestError] = []
+            for line_no, line in lines:
+                try:
+                    specs.append(json.loads(line.decode("utf-8")))
+                    line_numbers.append(line_no)
+                except UnicodeDecodeError:
+                    errors.append(IngestError(line_no, None, "Line is not valid UTF-8."))
+                except json.JSONDecodeError as exc:
+                    errors.append(IngestError(line_no, None, f"Invalid JSON: {exc.msg}."))
+            chunk = parse_specs(specs, line_numbers, long_horizon)
+            chunk.errors = sorted(errors + chunk.errors, key=_error_order)
+            yield chunk
+
+
+def read_specs(path: str | Path, long_horizon: bool = False) -> IngestChunk:
+    """Ingest a whole JSONL file as one chunk."""
+
+    for chunk in iter_chunks(path, chunk_size=2**62, long_horizon=long_horizon):
+        return chunk
+    return parse_specs([])
+
+
+@timed("ingest.parse_specs")
+def parse_specs(
+    specs: Sequence[Any], lines: Sequence[int] | None = None, long_horizon: bool = False
+) -> IngestChunk:
+    """Convert, normalize and validate parsed specs in vectorized form.
+
+    ``lines`` labels each spec in error reports and defaults to 1, 2, ...
+    """
+
+    lines = np.arange(1, len(specs) + 1) if lines is None else np.asarray(lines, dtype=np.int64)
+    bad = np.zeros(len(specs), dtype=bool)
+    errors: list[IngestError] = []
+
+    def reject(index: int, shock: int | None, message: str) -> None:
+        bad[index] = True
+        errors.append(IngestError(int(lines[index]), shock, message))
+
+    rows: list[dict[str, Any]] = []
+    owners: list[int] = []
+    positions: list[int] = []
+    horizons: list[Any] = []
+    baselines = np.zeros(len(specs), dtype=np.int64)
+    assumptions: list[BaselineAssumptions] = []
+    baseline_codes: dict[Any, int] = {}
+    for index, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            reject(index, None, "Spec must be a JSON object.")
+            horizons.append(24)
+            continue
+        horizons.append(spec.get("horizon", 24))
+        raw_shocks = spec.get("shocks") or []
+        if not isinstance(raw_shocks, list):
+            reject(index, None, "Spec shocks must be a list.")
+            continue
+        for position, raw in enumerate(raw_shocks):
+            if isinstance(raw, dict):
+                rows.append(raw)
+                owners.append(index)
+                positions.append(position)
+            else:
+                reject(index, position, "Shock must be a JSON object.")
+        raw_baseline = spec.get("baseline") or {}
+        try:
+            key = tuple(sorted(raw_baseline.items()))
+            if key not in baseline_codes:
+                assumptions.append(_assumptions_from_spec(raw_baseline))
+                baseline_codes[key] = len(assumptions) - 1
+            baselines[index] = baseline_codes[key]
+        except (AttributeError, TypeError, ValueError) as exc:
+            reject(index, None, f"Invalid baseline: {exc}")
+
+    limit = LONG_MAX_HORIZON if long_horizon else MAX_HORIZON
+    horizon, invalid = _numeric(horizons)
+    horizon = np.trunc(np.where(invalid, 0, horizon)).astype(np.int64)
+    for index in np.flatnonzero(invalid | (horizon < 6) | (horizon > limit)).tolist():
+        reject(index, None, f"Horizon must be between 6 and {limit} months.")
+
+    owner = np.asarray(owners, dtype=np.int64)
+    default_channel = CHANNEL_ORDER[0].value
+    channel = np.array([_channel_code(raw.get("channel", default_channel)) for raw in rows], dtype=np.int64)
+    for row in np.flatnonzero(channel < 0).tolist():
+        reject(owners[row], positions[row], f"Unsupported shock channel: {rows[row].get('channel')}")
+    failed = channel < 0
+    columns = {}
+    checks = []
+    for name, default in SHOCK_DEFAULTS.items():
+        values, invalid = _numeric([raw.get(name, default) for raw in rows])
+        columns[name] = values
+        checks.append((invalid, f"Shock {name.replace('_', ' ')} must be a finite number."))
+        failed = failed | invalid
+
+    # MacroShock.normalized, then _validate_shocks against each spec's horizon.
+    # Months are clipped to one past the limit before the int cast, so huge
+    # finite values still fail the horizon checks instead of overflowing.
+    magnitude = columns["magnitude"]
+    duration = np.clip(np.trunc(np.where(failed, 1, columns["duration"])), 1, limit + 1).astype(np.int64)
+    persistence = np.clip(columns["persistence"], 0.0, 0.98)
+    start_month = np.clip(np.trunc(np.where(failed, 1, columns["start_month"])), 1, limit + 1).astype(np.int64)
+    active = ~failed & (np.abs(magnitude) > 1e-9)
+    row_horizon = horizon[owner]
+    checks += [
+        (active & (np.abs(magnitude) > 6), "Shock is too large for this calibrated engine."),
+        (active & (duration > row_horizon), "Shock duration must be between 1 and the horizon."),
+        (active & (start_month > row_horizon), "Shock start month must be inside the horizon."),
+    ]
+    for mask, message in checks:
+        for row in np.flatnonzero(mask).tolist():
+            reject(owners[row], positions[row], message)
+
+    kept = np.flatnonzero(~bad)
+    renumber = np.cumsum(~bad) - 1
+    rows_kept = np.flatnonzero(active & ~bad[owner])
+    names = np.array(
+        [
+            str(rows[row].get("name") or "").strip() or CHANNEL_ORDER[channel[row]].value
+            for row in rows_kept.tolist()
+        ],
+        dtype=object,
+    )
+    shocks = ShockArrays(
+        scenario=renumber[owner[rows_kept]],
+        channel=channel[rows_kept],
+        magnitude=magnitude[rows_kept],
+        duration=duration[rows_kept],
+        persistence=persistence[rows_kept],
+        start_month=start_month[rows_kept],
+        names=names,
+    )
+    increment("shock_rows_ingested", len(rows))
+    return IngestChunk(
+        shocks=shocks,
+        names=np.array([_scenario_name(specs[index], int(lines[index])) for index in kept.tolist()], dtype=object),
+        lines=lines[kept],
+        horizons=horizon[kept],
+        baselines=baselines[kept],
+        assumptions=assumptions,
+        errors=sorted(errors, key=_error_order),
+    )
+
+
+def _numeric(values: Iterable[Any]) -> tuple[np.ndarray, np.ndarray]:
+    """Float array of ``values`` and a mask of entries that are not finite numbers."""
+
+    values = list(values)
+    try:
+        array = np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        array = None
+    if array is None or array.shape != (len(values),):
+        array = np.array([_to_float(value) for value in values], dtype=float)
+    invalid = ~np.isfinite(array)
+    array[invalid] = 0.0
+    return array, invalid
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _channel_code(value: Any) -> int:
+    return CHANNEL_CODES.get(value, -1) if isinstance(value, str) else -1
+
+
+def _error_order(error: IngestError) -> tuple[int, int]:
+    return error.line, -1 if error.shock is None else error.shock
+
+
+def _scenario_name(spec: dict[str, Any], line: int) -> str:
+    return str(spec.get("scenario_name") or f"line {line}")
@@ -1,7 +1,16 @@
-"""Analyst-style narrative generation for macro scenarios."""
+"""Analyst-style narrative generation for macro scenarios.
+
+All narrative inputs are extracted from ``result.frame`` in a single array pass
+into a ``NarrativeSummary``; the text is then rendered through module-level
+templates so batch jobs can afford a note for every scenario.
+"""
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+
+import numpy as np
+
 from quant.macro_engine import (
     DISPLAY_VARIABLES,
     VARIABLE_LABELS,
@@ -9,76 +18,162 @@ from quant.macro_engine import (
     ScenarioResult,
     ShockChannel,
 )
+from utils.instrumentation import timed
+
+
+_OPENING = (
+    "**Executive read.** The scenario is classified as **{regime}**. "
+    "{shock_text} The largest inflation reading is "
+    "{inflation_peak:.2f}% in {inflation_month}, while GDP growth bottoms at "
+    "{growth_trough:.2f}% in {growth_month}."
+).format
+
+_TRANSMISSION = (
+    "**Transmission.** The impulse propagates through prices, activity and policy with lagged effects. "
+    "Inflation {inflation}, activity {activity}, and the policy stance {direction}. "
+    "The largest contributions are: {details}."
+).format
+
+_CONTRIBUTION = "{label} moves by {value:+.2f} {unit}".format
+
+_POLICY = (
+    "**Policy read.** The policy-rate path peaks at {policy_peak:.2f}% "
+    "in {policy_month}; the real rate reaches {real_rate_peak:.2f}%. "
+    "{interpretation}"
+).format
+
+_SINGLE_SHOCK = (
+    "The active shock is **{name}**, a {channel} impulse "
+    "of {magnitude:+.2f} pp lasting {duration} months."
+).format
+
+_MULTI_SHOCK = "The scenario combines {count} shocks across {channels} channels.".format
+
+_SHOCK_LINE = (
+    "- {name}: {channel}, {magnitude:+.2f} pp, "
+    "{duration}m duration, {persistence:.2f} persistence, starts month {start_month}"
+).format
+
+_METRICS = (
+    "- Regime: {regime}\n"
+    "- Peak inflation: {inflation_peak:.2f}%\n"
+    "- GDP growth trough: {growth_trough:.2f}%\n"
+    "- Policy-rate peak: {policy_peak:.2f}%\n"
+    "- Real-rate peak: {real_rate_peak:.2f}%\n"
+    "- Output-gap trough: {output_gap_trough:.2f}%"
+).format
+
+_REPORT = (
+    "# {title}\n\n## Analyst note\n\n{note}\n\n## Shocks\n\n{shocks}\n\n"
+    "## Key metrics\n\n{metrics}\n\n## Coherence checks\n\n{warnings}"
+).format
+
+_NO_FLAGS = (
+    "**Risk flags.** No hard coherence flag is triggered. The scenario is internally consistent, "
+    "but should still be read as a calibrated sensitivity exercise rather than a forecast."
+)
 
+_TAKEAWAYS: dict[str, str] = {
+    "Stagflation stress": "The key risk is an uncomfortable mix of weaker activity and above-target inflation.",
+    "Recession risk": "The main macro signal is activity downside, with policy support only partly offsetting the shock.",
+    "Inflation pressure": "The scenario is dominated by price pressure and the credibility of the policy response.",
+    "Restrictive policy": "The transmission channel is primarily real-rate tightening and delayed demand destruction.",
+}
+_DEFAULT_TAKEAWAY = "The adjustment remains contained and does not create a dominant macro stress regime."
 
-def generate_analyst_note(result: ScenarioResult) -> str:
-    """Build a concise macro note from simulated paths and diagnostics."""
+_DELTA_COLUMNS = [f"{variable}_delta" for variable in DISPLAY_VARIABLES]
+_EXTREME_COLUMNS = ["inflation_scenario", "gdp_growth_scenario", "policy_rate_scenario"]
 
-    metrics = result.metrics
+
+@dataclass(frozen=True)
+class NarrativeSummary:
+    """Every path statistic the narrative needs, extracted in one pass."""
+
+    delta_min: dict[str, float]
+    delta_max: dict[str, float]
+    inflation_peak_month: str
+    growth_trough_month: str
+    policy_peak_month: str
+
+    def dominant_delta(self, variable: str) -> float:
+        low = self.delta_min[variable]
+        high = self.delta_max[variable]
+        return high if abs(high) >= abs(low) else low
+
+
+def summarize_result(result: ScenarioResult) -> NarrativeSummary:
     frame = result.frame
-    regime = str(metrics["regime"])
-
-    shock_text = _shock_summary(result)
-    peak_inflation_month = _month_of_extreme(frame, "inflation_scenario", "max")
-    growth_trough_month = _month_of_extreme(frame, "gdp_growth_scenario", "min")
-    policy_peak_month = _month_of_extreme(frame, "policy_rate_scenario", "max")
-
-    opening = (
-        f"**Executive read.** The scenario is classified as **{regime}**. "
-        f"{shock_text} The largest inflation reading is "
-        f"{metrics['inflation_peak']:.2f}% in {peak_inflation_month}, while GDP growth bottoms at "
-        f"{metrics['growth_trough']:.2f}% in {growth_trough_month}."
+    deltas = np.stack([frame[column].to_numpy(dtype=float) for column in _DELTA_COLUMNS])
+    extremes = np.stack([frame[column].to_numpy(dtype=float) for column in _EXTREME_COLUMNS])
+    dates = frame["date"]
+
+    delta_min = deltas.min(axis=1)
+    delta_max = deltas.max(axis=1)
+    inflation_idx, policy_idx = extremes[[0, 2]].argmax(axis=1)
+    growth_idx = int(extremes[1].argmin())
+
+    return NarrativeSummary(
+        delta_min=dict(zip(DISPLAY_VARIABLES, delta_min.tolist())),
+        delta_max=dict(zip(DISPLAY_VARIABLES, delta_max.tolist())),
+        inflation_peak_month=dates.iat[inflation_idx].strftime("%b %Y"),
+        growth_trough_month=dates.iat[growth_idx].strftime("%b %Y"),
+        policy_peak_month=dates.iat[policy_idx].strftime("%b %Y"),
     )
 
-    transmission = _transmission_paragraph(result)
-    policy = (
-        f"**Policy read.** The policy-rate path peaks at {metrics['policy_peak']:.2f}% "
-        f"in {policy_peak_month}; the real rate reaches {metrics['real_rate_peak']:.2f}%. "
-        f"{_policy_interpretation(result)}"
-    )
 
-    risks = _risk_paragraph(result)
-    takeaway = _takeaway(result)
+@timed("narrative.generate_analyst_note")
+def generate_analyst_note(result: ScenarioResult, summary: NarrativeSummary | None = None) -> str:
+    """Build a concise macro note from simulated paths and diagnostics."""
+
+    summary = summary or summarize_result(result)
+    metrics = result.metrics
+
+    opening = _OPENING(
+        regime=metrics["regime"],
+        shock_text=_shock_summary(result),
+        inflation_peak=metrics["inflation_peak"],
+        inflation_month=summary.inflation_peak_month,
+        growth_trough=metrics["growth_trough"],
+        growth_month=summary.growth_trough_month,
+    )
+    policy = _POLICY(
+        policy_peak=metrics["policy_peak"],
+        policy_month=summary.policy_peak_month,
+        real_rate_peak=metrics["real_rate_peak"],
+        interpretation=_policy_interpretation(result, summary),
+    )
 
-    return "\n\n".join([opening, transmission, policy, risks, takeaway])
+    return "\n\n".join(
+        [opening, _transmission_paragraph(summary), policy, _risk_paragraph(result), _takeaway(result)]
+    )
 
 
+@timed("narrative.generate_markdown_report")
 def generate_markdown_report(result: ScenarioResult, title: str = "Macro scenario report") -> str:
     """Create a portable markdown report with assumptions and key metrics."""
 
     shocks = "\n".join(
         [
-            f"- {shock.name}: {shock.channel.value}, {shock.magnitude:+.2f} pp, "
-            f"{shock.duration}m duration, {shock.persistence:.2f} persistence, starts month {shock.start_month}"
+            _SHOCK_LINE(
+                name=shock.name,
+                channel=shock.channel.value,
+                magnitude=shock.magnitude,
+                duration=shock.duration,
+                persistence=shock.persistence,
+                start_month=shock.start_month,
+            )
             for shock in result.shocks
         ]
     ) or "- No active shock."
 
-    metrics = "\n".join(
-        [
-            f"- Regime: {result.metrics['regime']}",
-            f"- Peak inflation: {result.metrics['inflation_peak']:.2f}%",
-            f"- GDP growth trough: {result.metrics['growth_trough']:.2f}%",
-            f"- Policy-rate peak: {result.metrics['policy_peak']:.2f}%",
-            f"- Real-rate peak: {result.metrics['real_rate_peak']:.2f}%",
-            f"- Output-gap trough: {result.metrics['output_gap_trough']:.2f}%",
-        ]
-    )
-
     warnings = "\n".join([f"- {warning}" for warning in result.warnings]) or "- None."
 
-    return "\n\n".join(
-        [
-            f"# {title}",
-            "## Analyst note",
-            generate_analyst_note(result),
-            "## Shocks",
-            shocks,
-            "## Key metrics",
-            metrics,
-            "## Coherence checks",
-            warnings,
-        ]
+    return _REPORT(
+        title=title,
+        note=generate_analyst_note(result),
+        shocks=shocks,
+        metrics=_METRICS(**result.metrics),
+        warnings=warnings,
     )
 
 
@@ -88,55 +183,41 @@ def _shock_summary(result: ScenarioResult) -> str:
 
     if len(result.shocks) == 1:
         shock = result.shocks[0]
-        return (
-            f"The active shock is **{shock.name}**, a {shock.channel.value.lower()} impulse "
-            f"of {shock.magnitude:+.2f} pp lasting {shock.duration} months."
+        return _SINGLE_SHOCK(
+            name=shock.name,
+            channel=shock.channel.value.lower(),
+            magnitude=shock.magnitude,
+            duration=shock.duration,
         )
 
     channels = ", ".join(sorted({shock.channel.value for shock in result.shocks}))
-    return f"The scenario combines {len(result.shocks)} shocks across {channels} channels."
+    return _MULTI_SHOCK(count=len(result.shocks), channels=channels)
 
 
-def _transmission_paragraph(result: ScenarioResult) -> str:
-    frame = result.frame
-    deltas = {
-        variable: float(frame[f"{variable}_delta"].iloc[-1] - frame[f"{variable}_delta"].iloc[0])
-        for variable in DISPLAY_VARIABLES
-    }
-    peak_deltas = {
-        variable: _dominant_delta(frame, variable)
-        for variable in DISPLAY_VARIABLES
-    }
-
-    dominant = sorted(
-        ["gdp_growth", "inflation", "policy_rate", "real_rate", "output_gap"],
-        key=lambda variable: abs(peak_deltas[variable]),
-        reverse=True,
-    )[:3]
+def _transmission_paragraph(summary: NarrativeSummary) -> str:
+    peak_deltas = {variable: summary.dominant_delta(variable) for variable in DISPLAY_VARIABLES}
+    dominant = sorted(DISPLAY_VARIABLES, key=lambda variable: abs(peak_deltas[variable]), reverse=True)[:3]
 
     details = "; ".join(
         [
-            f"{VARIABLE_LABELS[var]} moves by {peak_deltas[var]:+.2f} {VARIABLE_UNITS[var]}"
+            _CONTRIBUTION(label=VARIABLE_LABELS[var], value=peak_deltas[var], unit=VARIABLE_UNITS[var])
             for var in dominant
         ]
     )
 
-    direction = "tightens" if frame["policy_rate_delta"].max() > abs(frame["policy_rate_delta"].min()) else "eases"
-    activity = "weakens" if frame["gdp_growth_delta"].min() < -0.2 else "stays broadly resilient"
-    inflation = "rises" if frame["inflation_delta"].max() > abs(frame["inflation_delta"].min()) else "falls"
-
-    return (
-        f"**Transmission.** The impulse propagates through prices, activity and policy with lagged effects. "
-        f"Inflation {inflation}, activity {activity}, and the policy stance {direction}. "
-        f"The largest contributions are: {details}."
+    low, high = summary.delta_min, summary.delta_max
+    return _TRANSMISSION(
+        inflation="rises" if high["inflation"] > abs(low["inflation"]) else "falls",
+        activity="weakens" if low["gdp_growth"] < -0.2 else "stays broadly resilient",
+        direction="tightens" if high["policy_rate"] > abs(low["policy_rate"]) else "eases",
+        details=details,
     )
 
 
-def _policy_interpretation(result: ScenarioResult) -> str:
-    frame = result.frame
-    inflation_peak_delta = float(frame["inflation_delta"].max())
-    growth_trough_delta = float(frame["gdp_growth_delta"].min())
-    policy_peak_delta = float(frame["policy_rate_delta"].max())
+def _policy_interpretation(result: ScenarioResult, summary: NarrativeSummary) -> str:
+    inflation_peak_delta = summary.delta_max["inflation"]
+    growth_trough_delta = summary.delta_min["gdp_growth"]
+    policy_peak_delta = summary.delta_max["policy_rate"]
 
     has_monetary_shock = any(shock.channel == ShockChannel.MONETARY for shock in result.shocks)
 
@@ -151,38 +232,11 @@ def _policy_interpretation(result: ScenarioResult) -> str:
 
 def _risk_paragraph(result: ScenarioResult) -> str:
     if result.warnings:
-        warning_text = " ".join(result.warnings)
-        return f"**Risk flags.** {warning_text}"
-
-    return (
-        "**Risk flags.** No hard coherence flag is triggered. The scenario is internally consistent, "
-        "but should still be read as a calibrated sensitivity exercise rather than a forecast."
-    )
+        return "**Risk flags.** " + " ".join(result.warnings)
+    return _NO_FLAGS
 
 
 def _takeaway(result: ScenarioResult) -> str:
-    regime = str(result.metrics["regime"]).lower()
-    if result.metrics["regime"] == "Stagflation stress":
-        sentence = "The key risk is an uncomfortable mix of weaker activity and above-target inflation."
-    elif result.metrics["regime"] == "Recession risk":
-        sentence = "The main macro signal is activity downside, with policy support only partly offsetting the shock."
-    elif result.metrics["regime"] == "Inflation pressure":
-        sentence = "The scenario is dominated by price pressure and the credibility of the policy response."
-    elif result.metrics["regime"] == "Restrictive policy":
-        sentence = "The transmission channel is primarily real-rate tightening and delayed demand destruction."
-    else:
-        sentence = "The adjustment remains contained and does not create a dominant macro stress regime."
-
-    return f"**Key takeaway.** {sentence} ({regime})."
-
-
-def _month_of_extreme(frame, column: str, direction: str) -> str:
-    idx = frame[column].idxmax() if direction == "max" else frame[column].idxmin()
-    return frame.loc[idx, "date"].strftime("%b %Y")
-
-
-def _dominant_delta(frame, variable: str) -> float:
-    series = frame[f"{variable}_delta"]
-    min_value = float(series.min())
-    max_value = float(series.max())
-    return max_value if abs(max_value) >= abs(min_value) else min_value
+    regime = str(result.metrics["regime"])
+    sentence = _TAKEAWAYS.get(regime, _DEFAULT_TAKEAWAY)
+    return f"**Key takeaway.** {sentence} ({regime.lower()})."
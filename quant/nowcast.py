@@ -0,0 +1,261 @@
+"""Nowcast baseline initial conditions from the ETL store.
+
+A small linear-Gaussian state-space model splits monthly y/y GDP growth and
+inflation into a slow trend, an AR(1) output gap and core inflation, using
+the same identities as the baseline engine:
+
+    gdp_growth = trend_growth + 0.35 * output_gap + noise
+    inflation  = core_inflation + 0.08 * output_gap + noise
+
+The Kalman filter loops over months but is vectorized over any number of data
+sets, and missing observations are masked rather than dropped. The nowcast is
+the filtered end state, which equals the smoothed end state, so appending one
+month only costs one filter step from the cached state of the previous data
+version. Results are cached per data version (a hash of the inputs).
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from quant.backtest import GAP_SENSITIVITY, realized_paths
+from quant.core import BaselineAssumptions
+from utils.instrumentation import increment, timed
+
+
+OBSERVED = ["gdp_growth", "inflation"]
+STATES = ["trend_growth", "output_gap", "core_inflation"]
+
+# Output-gap loading of inflation, as in the baseline path.
+PHILLIPS_SLOPE = 0.08
+
+
+@dataclass(frozen=True)
+class NowcastModel:
+    """Monthly variances and gap persistence of the trend-cycle model."""
+
+    trend_variance: float = 0.0004
+    gap_persistence: float = 0.95
+    gap_variance: float = 0.05
+    core_variance: float = 0.005
+    growth_noise: float = 0.05
+    inflation_noise: float = 0.05
+
+    def matrices(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        transition = np.diag([1.0, self.gap_persistence, 1.0])
+        state_noise = np.diag([self.trend_variance, self.gap_variance, self.core_variance])
+        loadings = np.array([[1.0, GAP_SENSITIVITY, 0.0], [0.0, PHILLIPS_SLOPE, 1.0]])
+        noise = np.diag([self.growth_noise, self.inflation_noise])
+        return transition, state_noise, loadings, noise
+
+
+@dataclass(frozen=True)
+class Nowcast:
+    """Current conditions estimated from history up to ``as_of``."""
+
+    as_of: pd.Timestamp
+    version: str
+    trend_growth: float
+    output_gap: float
+    core_inflation: float
+    gdp_growth: float
+    inflation: float
+    policy_rate: float
+
+    def assumptions(self, base: BaselineAssumptions | None = None) -> BaselineAssumptions:
+        """``base`` with the estimated fields filled in, starting the month after ``as_of``."""
+
+        return replace(
+            base or BaselineAssumptions(),
+            start_date=str((self.as_of + pd.offsets.MonthBegin(1)).date()),
+            trend_growth=self.trend_growth,
+            initial_gdp_growth=self.gdp_growth,
+            initial_inflation=self.inflation,
+            initial_policy_rate=self.policy_rate,
+            initial_output_gap=self.output_gap,
+        )
+
+
+@dataclass
+class _FilterState:
+    nowcast: Nowcast
+    mean: np.ndarray
+    cov: np.ndarray
+
+
+class NowcastCache:
+    """Bounded LRU of filter end states keyed by (model, data version)."""
+
+    def __init__(self, maxsize: int = 32) -> None:
+        self.maxsize = maxsize
+        self._states: OrderedDict[tuple[NowcastModel, str], _FilterState] = OrderedDict()
+
+    def get(self, model: NowcastModel, version: str) -> _FilterState | None:
+        state = self._states.get((model, version))
+        if state is not None:
+            self._states.move_to_end((model, version))
+        return state
+
+    def put(self, model: NowcastModel, state: _FilterState) -> None:
+        self._states[(model, state.nowcast.version)] = state
+        if len(self._states) > self.maxsize:
+            self._states.popitem(last=False)
+
+    def clear(self) -> None:
+        self._states.clear()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+_SHARED_CACHE = NowcastCache()
+
+
+def data_version(realized: pd.DataFrame) -> str:
+    """Content hash of the observed columns and their dates."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(realized.index.asi8.tobytes())
+    digest.update(np.ascontiguousarray(realized[[*OBSERVED, "policy_rate"]].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+@timed("nowcast.nowcast")
+def nowcast(
+    realized: pd.DataFrame,
+    model: NowcastModel | None = None,
+    cache: NowcastCache | None = None,
+) -> Nowcast:
+    """Estimate current conditions from a ``realized_paths`` frame.
+
+    A cached data version is returned as is; a version that extends a cached
+    one by a single month is updated with one filter step.
+    """
+
+    model = model or NowcastModel()
+    cache = cache if cache is not None else _SHARED_CACHE
+    version = data_version(realized)
+    state = cache.get(model, version)
+    if state is not None:
+        increment("cache_hits")
+        return state.nowcast
+
+    previous = cache.get(model, data_version(realized.iloc[:-1])) if len(realized) > 1 else None
+    if previous is not None:
+        increment("nowcast_incremental_updates")
+        observations = realized[OBSERVED].to_numpy(dtype=float)[-1:, None, :]
+        mean, cov = previous.mean[None], previous.cov[None]
+    else:
+        observations = realized[OBSERVED].to_numpy(dtype=float)[:, None, :]
+        mean, cov = _prior(observations)
+
+    filtered = _kalman_filter(observations, model, mean, cov)
+    end_mean, end_cov = filtered[0][-1, 0], filtered[1][-1, 0]
+    state = _FilterState(_nowcast_from_state(realized, version, end_mean), end_mean, end_cov)
+    cache.put(model, state)
+    return state.nowcast
+
+
+def nowcast_from_store(data_dir: str | Path = "data", model: NowcastModel | None = None) -> Nowcast:
+    """Nowcast straight from the saved ETL series."""
+
+    from etl.pipeline import build_series_dataset
+
+    return nowcast(realized_paths(build_series_dataset(data_dir)), model)
+
+
+def smoothed_states(realized: pd.DataFrame, model: NowcastModel | None = None) -> pd.DataFrame:
+    """Full-sample smoothed trend growth, output gap and core inflation."""
+
+    model = model or NowcastModel()
+    observations = realized[OBSERVED].to_numpy(dtype=float)[:, None, :]
+    means, covs, predicted_means, predicted_covs = _kalman_filter(observations, model, *_prior(observations))
+    smoothed = _rts_smoother(means, covs, predicted_means, predicted_covs, model)
+    return pd.DataFrame(smoothed[:, 0], index=realized.index, columns=STATES)
+
+
+def _prior(observations: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Diffuse-ish prior centred on each data set's first observed values."""
+
+    first = np.array(
+        [
+            [column[~np.isnan(column)][0] if np.any(~np.isnan(column)) else 0.0 for column in batch.T]
+            for batch in observations.transpose(1, 0, 2)
+        ]
+    )
+    mean = np.stack([first[:, 0], np.zeros(len(first)), first[:, 1]], axis=1)
+    cov = np.broadcast_to(np.diag([1.0, 4.0, 1.0]), (len(first), 3, 3)).copy()
+    return mean, cov
+
+
+def _kalman_filter(
+    observations: np.ndarray,
+    model: NowcastModel,
+    mean: np.ndarray,
+    cov: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Filter ``(month, batch, observed)`` data; NaN observations are skipped.
+
+    Returns filtered and one-step-predicted means ``(month, batch, state)``
+    and covariances ``(month, batch, state, state)``.
+    """
+
+    transition, state_noise, loadings, noise = model.matrices()
+    months, batch = observations.shape[:2]
+    means = np.empty((months, batch, 3))
+    covs = np.empty((months, batch, 3, 3))
+    predicted_means = np.empty_like(means)
+    predicted_covs = np.empty_like(covs)
+
+    for month in range(months):
+        mean = mean @ transition.T
+        cov = transition @ cov @ transition.T + state_noise
+        predicted_means[month], predicted_covs[month] = mean, cov
+
+        observed = ~np.isnan(observations[month])
+        design = loadings * observed[..., None]
+        innovation = np.where(observed, np.nan_to_num(observations[month]) - np.einsum("bij,bj->bi", design, mean), 0.0)
+        gain = cov @ design.transpose(0, 2, 1) @ np.linalg.inv(design @ cov @ design.transpose(0, 2, 1) + noise)
+        mean = mean + np.einsum("bij,bj->bi", gain, innovation)
+        cov = cov - gain @ design @ cov
+        means[month], covs[month] = mean, cov
+
+    return means, covs, predicted_means, predicted_covs
+
+
+def _rts_smoother(
+    means: np.ndarray,
+    covs: np.ndarray,
+    predicted_means: np.ndarray,
+    predicted_covs: np.ndarray,
+    model: NowcastModel,
+) -> np.ndarray:
+    """Rauch-Tung-Striebel smoothed means; the mean pass needs no smoothed covariances."""
+
+    transition = model.matrices()[0]
+    smoothed = means.copy()
+    for month in range(len(means) - 2, -1, -1):
+        gain = covs[month] @ transition.T @ np.linalg.inv(predicted_covs[month + 1])
+        smoothed[month] = means[month] + np.einsum("bij,bj->bi", gain, smoothed[month + 1] - predicted_means[month + 1])
+    return smoothed
+
+
+def _nowcast_from_state(realized: pd.DataFrame, version: str, state: np.ndarray) -> Nowcast:
+    trend, gap, core = (float(value) for value in state)
+    policy = realized["policy_rate"].dropna()
+    return Nowcast(
+        as_of=pd.Timestamp(realized.index[-1]),
+        version=version,
+        trend_growth=trend,
+        output_gap=gap,
+        core_inflation=core,
+        gdp_growth=trend + GAP_SENSITIVITY * gap,
+        inflation=core + PHILLIPS_SLOPE * gap,
+        policy_rate=float(policy.iloc[-1]) if len(policy) else BaselineAssumptions.initial_policy_rate,
+    )
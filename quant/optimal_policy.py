@@ -0,0 +1,236 @@
+"""Loss-minimizing monetary policy paths for given scenarios.
+
+The other shocks are taken as given and the solver chooses one monetary
+impulse per month. Every response is a fixed lag profile, so the inflation
+gap, output gap and policy-rate changes are affine in the impulse path ``u``
+through lower-triangular Toeplitz matrices ``T`` built from the monetary
+kernel. The loss
+
+    sum_t w_pi * pi_gap_t^2 + w_y * gap_t^2 + w_dp * (dp_t)^2 + w_u * u_t^2
+
+is then a quadratic ``u'Qu + 2c'u + const`` whose Hessian ``Q`` depends only
+on the weights, the horizon and the kernel. ``Q^{-1}`` is cached, so a batch
+of base scenarios is solved with one matmul. Paths that break the engine's
+``|magnitude| <= 6`` bound are re-solved by accelerated projected gradient.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Mapping
+
+import numpy as np
+
+from quant.core import (
+    CHANNEL_ORDER,
+    VARIABLE_INDEX,
+    BaselineAssumptions,
+    MacroShock,
+    ResponseProfile,
+    ShockArrays,
+    ShockChannel,
+    _channel_kernels,
+    simulate_batch,
+)
+from utils.instrumentation import increment, timed
+
+
+# Largest shock magnitude the calibrated engine accepts (see ``_validate_shocks``).
+MAX_MAGNITUDE = 6.0
+
+
+@dataclass(frozen=True)
+class PolicyLoss:
+    """Weights on squared inflation gap, output gap, rate changes and impulses.
+
+    The inflation gap is measured against ``target_inflation`` and the output
+    gap against zero, both on scenario levels. Rate changes are month-on-month
+    moves in the policy-rate deviation from baseline.
+    """
+
+    inflation: float = 1.0
+    output_gap: float = 0.5
+    rate_change: float = 0.25
+    impulse: float = 0.0
+
+    def __post_init__(self) -> None:
+        if min(self.inflation, self.output_gap, self.rate_change, self.impulse) < 0:
+            raise ValueError("Policy-loss weights must be non-negative.")
+        if self.rate_change <= 0 and self.impulse <= 0:
+            raise ValueError("Policy-loss needs a positive rate-change or impulse weight.")
+
+
+@dataclass
+class OptimalPolicy:
+    """Monthly monetary impulses ``(scenario, month)`` and the losses they reach."""
+
+    impulses: np.ndarray
+    loss: np.ndarray
+    unmanaged_loss: np.ndarray
+    bounded: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.impulses)
+
+    def shocks(self, index: int, name: str = "Optimal policy") -> list[MacroShock]:
+        """One-month monetary shocks reproducing scenario ``index``'s path."""
+
+        return [
+            MacroShock(f"{name} m{month + 1}", ShockChannel.MONETARY, float(value), duration=1, start_month=month + 1)
+            for month, value in enumerate(self.impulses[index])
+            if abs(value) > 1e-9
+        ]
+
+    def combined(self, base: ShockArrays, name: str = "Optimal policy") -> ShockArrays:
+        """``base`` plus every scenario's policy shocks, ready for ``simulate_batch``."""
+
+        scenario, month = np.nonzero(np.abs(self.impulses) > 1e-9)
+        count = len(scenario)
+        names = base.names
+        if names is None:
+            names = np.array([CHANNEL_ORDER[channel].value for channel in base.channel], dtype=object)
+        monetary = CHANNEL_ORDER.index(ShockChannel.MONETARY)
+        return ShockArrays(
+            scenario=np.concatenate([base.scenario, scenario.astype(np.int64)]),
+            channel=np.concatenate([base.channel, np.full(count, monetary, dtype=np.int64)]),
+            magnitude=np.concatenate([base.magnitude, self.impulses[scenario, month]]),
+            duration=np.concatenate([base.duration, np.ones(count, dtype=np.int64)]),
+            persistence=np.concatenate([base.persistence, np.full(count, 0.75)]),
+            start_month=np.concatenate([base.start_month, month.astype(np.int64) + 1]),
+            names=np.concatenate([names, np.array([f"{name} m{m + 1}" for m in month], dtype=object)]),
+        )
+
+
+@timed("optimal_policy.optimal_policy")
+def optimal_policy(
+    base: ShockArrays,
+    horizon: int = 24,
+    assumptions: BaselineAssumptions | None = None,
+    loss: PolicyLoss | None = None,
+    scenarios: int | None = None,
+    profiles: Mapping[ShockChannel, ResponseProfile] | None = None,
+    long_horizon: bool = False,
+    max_iterations: int = 2000,
+    tolerance: float = 1e-10,
+) -> OptimalPolicy:
+    """Optimal monetary impulse paths for every scenario in ``base``.
+
+    ``base`` holds the shocks taken as given and may be empty for a scenario,
+    in which case policy leans against the baseline's own gaps.
+    """
+
+    assumptions = assumptions or BaselineAssumptions()
+    loss = loss or PolicyLoss()
+    batch = simulate_batch(
+        base, horizon, assumptions, scenarios=scenarios, profiles=profiles, long_horizon=long_horizon
+    )
+    system = _loss_system(loss, batch.deltas.shape[-1], _channel_kernels(profiles, False)[ShockChannel.MONETARY])
+
+    paths = batch.paths()
+    policy = batch.deltas[:, VARIABLE_INDEX["policy_rate"]]
+    gaps = np.stack(
+        [
+            paths[:, VARIABLE_INDEX["inflation"]] - assumptions.target_inflation,
+            paths[:, VARIABLE_INDEX["output_gap"]],
+            np.diff(policy, axis=-1, prepend=0.0),
+        ],
+        axis=1,
+    )
+    weights = np.array([loss.inflation, loss.output_gap, loss.rate_change])
+    linear = np.einsum("k,nkt,kjt->nj", weights, gaps, system.responses)
+    constant = np.einsum("k,nkh->n", weights, gaps**2)
+
+    impulses = -linear @ system.inverse
+    bounded = np.any(np.abs(impulses) > MAX_MAGNITUDE, axis=1)
+    if bounded.any():
+        increment("optimal_policy_projected", int(bounded.sum()))
+        impulses[bounded] = _projected_gradient(linear[bounded], system, max_iterations, tolerance)
+
+    quadratic = np.sum((impulses @ system.hessian) * impulses, axis=1)
+    return OptimalPolicy(
+        impulses=impulses,
+        loss=constant + 2.0 * np.sum(linear * impulses, axis=1) + quadratic,
+        unmanaged_loss=constant,
+        bounded=bounded,
+    )
+
+
+def optimal_policy_shocks(
+    shocks: list[MacroShock],
+    horizon: int = 24,
+    assumptions: BaselineAssumptions | None = None,
+    loss: PolicyLoss | None = None,
+    **kwargs,
+) -> list[MacroShock]:
+    """Policy shocks that lean optimally against a single scenario's ``shocks``."""
+
+    return optimal_policy(
+        ShockArrays.from_scenarios([shocks]), horizon, assumptions, loss, scenarios=1, **kwargs
+    ).shocks(0)
+
+
+@dataclass(frozen=True)
+class _LossSystem:
+    responses: np.ndarray
+    hessian: np.ndarray
+    inverse: np.ndarray
+    step: float
+
+
+def _loss_system(loss: PolicyLoss, horizon: int, monetary: np.ndarray) -> _LossSystem:
+    rows = [
+        tuple(monetary[VARIABLE_INDEX[variable], :horizon].tolist())
+        for variable in ("inflation", "output_gap", "policy_rate")
+    ]
+    return _cached_loss_system(loss, horizon, *rows)
+
+
+@lru_cache(maxsize=64)
+def _cached_loss_system(
+    loss: PolicyLoss,
+    horizon: int,
+    inflation_row: tuple[float, ...],
+    output_gap_row: tuple[float, ...],
+    policy_row: tuple[float, ...],
+) -> _LossSystem:
+    """Toeplitz responses of the loss terms to unit impulses, and the Hessian.
+
+    ``responses[k, j, t]`` is the effect of an impulse in month ``j`` on loss
+    term ``k`` in month ``t``; rate changes use the differenced policy row.
+    """
+
+    def padded(row: tuple[float, ...]) -> np.ndarray:
+        return np.pad(np.asarray(row, dtype=float), (0, horizon - len(row)))
+
+    columns = np.stack([padded(inflation_row), padded(output_gap_row), np.diff(padded(policy_row), prepend=0.0)])
+    offsets = np.subtract.outer(np.arange(horizon), np.arange(horizon))
+    responses = np.where(offsets >= 0, columns[:, np.clip(offsets, 0, None)], 0.0).transpose(0, 2, 1)
+
+    weights = np.array([loss.inflation, loss.output_gap, loss.rate_change])
+    hessian = np.einsum("k,kjt,kit->ji", weights, responses, responses) + loss.impulse * np.eye(horizon)
+    inverse = np.linalg.inv(hessian)
+    for array in (responses, hessian, inverse):
+        array.setflags(write=False)
+    return _LossSystem(responses, hessian, inverse, 1.0 / float(np.linalg.eigvalsh(hessian)[-1]))
+
+
+def _projected_gradient(
+    linear: np.ndarray,
+    system: _LossSystem,
+    max_iterations: int,
+    tolerance: float,
+) -> np.ndarray:
+    """Box-constrained minimum of ``u'Qu + 2c'u`` for each row, by FISTA."""
+
+    current = np.clip(-linear @ system.inverse, -MAX_MAGNITUDE, MAX_MAGNITUDE)
+    momentum, t = current.copy(), 1.0
+    for _ in range(max_iterations):
+        gradient = momentum @ system.hessian + linear
+        following = np.clip(momentum - system.step * gradient, -MAX_MAGNITUDE, MAX_MAGNITUDE)
+        if np.max(np.abs(following - current)) < tolerance:
+            return following
+        t_next = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * t * t))
+        momentum = following + ((t - 1.0) / t_next) * (following - current)
+        current, t = following, t_next
+    return current
@@ -0,0 +1,212 @@
+"""Map scenario delta paths to position and portfolio P&L.
+
+Each position carries a market value and factor betas: the % return for a
+one-unit move in each ``DISPLAY_VARIABLES`` delta. P&L is linear in the
+betas, so positions are first collapsed into per-portfolio factor exposures
+and scenario P&L becomes one product of ``(scenario, variable, month)``
+deltas with a ``(portfolio, variable)`` exposure matrix. Scenarios are
+processed in chunks sized from a byte budget, so 100k positions and 10k
+scenarios never materialize a full ``scenario x month x position`` tensor.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Mapping
+
+import numpy as np
+import pandas as pd
+
+from quant.core import DISPLAY_VARIABLES, BatchResult
+from utils.instrumentation import timed
+
+
+# Illustrative % return per 1 pp delta, by asset class. Real rate is left at
+# zero because it is policy rate minus inflation and would double count.
+ASSET_CLASS_BETAS: dict[str, dict[str, float]] = {
+    "equity": {"gdp_growth": 3.0, "inflation": -1.0, "policy_rate": -4.0, "output_gap": 1.0},
+    "government_bond": {"inflation": -2.0, "policy_rate": -6.5},
+    "credit": {"gdp_growth": 1.0, "inflation": -1.5, "policy_rate": -4.5, "output_gap": 0.5},
+    "commodity": {"gdp_growth": 2.0, "inflation": 4.0, "policy_rate": -1.0},
+    "cash": {},
+}
+
+BETA_COLUMNS = [f"beta_{variable}" for variable in DISPLAY_VARIABLES]
+MEASURES = ("trough", "terminal")
+DEFAULT_MAX_BYTES = 64 * 1024**2
+
+
+@dataclass
+class PositionBook:
+    """Positions as columnar arrays; ``betas`` is ``(position, variable)``."""
+
+    portfolios: list[str]
+    portfolio_index: np.ndarray
+    assets: np.ndarray
+    market_value: np.ndarray
+    betas: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.market_value)
+
+    def exposures(self) -> np.ndarray:
+        """Market-value-weighted betas per portfolio, ``(portfolio, variable)``, in currency per pp."""
+
+        weighted = self.market_value[:, None] * self.betas / 100.0
+        return np.stack(
+            [
+                np.bincount(self.portfolio_index, weights=weighted[:, column], minlength=len(self.portfolios))
+                for column in range(len(DISPLAY_VARIABLES))
+            ],
+            axis=1,
+        )
+
+
+def book_from_frame(
+    positions: pd.DataFrame,
+    betas: pd.DataFrame | None = None,
+    asset_class_betas: Mapping[str, Mapping[str, float]] = ASSET_CLASS_BETAS,
+) -> PositionBook:
+    """Build a book from ``portfolio, asset, market_value`` rows.
+
+    Each beta comes from a ``beta_<variable>`` column on the row, else from a
+    ``betas`` table indexed by asset with ``DISPLAY_VARIABLES`` columns, else
+    from ``asset_class_betas`` via an ``asset_class`` column. Gaps fall through
+    variable by variable.
+    """
+
+    missing = sorted({"portfolio", "asset", "market_value"} - set(positions.columns))
+    if missing:
+        raise ValueError(f"Positions are missing columns: {', '.join(missing)}")
+
+    matrix = np.full((len(positions), len(DISPLAY_VARIABLES)), np.nan)
+    for column, beta_column in enumerate(BETA_COLUMNS):
+        if beta_column in positions.columns:
+            matrix[:, column] = pd.to_numeric(positions[beta_column], errors="coerce").to_numpy(dtype=float)
+
+    if betas is not None:
+        table = betas.reindex(columns=DISPLAY_VARIABLES).reindex(positions["asset"].to_numpy())
+        matrix = np.where(np.isnan(matrix), table.to_numpy(dtype=float), matrix)
+
+    if "asset_class" in positions.columns:
+        classes = pd.DataFrame(asset_class_betas).T.reindex(columns=DISPLAY_VARIABLES).fillna(0.0)
+        table = classes.reindex(positions["asset_class"].astype(str).str.lower().to_numpy())
+        matrix = np.where(np.isnan(matrix), table.to_numpy(dtype=float), matrix)
+
+    unresolved = np.isnan(matrix).all(axis=1)
+    if unresolved.any():
+        raise ValueError(f"No betas for asset {positions['asset'].iloc[int(np.argmax(unresolved))]!r}.")
+
+    codes, names = pd.factorize(positions["portfolio"].astype(str), sort=True)
+    return PositionBook(
+        portfolios=list(names),
+        portfolio_index=codes.astype(np.int64),
+        assets=positions["asset"].astype(str).to_numpy(dtype=object),
+        market_value=pd.to_numeric(positions["market_value"], errors="raise").to_numpy(dtype=float),
+        betas=np.nan_to_num(matrix),
+    )
+
+
+@timed("portfolio.load_positions")
+def load_positions(path: str | Path, betas: pd.DataFrame | None = None) -> PositionBook:
+    """Load a position book from CSV or Parquet (Parquet needs pyarrow or fastparquet)."""
+
+    path = Path(path)
+    if path.suffix.lower() in {".parquet", ".pq"}:
+        frame = pd.read_parquet(path)
+    elif path.suffix.lower() == ".csv":
+        frame = pd.read_csv(path)
+    else:
+        raise ValueError(f"Unsupported position file type: {path.suffix}")
+    return book_from_frame(frame, betas)
+
+
+def portfolio_pnl(deltas: BatchResult | np.ndarray, book: PositionBook) -> np.ndarray:
+    """P&L for every ``(scenario, month, portfolio)``; chunk with ``worst_scenarios`` for large runs."""
+
+    return _deltas(deltas).transpose(0, 2, 1) @ book.exposures().T
+
+
+def iter_position_pnl(
+    deltas: BatchResult | np.ndarray,
+    book: PositionBook,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> Iterator[tuple[slice, np.ndarray]]:
+    """Yield position-level P&L ``(scenario chunk, month, position)`` within ``max_bytes``."""
+
+    deltas = _deltas(deltas)
+    loadings = book.market_value[:, None] * book.betas / 100.0
+    for chunk in _chunks(len(deltas), deltas.shape[-1] * len(book), max_bytes):
+        yield chunk, deltas[chunk].transpose(0, 2, 1) @ loadings.T
+
+
+@timed("portfolio.worst_scenarios")
+def worst_scenarios(
+    deltas: BatchResult | np.ndarray,
+    book: PositionBook,
+    top: int = 10,
+    measure: str = "trough",
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> pd.DataFrame:
+    """Rank the ``top`` worst scenarios per portfolio.
+
+    ``measure`` is the lowest monthly P&L over the horizon ("trough") or the
+    last month's P&L ("terminal"). Scenarios stream through in chunks and
+    only a running top-``top`` per portfolio is kept.
+    """
+
+    if measure not in MEASURES:
+        raise ValueError(f"Measure must be one of {', '.join(MEASURES)}.")
+    deltas = _deltas(deltas)
+    exposures = book.exposures()
+    count = len(book.portfolios)
+    best_values = np.empty((0, count))
+    best_scenarios = np.empty((0, count), dtype=np.int64)
+    best_months = np.empty((0, count), dtype=np.int64)
+
+    for chunk in _chunks(len(deltas), deltas.shape[-1] * count, max_bytes):
+        pnl = deltas[chunk].transpose(0, 2, 1) @ exposures.T
+        if measure == "trough":
+            months = pnl.argmin(axis=1)
+            values = np.take_along_axis(pnl, months[:, None, :], axis=1)[:, 0]
+        else:
+            months = np.full((pnl.shape[0], count), pnl.shape[1] - 1)
+            values = pnl[:, -1]
+        scenarios = np.broadcast_to(np.arange(chunk.start, chunk.stop)[:, None], values.shape)
+
+        best_values = np.concatenate([best_values, values])
+        best_scenarios = np.concatenate([best_scenarios, scenarios])
+        best_months = np.concatenate([best_months, months])
+        if len(best_values) > top:
+            keep = np.argpartition(best_values, top - 1, axis=0)[:top]
+            best_values = np.take_along_axis(best_values, keep, axis=0)
+            best_scenarios = np.take_along_axis(best_scenarios, keep, axis=0)
+            best_months = np.take_along_axis(best_months, keep, axis=0)
+
+    order = np.argsort(best_values, axis=0, kind="stable")
+    ranked = len(order)
+    return pd.DataFrame(
+        {
+            "portfolio": np.repeat(book.portfolios, ranked),
+            "rank": np.tile(np.arange(1, ranked + 1), count),
+            "scenario": np.take_along_axis(best_scenarios, order, axis=0).T.reshape(-1),
+            "month": np.take_along_axis(best_months, order, axis=0).T.reshape(-1) + 1,
+            "pnl": np.take_along_axis(best_values, order, axis=0).T.reshape(-1),
+        }
+    )
+
+
+def _deltas(deltas: BatchResult | np.ndarray) -> np.ndarray:
+    array = deltas.deltas if isinstance(deltas, BatchResult) else np.asarray(deltas, dtype=float)
+    if array.ndim != 3 or array.shape[1] != len(DISPLAY_VARIABLES):
+        raise ValueError("Deltas must be shaped (scenario, variable, month).")
+    return array
+
+
+def _chunks(total: int, row_size: int, max_bytes: int) -> Iterator[slice]:
+    # Half the budget per chunk: the previous block is still referenced while
+    # the next one is computed.
+    step = max(1, int(max_bytes) // (16 * max(row_size, 1)))
+    for start in range(0, total, step):
+        yield slice(start, min(start + step, total))
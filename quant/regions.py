@@ -0,0 +1,238 @@
+"""Multi-economy scenarios with lagged cross-border spillovers.
+
+Each region has its own ``BaselineAssumptions`` and shocks hit one region.
+Domestic responses come from the single-economy kernels; a region x region
+spillover matrix then carries selected variables across borders with lags.
+Spillovers compound (a US shock reaches the euro area and echoes back), so
+the propagation is a time recursion, vectorized over scenarios, regions and
+variables at every month:
+
+    x[t] = domestic[t] + sum_lag W_lag @ x[t - lag]
+
+Every lag is at least one month, so each step only needs months already final.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from quant.core import (
+    CHANNEL_ORDER,
+    DISPLAY_VARIABLES,
+    VARIABLE_INDEX,
+    BaselineAssumptions,
+    MacroShock,
+    ResponseProfile,
+    ScenarioArrays,
+    ShockArrays,
+    ShockChannel,
+    _assemble_arrays,
+    _baseline_block,
+    _channel_kernels,
+    _impulse_matrix,
+    _lag_convolve,
+    _validate_horizon,
+    _validate_shock_arrays,
+    month_starts,
+)
+from utils.instrumentation import increment, timed
+
+
+SPILLOVER_VARIABLES = ("gdp_growth", "output_gap", "inflation")
+
+
+@dataclass(frozen=True)
+class Region:
+    name: str
+    assumptions: BaselineAssumptions = BaselineAssumptions()
+
+
+@dataclass(frozen=True)
+class Spillovers:
+    """Cross-border transmission: ``weights[target, source]`` after ``lags[target, source]`` months.
+
+    Only ``variables`` cross borders; policy rates stay domestic by default.
+    """
+
+    weights: np.ndarray
+    lags: np.ndarray
+    variables: tuple[str, ...] = SPILLOVER_VARIABLES
+
+    @classmethod
+    def from_links(
+        cls,
+        regions: Sequence[str],
+        links: Mapping[tuple[str, str], tuple[float, int]],
+        variables: tuple[str, ...] = SPILLOVER_VARIABLES,
+    ) -> "Spillovers":
+        """Build the matrices from ``{(source, target): (weight, lag_months)}``."""
+
+        index = {name: i for i, name in enumerate(regions)}
+        weights = np.zeros((len(regions), len(regions)), dtype=float)
+        lags = np.ones((len(regions), len(regions)), dtype=np.int64)
+        for (source, target), (weight, lag) in links.items():
+            if source not in index or target not in index:
+                raise ValueError(f"Unknown region in spillover link: {source} -> {target}")
+            weights[index[target], index[source]] = float(weight)
+            lags[index[target], index[source]] = int(lag)
+        return cls(weights=weights, lags=lags, variables=variables)
+
+
+@dataclass
+class RegionalResult:
+    """Paths for ``(scenario, region, variable, month)``."""
+
+    regions: list[Region]
+    dates: np.ndarray
+    baseline: np.ndarray
+    domestic: np.ndarray
+    deltas: np.ndarray
+    shocks: ShockArrays
+
+    def paths(self) -> np.ndarray:
+        return self.baseline + self.deltas
+
+    def spillover(self) -> np.ndarray:
+        """Part of each delta that arrived from other regions."""
+
+        return self.deltas - self.domestic
+
+    def scenario(self, index: int, region: str) -> ScenarioArrays:
+        """Single-economy view of one region, with metrics and warnings."""
+
+        position = [item.name for item in self.regions].index(region)
+        baseline = {
+            f"{variable}_baseline": self.baseline[position, i] for i, variable in enumerate(DISPLAY_VARIABLES)
+        }
+        # Warnings and the narrative see every shock in the scenario, since
+        # a region can move purely on spillovers from abroad.
+        shocks = [
+            shock
+            for offset in range(len(self.regions))
+            for shock in self.shocks.shocks_for(index * len(self.regions) + offset)
+        ]
+        return _assemble_arrays(baseline, self.deltas[index, position], shocks, self.regions[position].assumptions)
+
+
+def regional_shock_arrays(
+    regions: Sequence[Region],
+    scenarios: Sequence[Sequence[tuple[str, MacroShock]]],
+) -> ShockArrays:
+    """Columnar shocks whose ``scenario`` field is ``scenario * regions + region``."""
+
+    index = {region.name: i for i, region in enumerate(regions)}
+    flattened: list[list[MacroShock]] = [[] for _ in range(len(scenarios) * len(regions))]
+    for number, shocks in enumerate(scenarios):
+        for region, shock in shocks:
+            if region not in index:
+                raise ValueError(f"Unknown region: {region}")
+            flattened[number * len(regions) + index[region]].append(shock)
+    return ShockArrays.from_scenarios(flattened)
+
+
+@timed("regions.simulate_regions")
+def simulate_regions(
+    regions: Sequence[Region],
+    shocks: ShockArrays,
+    spillovers: Spillovers | None = None,
+    horizon: int = 24,
+    scenarios: int | None = None,
+    profiles: Mapping[ShockChannel, ResponseProfile] | None = None,
+    long_horizon: bool = False,
+) -> RegionalResult:
+    """Simulate scenarios across regions from ``regional_shock_arrays`` output.
+
+    Spillovers are indexed by month, so every region must share one start date.
+    """
+
+    regions = list(regions)
+    names = [region.name for region in regions]
+    if not regions:
+        raise ValueError("At least one region is required.")
+    if len(set(names)) != len(names):
+        raise ValueError("Region names must be unique.")
+    if len({region.assumptions.start_date for region in regions}) > 1:
+        raise ValueError("Regions must share one start date.")
+    horizon = _validate_horizon(horizon, long_horizon)
+    _validate_shock_arrays(shocks, horizon)
+    count_regions = len(regions)
+    if scenarios is None:
+        scenarios = int(shocks.scenario.max()) // count_regions + 1 if len(shocks) else 0
+    last = int(shocks.scenario.max()) // count_regions if len(shocks) else -1
+    if last >= scenarios:
+        raise ValueError(f"Shock rows reach scenario {last}, beyond {scenarios} scenarios.")
+
+    # Most (scenario, region) pairs carry no shock of a given channel, so only
+    # the rows that do are aggregated and convolved.
+    impulses = _impulse_matrix(shocks.magnitude, shocks.duration, shocks.persistence, shocks.start_month, horizon)
+    domestic = np.zeros((scenarios * count_regions, len(DISPLAY_VARIABLES), horizon), dtype=float)
+    kernels = _channel_kernels(profiles, endogenous_policy=False)
+    for index, channel in enumerate(CHANNEL_ORDER):
+        selected = shocks.channel == index
+        if not selected.any():
+            continue
+        rows, owners = np.unique(shocks.scenario[selected], return_inverse=True)
+        grouped = np.zeros((len(rows), horizon), dtype=float)
+        np.add.at(grouped, owners, impulses[selected])
+        domestic[rows] += _lag_convolve(grouped, kernels[channel])
+    domestic = domestic.reshape(scenarios, count_regions, len(DISPLAY_VARIABLES), horizon)
+
+    deltas = domestic.copy()
+    if spillovers is not None:
+        _propagate(deltas, spillovers, count_regions)
+    for block in (domestic, deltas):
+        block[..., VARIABLE_INDEX["real_rate"], :] = (
+            block[..., VARIABLE_INDEX["policy_rate"], :] - block[..., VARIABLE_INDEX["inflation"], :]
+        )
+    increment("scenarios_simulated", scenarios)
+
+    return RegionalResult(
+        regions=regions,
+        dates=month_starts(regions[0].assumptions.start_date, horizon),
+        baseline=_regional_baseline(regions, horizon),
+        domestic=domestic,
+        deltas=deltas,
+        shocks=shocks,
+    )
+
+
+def _regional_baseline(regions: list[Region], horizon: int) -> np.ndarray:
+    def column(field: str) -> np.ndarray:
+        return np.array([[getattr(region.assumptions, field)] for region in regions], dtype=float)
+
+    return _baseline_block(
+        horizon,
+        trend_growth=column("trend_growth"),
+        target_inflation=column("target_inflation"),
+        initial_inflation=column("initial_inflation"),
+        neutral_real_rate=column("neutral_real_rate"),
+        initial_policy_rate=column("initial_policy_rate"),
+        initial_output_gap=column("initial_output_gap"),
+    )
+
+
+def _propagate(deltas: np.ndarray, spillovers: Spillovers, count_regions: int) -> None:
+    """Apply the spillover recursion in place on ``(scenario, region, variable, month)``."""
+
+    weights = np.asarray(spillovers.weights, dtype=float)
+    lags = np.asarray(spillovers.lags, dtype=np.int64)
+    if weights.shape != (count_regions, count_regions) or lags.shape != weights.shape:
+        raise ValueError("Spillover weights and lags must be region x region matrices.")
+    if np.any(np.diag(weights) != 0):
+        raise ValueError("Spillover weights must be zero on the diagonal.")
+    active = weights != 0
+    if np.any(lags[active] < 1):
+        raise ValueError("Spillover lags must be at least one month.")
+
+    rows = [VARIABLE_INDEX[variable] for variable in spillovers.variables]
+    # Month-major layout keeps every step's (scenario, region, variable) slab contiguous.
+    carried = np.ascontiguousarray(np.moveaxis(deltas[:, :, rows, :], -1, 0))
+    by_lag = [(int(lag), np.where(active & (lags == lag), weights, 0.0)) for lag in np.unique(lags[active])]
+    for month in range(carried.shape[0]):
+        for lag, matrix in by_lag:
+            if month >= lag:
+                carried[month] += matrix @ carried[month - lag]
+    deltas[:, :, rows, :] = np.moveaxis(carried, 0, -1)
@@ -0,0 +1,226 @@
+"""Declarative regime and coherence rules over scenario metrics.
+
+A rule is a named conjunction of threshold conditions on summary metrics
+such as ``inflation_peak`` or ``output_gap_trough``. A ``RuleSet`` evaluates
+every rule as one boolean mask over a whole batch of metric arrays, so a
+million scenarios cost a handful of vectorized comparisons. Classification
+takes the first matching rule in priority order and falls back to the
+set's default; flag sets report every matching rule.
+
+Rule sets round-trip through plain dicts and JSON, so desks can load their
+own regimes without code changes:
+
+    {"default": "Calm",
+     "rules": [{"name": "Overheating", "priority": 10,
+                "when": [["inflation_peak", ">", 4.0], ["output_gap_trough", ">", 0.5]]}]}
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import operator
+from pathlib import Path
+from typing import Any, Mapping
+
+import numpy as np
+
+
+OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+# Scalar counterparts for single scenarios, where ufunc dispatch dominates.
+SCALAR_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+@dataclass(frozen=True)
+class Condition:
+    metric: str
+    operator: str
+    threshold: float
+
+    def __post_init__(self) -> None:
+        if self.operator not in OPERATORS:
+            raise ValueError(f"Unsupported rule operator: {self.operator}")
+
+
+@dataclass(frozen=True)
+class Rule:
+    """``name`` applies when every condition holds; higher ``priority`` is checked first."""
+
+    name: str
+    conditions: tuple[Condition, ...]
+    priority: int = 0
+
+
+@dataclass
+class RuleResult:
+    """Matches of a rule set over a batch; ``masks`` is ``(rule, scenario)``."""
+
+    names: list[str]
+    masks: np.ndarray
+    default: str | None = None
+
+    def __len__(self) -> int:
+        return self.masks.shape[1]
+
+    def codes(self) -> np.ndarray:
+        """Index of the first matching rule per scenario; ``len(names)`` means the default."""
+
+        if not self.names:
+            return np.zeros(len(self), dtype=np.int64)
+        first = self.masks.argmax(axis=0)
+        return np.where(self.masks.any(axis=0), first, len(self.names))
+
+    def labels(self) -> np.ndarray:
+        """First matching rule name per scenario, or the default."""
+
+        return np.array([*self.names, self.default], dtype=object)[self.codes()]
+
+    def matched(self, index: int) -> list[str]:
+        """Every rule scenario ``index`` matches, in priority order."""
+
+        return [name for name, hit in zip(self.names, self.masks[:, index]) if hit]
+
+    def hits(self) -> dict[str, int]:
+        """Scenarios each rule matched, whether or not it was the first match."""
+
+        return dict(zip(self.names, self.masks.sum(axis=1).tolist()))
+
+    def counts(self) -> dict[str, int]:
+        """Scenarios per classification outcome, the default included."""
+
+        totals = np.bincount(self.codes(), minlength=len(self.names) + 1)
+        return dict(zip([*self.names, self.default], totals.tolist()))
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    rules: tuple[Rule, ...]
+    default: str | None = None
+
+    def __post_init__(self) -> None:
+        ordered = sorted(self.rules, key=lambda rule: -rule.priority)
+        object.__setattr__(self, "rules", tuple(ordered))
+
+    def metrics(self) -> set[str]:
+        return {condition.metric for rule in self.rules for condition in rule.conditions}
+
+    def evaluate(self, metrics: Mapping[str, Any]) -> RuleResult:
+        """Match every rule against scalar or 1-D metric values."""
+
+        missing = sorted(self.metrics() - set(metrics))
+        if missing:
+            raise ValueError(f"Rules need metrics that were not supplied: {', '.join(missing)}")
+        values = {name: np.atleast_1d(np.asarray(metrics[name], dtype=float)) for name in self.metrics()}
+        size = max((len(array) for array in values.values()), default=1)
+
+        masks = np.ones((len(self.rules), size), dtype=bool)
+        for row, rule in enumerate(self.rules):
+            for condition in rule.conditions:
+                masks[row] &= OPERATORS[condition.operator](values[condition.metric], condition.threshold)
+        return RuleResult(names=[rule.name for rule in self.rules], masks=masks, default=self.default)
+
+    def first_match(self, metrics: Mapping[str, float]) -> str | None:
+        """Classify one scenario: the first matching rule name, or the default."""
+
+        for rule in self.rules:
+            if _holds(rule, metrics):
+                return rule.name
+        return self.default
+
+    def matches(self, metrics: Mapping[str, float]) -> list[str]:
+        """Every rule one scenario matches, in priority order."""
+
+        return [rule.name for rule in self.rules if _holds(rule, metrics)]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "default": self.default,
+            "rules": [
+                {
+                    "name": rule.name,
+                    "priority": rule.priority,
+                    "when": [[item.metric, item.operator, item.threshold] for item in rule.conditions],
+                }
+                for rule in self.rules
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, spec: Mapping[str, Any]) -> "RuleSet":
+        rules = []
+        for raw in spec.get("rules") or []:
+            if not raw.get("name"):
+                raise ValueError("Every rule needs a name.")
+            conditions = tuple(
+                Condition(str(metric), str(comparison), float(threshold))
+                for metric, comparison, threshold in raw.get("when") or []
+            )
+            rules.append(Rule(str(raw["name"]), conditions, int(raw.get("priority", 0))))
+        return cls(tuple(rules), spec.get("default"))
+
+
+def load_rules(path: str | Path) -> RuleSet:
+    """Read a rule set from a JSON file in the ``RuleSet.to_dict`` layout."""
+
+    import json
+
+    return RuleSet.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def _holds(rule: Rule, metrics: Mapping[str, float]) -> bool:
+    return all(
+        SCALAR_OPERATORS[condition.operator](metrics[condition.metric], condition.threshold)
+        for condition in rule.conditions
+    )
+
+
+def _rules(*rows: tuple[str, list[tuple[str, str, float]]]) -> tuple[Rule, ...]:
+    # Table order is priority order, highest first.
+    return tuple(
+        Rule(name, tuple(Condition(*condition) for condition in conditions), priority=len(rows) - position)
+        for position, (name, conditions) in enumerate(rows)
+    )
+
+
+REGIME_RULES = RuleSet(
+    _rules(
+        ("Stagflation stress", [("inflation_peak", ">=", 3.5), ("output_gap_trough", "<=", -1.0)]),
+        ("Recession risk", [("growth_trough", "<", 0.0)]),
+        ("Inflation pressure", [("inflation_peak_delta", ">", 0.7)]),
+        ("Restrictive policy", [("real_rate_peak", ">", 2.0)]),
+    ),
+    default="Contained adjustment",
+)
+
+WARNING_RULES = RuleSet(
+    _rules(
+        (
+            "Inflation rises materially while the policy path barely responds.",
+            [("inflation_peak_delta", ">", 0.7), ("policy_peak_delta", "<", 0.05)],
+        ),
+        (
+            "The scenario combines above-baseline inflation with a negative output gap.",
+            [("inflation_peak_delta", ">", 0.7), ("output_gap_trough", "<", -1.0)],
+        ),
+        (
+            "Real rates enter a clearly restrictive zone and activity weakens.",
+            [("real_rate_peak", ">", 2.5), ("growth_trough_delta", "<", -0.5)],
+        ),
+        ("The output gap falls below -2%, so recession risk dominates the scenario.", [("output_gap_trough", "<", -2.0)]),
+        ("No active shock is configured; the scenario equals the baseline path.", [("shock_count", "==", 0)]),
+    )
+)
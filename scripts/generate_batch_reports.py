@@ -0,0 +1,279 @@
+"""Batch report generation for many scenario specs.
+
+Specs use the ``input/scenario_template.json`` schema and are read either from
+a directory of ``*.json`` files or from a JSONL file with one spec per line.
+Each chunk is simulated with ``simulate_batch`` and its reports are rendered
+across a worker pool, written as they complete and recorded in
+``manifest.jsonl`` so an interrupted run resumes where it stopped. Unreadable
+lines and invalid specs are recorded as errors without stopping the run and
+are retried, replacing their old entries, on the next run.
+
+    python scripts/generate_batch_reports.py input/ --output output/batch --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+import json
+import os
+from pathlib import Path
+import re
+import sys
+from typing import Any, Iterable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from quant.ingest import parse_specs
+from quant.macro_engine import ScenarioResult
+from quant.narrative import generate_markdown_report
+from utils.instrumentation import profile_if_requested
+
+
+MANIFEST_NAME = "manifest.jsonl"
+
+
+@dataclass(frozen=True)
+class SpecError:
+    """A source entry that could not be read as a spec."""
+
+    message: str
+
+
+Spec = tuple[str, dict[str, Any] | SpecError]
+Rendered = dict[str, Any]
+
+
+def iter_specs(source: Path) -> Iterator[Spec]:
+    """Yield ``(report_id, spec)`` pairs lazily from a directory or JSONL file.
+
+    Unreadable entries and repeated ids are yielded as a ``SpecError`` so the
+    run records them and moves on. A spec's own ``id`` is slugged like the
+    fallback id, so it always names a file inside the report directory. The
+    fallback is the file name in directory mode and the line number and
+    scenario name in JSONL mode.
+    """
+
+    seen: set[str] = set()
+    if source.is_dir():
+        for path in sorted(source.glob("*.json")):
+            try:
+                spec = json.loads(path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError as exc:
+                yield path.stem, SpecError(f"Invalid JSON: {exc.msg}.")
+                continue
+            except UnicodeDecodeError:
+                yield path.stem, SpecError("Spec file is not valid UTF-8.")
+                continue
+            except OSError as exc:
+                yield path.stem, SpecError(f"Unreadable spec file: {exc.strerror or exc}.")
+                continue
+            if not isinstance(spec, dict):
+                yield path.stem, SpecError("Spec must be a JSON object.")
+                continue
+            yield _named(spec, path.stem, f"{path.stem}-duplicate", seen)
+        return
+
+    with source.open("rb") as handle:
+        for line_no, raw in enumerate(handle, start=1):
+            if not raw.strip():
+                continue
+            try:
+                spec = json.loads(raw.decode("utf-8"))
+            except UnicodeDecodeError:
+                yield f"{line_no:07d}-invalid", SpecError("Line is not valid UTF-8.")
+                continue
+            except json.JSONDecodeError as exc:
+                yield f"{line_no:07d}-invalid", SpecError(f"Invalid JSON: {exc.msg}.")
+                continue
+            if not isinstance(spec, dict):
+                yield f"{line_no:07d}-invalid", SpecError("Spec must be a JSON object.")
+                continue
+            fallback = f"{line_no:07d}-{_slug(spec.get('scenario_name', 'scenario'))}"
+            yield _named(spec, fallback, f"{line_no:07d}-duplicate", seen)
+
+
+def render_chunk(chunk: list[Spec]) -> list[Rendered]:
+    """Simulate one chunk of specs in batch and render its reports inside a worker process.
+
+    Specs are validated together by ``quant.ingest.parse_specs`` and simulated
+    with one ``simulate_batch`` call per (horizon, baseline) group. A group
+    that fails to simulate is retried one spec at a time, so only the specs
+    that fail on their own are recorded as errors.
+    """
+
+    rendered: list[Rendered | None] = [None] * len(chunk)
+    valid = [position for position, (_, spec) in enumerate(chunk) if not isinstance(spec, SpecError)]
+    for position, (report_id, spec) in enumerate(chunk):
+        if isinstance(spec, SpecError):
+            rendered[position] = {"id": report_id, "status": "error", "error": spec.message}
+
+    parsed = parse_specs([chunk[position][1] for position in valid], lines=valid)
+    messages: dict[int, list[str]] = {}
+    for error in parsed.errors:
+        prefix = f"Shock {error.shock}: " if error.shock is not None else ""
+        messages.setdefault(error.line, []).append(prefix + error.message)
+    for position, errors in messages.items():
+        rendered[position] = {"id": chunk[position][0], "status": "error", "error": " ".join(errors)}
+
+    simulated = []
+    for scenarios in parsed.groups():
+        try:
+            simulated.append((scenarios, parsed.simulate_group(scenarios)))
+        except (KeyError, TypeError, ValueError):
+            for offset, index in enumerate(scenarios.tolist()):
+                single = scenarios[offset : offset + 1]
+                try:
+                    simulated.append((single, parsed.simulate_group(single)))
+                except (KeyError, TypeError, ValueError) as exc:
+                    position = int(parsed.lines[index])
+                    rendered[position] = {"id": chunk[position][0], "status": "error", "error": str(exc)}
+
+    for scenarios, batch in simulated:
+        for local, index in enumerate(scenarios.tolist()):
+            position = int(parsed.lines[index])
+            report_id, spec = chunk[position]
+            try:
+                result = ScenarioResult.from_arrays(batch.scenario(local))
+                title = f"{spec.get('scenario_name', report_id)} scenario report"
+                rendered[position] = {
+                    "id": report_id,
+                    "status": "ok",
+                    "regime": result.metrics["regime"],
+                    "report": generate_markdown_report(result, title=title),
+                }
+            except (KeyError, TypeError, ValueError) as exc:
+                rendered[position] = {"id": report_id, "status": "error", "error": str(exc)}
+    return [item for item in rendered if item is not None]
+
+
+def completed_ids(output_dir: Path) -> set[str]:
+    return {str(entry["id"]) for entry in _manifest_entries(output_dir) if entry.get("status") == "ok"}
+
+
+def reset_manifest(output_dir: Path, resume: bool = True) -> set[str]:
+    """Drop recorded errors, or every entry without ``resume``, and return the ids already done.
+
+    Errors are retried on each run, so keeping them would repeat them in the
+    manifest.
+    """
+
+    kept = [entry for entry in _manifest_entries(output_dir) if resume and entry.get("status") == "ok"]
+    manifest = output_dir / MANIFEST_NAME
+    if manifest.exists():
+        staged = manifest.with_suffix(".tmp")
+        staged.write_text("".join(json.dumps(entry) + "\n" for entry in kept), encoding="utf-8")
+        os.replace(staged, manifest)
+    return {str(entry["id"]) for entry in kept}
+
+
+def run_batch(
+    source: Path,
+    output_dir: Path,
+    workers: int = 0,
+    chunk_size: int = 64,
+    resume: bool = True,
+) -> dict[str, int]:
+    """Render every pending spec and return ok/error/skipped counts."""
+
+    report_dir = output_dir / "reports"
+    report_dir.mkdir(parents=True, exist_ok=True)
+    done = reset_manifest(output_dir, resume)
+    counts = {"ok": 0, "error": 0, "skipped": 0}
+
+    def pending() -> Iterator[Spec]:
+        for report_id, spec in iter_specs(source):
+            if report_id in done:
+                counts["skipped"] += 1
+                continue
+            yield report_id, spec
+
+    chunks = _chunked(pending(), chunk_size)
+    with (output_dir / MANIFEST_NAME).open("a", encoding="utf-8") as manifest:
+        if workers <= 1:
+            for chunk in chunks:
+                _write_rendered(render_chunk(chunk), report_dir, manifest, counts)
+            return counts
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight: set[Future[list[Rendered]]] = set()
+            for chunk in chunks:
+                in_flight.add(pool.submit(render_chunk, chunk))
+                if len(in_flight) >= 2 * workers:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        _write_rendered(future.result(), report_dir, manifest, counts)
+            for future in wait(in_flight).done:
+                _write_rendered(future.result(), report_dir, manifest, counts)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate macro scenario reports in batch.")
+    parser.add_argument("source", help="Directory of *.json specs or a JSONL file with one spec per line.")
+    parser.add_argument("--output", default="output/batch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--no-resume", action="store_true", help="Start a fresh manifest and re-render every spec.")
+    args = parser.parse_args()
+
+    with profile_if_requested():
+        counts = run_batch(
+            Path(args.source),
+            Path(args.output),
+            workers=args.workers,
+            chunk_size=max(1, args.chunk_size),
+            resume=not args.no_resume,
+        )
+    print(f"Reports written: {counts['ok']}, errors: {counts['error']}, already done: {counts['skipped']}")
+
+
+def _write_rendered(rendered: list[Rendered], report_dir: Path, manifest: Any, counts: dict[str, int]) -> None:
+    for item in rendered:
+        entry = {key: value for key, value in item.items() if key != "report"}
+        if item["status"] == "ok":
+            path = report_dir / f"{item['id']}.md"
+            path.write_text(item["report"], encoding="utf-8")
+            entry["report"] = str(path)
+        manifest.write(json.dumps(entry) + "\n")
+        counts[item["status"]] += 1
+    manifest.flush()
+
+
+def _manifest_entries(output_dir: Path) -> list[dict[str, Any]]:
+    manifest = output_dir / MANIFEST_NAME
+    if not manifest.exists():
+        return []
+
+    entries = []
+    with manifest.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def _chunked(items: Iterable[Spec], size: int) -> Iterator[list[Spec]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _named(spec: dict[str, Any], fallback: str, duplicate: str, seen: set[str]) -> Spec:
+    report_id = _slug(spec["id"]) if spec.get("id") else fallback
+    if report_id in seen:
+        return duplicate, SpecError(f"Duplicate report id: {report_id}")
+    seen.add(report_id)
+    return report_id, spec
+
+
+def _slug(text: Any) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-") or "scenario"
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from quant.macro_engine import PRESET_SCENARIOS, scenario_from_preset, simulate_scenario
 from quant.narrative import generate_markdown_report
+from utils.instrumentation import profile_if_requested
 
 
 def build_report(preset: str) -> str:
@@ -24,7 +25,8 @@ def main() -> None:
     parser.add_argument("--output", default="output/summary.md")
     args = parser.parse_args()
 
-    report = build_report(args.preset)
+    with profile_if_requested():
+        report = build_report(args.preset)
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(report, encoding="utf-8")
@@ -0,0 +1,12 @@
+import pytest
+
+from utils import instrumentation
+
+
+@pytest.fixture
+def instrumented():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant.backtest import realized_paths, run_backtest
+from quant.core import BaselineAssumptions, MacroShock, ShockChannel, simulate_arrays
+
+
+def _history(months: int = 120) -> dict[str, pd.Series]:
+    index = pd.date_range("2010-01-01", periods=months, freq="MS")
+    rng = np.random.default_rng(3)
+    return {
+        "gdp": pd.Series(100 * np.exp(np.cumsum(0.0012 + 0.002 * rng.standard_normal(months))), index),
+        "inflation": pd.Series(100 * np.exp(np.cumsum(0.0017 + 0.001 * rng.standard_normal(months))), index),
+        "policy_rate": pd.Series(2 + np.cumsum(0.05 * rng.standard_normal(months)), index),
+    }
+
+
+def test_every_origin_matches_a_seeded_single_scenario():
+    realized = realized_paths(_history())
+    shocks = [MacroShock("Energy", ShockChannel.SUPPLY, 0.6, duration=3)]
+    result = run_backtest(realized, shocks, horizon=12)
+
+    assert result.origins[0] == pd.Timestamp("2011-01-01")
+    assert result.forecasts.shape == (len(result.origins), 5, 12)
+    for origin in (0, 40, len(result.origins) - 1):
+        seed = realized.loc[result.origins[origin]]
+        assumptions = BaselineAssumptions(
+            initial_inflation=seed["inflation"],
+            initial_policy_rate=seed["policy_rate"],
+            initial_output_gap=seed["output_gap"],
+        )
+        single = simulate_arrays(shocks, horizon=12, assumptions=assumptions)
+        np.testing.assert_allclose(result.forecasts[origin, 1], single.columns["inflation_scenario"], atol=1e-12)
+        np.testing.assert_allclose(result.forecasts[origin, 3], single.columns["real_rate_scenario"], atol=1e-12)
+
+
+def test_error_table_counts_only_realized_months():
+    realized = realized_paths(_history())
+    result = run_backtest(realized, horizon=6)
+    table = result.table().set_index(["variable", "horizon"])
+
+    origins = len(result.origins)
+    assert table.loc[("inflation", 1), "n"] == origins
+    assert table.loc[("inflation", 6), "n"] == origins - 5
+    errors = result.errors[:, 2, 2]
+    errors = errors[~np.isnan(errors)]
+    assert table.loc[("policy_rate", 3), "rmse"] == pytest.approx(np.sqrt(np.mean(errors**2)))
+    assert list(result.surface("bias").index) == ["gdp_growth", "inflation", "policy_rate", "real_rate", "output_gap"]
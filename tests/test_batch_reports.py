@@ -0,0 +1,178 @@
+import importlib.util
+import json
+from pathlib import Path
+import sys
+
+import quant.ingest
+from quant.macro_engine import scenario_from_spec, simulate_scenario
+from quant.narrative import generate_markdown_report
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "generate_batch_reports.py"
+_spec = importlib.util.spec_from_file_location("generate_batch_reports", SCRIPT)
+batch_reports = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = batch_reports
+_spec.loader.exec_module(batch_reports)
+
+
+def _manifest(output_dir):
+    return [json.loads(line) for line in (output_dir / "manifest.jsonl").read_text(encoding="utf-8").splitlines()]
+
+
+def test_run_batch_records_every_line_and_resumes(tmp_path):
+    energy = {
+        "scenario_name": "Energy",
+        "horizon": 24,
+        "baseline": {"initial_inflation": 3.0},
+        "shocks": [{"name": "Oil", "channel": "Supply / energy", "magnitude": 1.6, "duration": 5}],
+    }
+    lines = [
+        json.dumps(energy),
+        "{not json",
+        json.dumps({"id": "calm", "horizon": 12}),
+        "[1, 2]",
+        json.dumps({"scenario_name": "Bad", "shocks": [{"channel": "Weather", "magnitude": 1.0}]}),
+    ]
+    source = tmp_path / "specs.jsonl"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    output_dir = tmp_path / "batch"
+
+    counts = batch_reports.run_batch(source, output_dir, workers=0, chunk_size=2)
+    assert counts == {"ok": 2, "error": 3, "skipped": 0}
+    rows = _manifest(output_dir)
+    assert [(row["id"], row["status"]) for row in rows] == [
+        ("0000001-energy", "ok"),
+        ("0000002-invalid", "error"),
+        ("calm", "ok"),
+        ("0000004-invalid", "error"),
+        ("0000005-bad", "error"),
+    ]
+    assert rows[1]["error"].startswith("Invalid JSON")
+    assert rows[3]["error"] == "Spec must be a JSON object."
+    assert rows[4]["error"] == "Shock 0: Unsupported shock channel: Weather"
+
+    shocks, horizon, assumptions = scenario_from_spec(energy)
+    expected = generate_markdown_report(simulate_scenario(shocks, horizon, assumptions), title="Energy scenario report")
+    assert Path(rows[0]["report"]).read_text(encoding="utf-8") == expected
+    assert rows[0]["regime"] == simulate_scenario(shocks, horizon, assumptions).metrics["regime"]
+
+    counts = batch_reports.run_batch(source, output_dir, workers=0, chunk_size=2)
+    assert counts == {"ok": 0, "error": 3, "skipped": 2}
+    rerun = _manifest(output_dir)
+    assert [row["id"] for row in rerun] == ["0000001-energy", "calm", "0000002-invalid", "0000004-invalid", "0000005-bad"]
+
+    counts = batch_reports.run_batch(source, output_dir, workers=0, chunk_size=2, resume=False)
+    assert counts == {"ok": 2, "error": 3, "skipped": 0}
+    assert len(_manifest(output_dir)) == len(rows)
+
+
+def test_report_ids_stay_inside_the_output_and_repeats_are_rejected(tmp_path):
+    lines = [
+        json.dumps({"id": "x/y", "horizon": 12}),
+        json.dumps({"id": "../../escape", "horizon": 12}),
+        json.dumps({"id": "x-y", "horizon": 12}),
+        json.dumps({"id": "../../escape", "horizon": 24}),
+    ]
+    source = tmp_path / "specs.jsonl"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    output_dir = tmp_path / "out" / "batch"
+
+    counts = batch_reports.run_batch(source, output_dir, workers=0)
+    assert counts == {"ok": 2, "error": 2, "skipped": 0}
+    rows = _manifest(output_dir)
+    assert [(row["id"], row["status"]) for row in rows] == [
+        ("x-y", "ok"),
+        ("escape", "ok"),
+        ("0000003-duplicate", "error"),
+        ("0000004-duplicate", "error"),
+    ]
+    assert rows[2]["error"] == "Duplicate report id: x-y"
+    assert sorted(path.name for path in (output_dir / "reports").iterdir()) == ["escape.md", "x-y.md"]
+    assert not (tmp_path / "escape.md").exists()
+
+    spec_dir = tmp_path / "specs"
+    spec_dir.mkdir()
+    (spec_dir / "a.json").write_text(json.dumps({"id": "Shared/Id", "horizon": 12}), encoding="utf-8")
+    (spec_dir / "b.json").write_text(json.dumps({"horizon": 12}), encoding="utf-8")
+    (spec_dir / "c.json").write_text(json.dumps({"id": "shared-id", "horizon": 12}), encoding="utf-8")
+    counts = batch_reports.run_batch(spec_dir, tmp_path / "from-dir", workers=0)
+    assert counts == {"ok": 2, "error": 1, "skipped": 0}
+    rows = _manifest(tmp_path / "from-dir")
+    assert [(row["id"], row["status"]) for row in rows] == [("shared-id", "ok"), ("b", "ok"), ("c-duplicate", "error")]
+    assert rows[2]["error"] == "Duplicate report id: shared-id"
+
+
+def test_undecodable_entries_are_recorded_as_errors(tmp_path):
+    spec_dir = tmp_path / "specs"
+    spec_dir.mkdir()
+    (spec_dir / "a.json").write_text(json.dumps({"horizon": 12}), encoding="utf-8")
+    (spec_dir / "b.json").write_bytes(b'{"scenario_name": "caf\xe9"}')
+    (spec_dir / "c.json").mkdir()
+    counts = batch_reports.run_batch(spec_dir, tmp_path / "from-dir", workers=0)
+    assert counts == {"ok": 1, "error": 2, "skipped": 0}
+    rows = _manifest(tmp_path / "from-dir")
+    assert [(row["id"], row["status"]) for row in rows] == [("a", "ok"), ("b", "error"), ("c", "error")]
+    assert rows[1]["error"] == "Spec file is not valid UTF-8."
+    assert rows[2]["error"].startswith("Unreadable spec file")
+
+    source = tmp_path / "specs.jsonl"
+    source.write_bytes(b'{"scenario_name": "caf\xe9"}\n' + json.dumps({"id": "calm", "horizon": 12}).encode() + b"\n")
+    counts = batch_reports.run_batch(source, tmp_path / "from-lines", workers=0)
+    assert counts == {"ok": 1, "error": 1, "skipped": 0}
+    rows = _manifest(tmp_path / "from-lines")
+    assert [(row["id"], row["status"]) for row in rows] == [("0000001-invalid", "error"), ("calm", "ok")]
+    assert rows[0]["error"] == "Line is not valid UTF-8."
+
+
+def test_a_group_that_fails_to_simulate_is_recorded_per_spec(tmp_path, monkeypatch):
+    simulate_batch = quant.ingest.simulate_batch
+
+    def fail_long_horizons(shocks, horizon, **options):
+        if horizon == 24:
+            raise ValueError("Simulation failed.")
+        return simulate_batch(shocks, horizon, **options)
+
+    monkeypatch.setattr(quant.ingest, "simulate_batch", fail_long_horizons)
+    lines = [
+        json.dumps({"id": "good", "horizon": 12}),
+        json.dumps({"id": "dated", "horizon": 12, "baseline": {"start_date": "not-a-date"}}),
+        json.dumps({"id": "long", "horizon": 24}),
+        json.dumps({"id": "longer", "horizon": 24, "shocks": [{"channel": "Demand", "magnitude": 1.0}]}),
+    ]
+    source = tmp_path / "specs.jsonl"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    counts = batch_reports.run_batch(source, tmp_path / "batch", workers=0)
+    assert counts == {"ok": 1, "error": 3, "skipped": 0}
+    rows = _manifest(tmp_path / "batch")
+    assert [(row["id"], row["status"]) for row in rows] == [
+        ("good", "ok"),
+        ("dated", "error"),
+        ("long", "error"),
+        ("longer", "error"),
+    ]
+    assert rows[1]["error"].startswith("Invalid baseline: Baseline start_date must be a date")
+    assert rows[2]["error"] == rows[3]["error"] == "Simulation failed."
+
+
+def test_one_spec_that_fails_to_simulate_leaves_its_group_rendering(tmp_path, monkeypatch):
+    simulate_batch = quant.ingest.simulate_batch
+
+    def fail_on_sentinel(shocks, horizon, **options):
+        if (shocks.magnitude == 2.5).any():
+            raise ValueError("Simulation failed.")
+        return simulate_batch(shocks, horizon, **options)
+
+    monkeypatch.setattr(quant.ingest, "simulate_batch", fail_on_sentinel)
+    demand = {"channel": "Demand", "magnitude": 1.0}
+    lines = [json.dumps({"id": f"ok-{index}", "horizon": 24, "shocks": [demand]}) for index in range(3)]
+    lines.insert(1, json.dumps({"id": "sentinel", "horizon": 24, "shocks": [{"channel": "Demand", "magnitude": 2.5}]}))
+    lines.insert(3, json.dumps({"id": "huge", "horizon": 24, "shocks": [{"channel": "Demand", "magnitude": 1.0, "duration": 1e20}]}))
+    source = tmp_path / "specs.jsonl"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    counts = batch_reports.run_batch(source, tmp_path / "batch", workers=0)
+    assert counts == {"ok": 3, "error": 2, "skipped": 0}
+    rows = {row["id"]: row for row in _manifest(tmp_path / "batch")}
+    assert [rows[f"ok-{index}"]["status"] for index in range(3)] == ["ok", "ok", "ok"]
+    assert rows["sentinel"]["error"] == "Simulation failed."
+    assert rows["huge"]["error"] == "Shock 0: Shock duration must be between 1 and the horizon."
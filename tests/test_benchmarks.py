@@ -0,0 +1,28 @@
+from benchmarks.run_benchmarks import build_cases, compare_results, synthetic_shocks, time_case
+from quant.macro_engine import simulate_scenario
+
+
+def test_compare_results_flags_slowdowns_above_threshold():
+    baseline = {"results": {"fast": {"median_s": 1.0}, "slow": {"median_s": 1.0}}}
+    current = {"results": {"fast": {"median_s": 1.1}, "slow": {"median_s": 1.5}, "new": {"median_s": 9.0}}}
+
+    rows = {row["name"]: row for row in compare_results(current, baseline, threshold=0.25)}
+
+    assert set(rows) == {"fast", "slow"}
+    assert not rows["fast"]["regression"]
+    assert rows["slow"]["regression"]
+
+
+def test_synthetic_shocks_are_valid_for_every_horizon():
+    for horizon in (6, 60):
+        result = simulate_scenario(synthetic_shocks(50, horizon), horizon=horizon)
+        assert len(result.shocks) == 50
+
+
+def test_fixtures_are_only_built_for_selected_cases(tmp_path):
+    cases = {case.name: case for case in build_cases(tmp_path)}
+
+    assert not (tmp_path / "scenarios.jsonl").exists()
+    stats = time_case(cases["ingest_jsonl[rows=100k]"], repeats=1)
+    assert (tmp_path / "scenarios.jsonl").exists()
+    assert stats["repeats"] == 1
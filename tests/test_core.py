@@ -0,0 +1,186 @@
+from pathlib import Path
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from quant.core import (
+    CHANNEL_ORDER,
+    RESPONSE_PROFILES,
+    MacroShock,
+    PolicyRule,
+    ShockArrays,
+    ShockChannel,
+    _channel_kernels,
+    _lag_convolve,
+    _response_matrix,
+    baseline_arrays,
+    extended_profiles,
+    month_starts,
+    simulate_arrays,
+    simulate_batch,
+)
+from quant.macro_engine import simulate_scenario
+
+
+def test_simulate_arrays_matches_dataframe_api():
+    shocks = [
+        MacroShock("Energy", ShockChannel.SUPPLY, 1.2, duration=4, persistence=0.8),
+        MacroShock("Hike", ShockChannel.MONETARY, 0.5, duration=3, start_month=5),
+    ]
+    arrays = simulate_arrays(shocks, horizon=24)
+    result = simulate_scenario(shocks, horizon=24)
+
+    assert list(result.frame.columns) == ["date", *arrays.columns]
+    for column, values in arrays.columns.items():
+        np.testing.assert_allclose(result.frame[column].to_numpy(), values)
+    assert arrays.metrics == result.metrics
+
+
+@pytest.mark.parametrize("mode", ["shock", "channel"])
+def test_attribution_sums_to_scenario_deltas(mode):
+    shocks = [
+        MacroShock("Energy", ShockChannel.SUPPLY, 1.2, duration=4, persistence=0.8),
+        MacroShock("Oil", ShockChannel.SUPPLY, 0.4, duration=2),
+        MacroShock("Hike", ShockChannel.MONETARY, 0.5, duration=3, start_month=5),
+    ]
+    arrays = simulate_arrays(shocks, horizon=24, attribution=mode)
+    plain = simulate_arrays(shocks, horizon=24)
+    totals = arrays.attribution.contributions.sum(axis=0)
+
+    assert arrays.attribution.labels == (["Energy", "Oil", "Hike"] if mode == "shock" else ["Supply / energy", "Monetary policy"])
+    for index, variable in enumerate(("gdp_growth", "inflation", "policy_rate", "real_rate", "output_gap")):
+        np.testing.assert_allclose(totals[:, index], arrays.columns[f"{variable}_delta"], atol=1e-12)
+        np.testing.assert_allclose(arrays.columns[f"{variable}_delta"], plain.columns[f"{variable}_delta"], atol=1e-12)
+
+
+def test_unknown_attribution_mode_is_rejected():
+    with pytest.raises(ValueError, match="Attribution"):
+        simulate_arrays([], horizon=12, attribution="region")
+
+
+def test_policy_rule_path_satisfies_the_reaction_function():
+    rule = PolicyRule(inflation=1.5, output_gap=0.5, smoothing=0.7)
+    shocks = [MacroShock("Energy", ShockChannel.SUPPLY, 1.6, duration=5, persistence=0.82)]
+    endogenous = simulate_arrays(shocks, horizon=24, policy_rule=rule).columns
+    exogenous = simulate_arrays(shocks, horizon=24).columns
+
+    policy = endogenous["policy_rate_delta"]
+    target = rule.inflation * endogenous["inflation_delta"] + rule.output_gap * endogenous["output_gap_delta"]
+    expected = rule.smoothing * np.r_[0.0, policy[:-1]] + (1 - rule.smoothing) * target
+    np.testing.assert_allclose(policy, expected, atol=1e-12)
+    assert endogenous["inflation_delta"].max() < exogenous["inflation_delta"].max()
+
+
+@pytest.mark.parametrize("rule", [None, PolicyRule()])
+def test_simulate_batch_matches_single_scenarios(rule):
+    scenarios = [
+        [MacroShock("Energy", ShockChannel.SUPPLY, 1.2, duration=4, persistence=0.8)],
+        [],
+        [
+            MacroShock("Hike", ShockChannel.MONETARY, 0.5, duration=3, start_month=5),
+            MacroShock("Spend", ShockChannel.FISCAL, 0.8, duration=6),
+        ],
+    ]
+    batch = simulate_batch(ShockArrays.from_scenarios(scenarios), horizon=24, policy_rule=rule)
+
+    assert len(batch) == 3
+    for index, shocks in enumerate(scenarios):
+        single = simulate_arrays(shocks, horizon=24, policy_rule=rule)
+        batched = batch.scenario(index)
+        for column, values in single.columns.items():
+            np.testing.assert_allclose(batched.columns[column], values, atol=1e-12)
+        assert batched.metrics["regime"] == single.metrics["regime"]
+        assert batched.warnings == single.warnings
+
+
+def test_simulate_batch_reports_the_invalid_row():
+    shocks = ShockArrays.from_scenarios([[MacroShock("Ok", ShockChannel.DEMAND, 1.0)], [MacroShock("Big", ShockChannel.DEMAND, 9.0)]])
+
+    with pytest.raises(ValueError, match="row 1 is too large"):
+        simulate_batch(shocks, horizon=12)
+
+
+def test_simulate_batch_rejects_too_few_scenarios():
+    shocks = ShockArrays.from_scenarios([[MacroShock("Ok", ShockChannel.DEMAND, 1.0)]] * 3)
+
+    with pytest.raises(ValueError, match="reach scenario 2, beyond 2 scenarios"):
+        simulate_batch(shocks, horizon=12, scenarios=2)
+    assert len(simulate_batch(shocks, horizon=12, scenarios=4)) == 4
+
+
+def test_long_horizon_mode_reproduces_short_horizon_paths():
+    shocks = [
+        MacroShock("Energy", ShockChannel.SUPPLY, 1.2, duration=4, persistence=0.8),
+        MacroShock("Hike", ShockChannel.MONETARY, 0.5, duration=3, start_month=5),
+    ]
+    short = simulate_arrays(shocks, horizon=60)
+    long = simulate_arrays(shocks, horizon=360, long_horizon=True)
+
+    for column, values in short.columns.items():
+        np.testing.assert_array_equal(long.columns[column][:60], values)
+    with pytest.raises(ValueError, match="between 6 and 60"):
+        simulate_arrays(shocks, horizon=360)
+    with pytest.raises(ValueError, match="between 6 and 480"):
+        simulate_arrays(shocks, horizon=600, long_horizon=True)
+
+
+def test_fft_convolution_matches_direct_convolution():
+    rng = np.random.default_rng(7)
+    impulses = rng.normal(size=(3, 240))
+    kernel = rng.normal(size=(5, 180))
+    responses = _lag_convolve(impulses, kernel)
+
+    for row in range(3):
+        for variable in range(5):
+            expected = np.convolve(impulses[row], kernel[variable])[:240]
+            np.testing.assert_allclose(responses[row, variable], expected, atol=1e-10)
+
+
+@pytest.mark.parametrize("horizon", [6, 24, 60])
+@pytest.mark.parametrize("profiles", [None, extended_profiles(90)], ids=["calibrated", "extended"])
+@pytest.mark.parametrize("endogenous_policy", [False, True])
+def test_response_matrix_matches_lag_convolution(horizon, profiles, endogenous_policy):
+    rng = np.random.default_rng(3)
+    impulses = rng.normal(size=(4, len(CHANNEL_ORDER), horizon))
+    kernels = _channel_kernels(profiles, endogenous_policy)
+
+    product = (impulses.reshape(4, -1) @ _response_matrix(kernels, horizon)).reshape(4, -1, horizon)
+    expected = sum(_lag_convolve(impulses[:, index], kernels[channel]) for index, channel in enumerate(CHANNEL_ORDER))
+    np.testing.assert_allclose(product, expected, atol=1e-10)
+    assert _response_matrix(_channel_kernels(profiles, endogenous_policy), horizon) is _response_matrix(kernels, horizon)
+
+
+def test_extended_profiles_keep_the_calibrated_head():
+    profiles = extended_profiles(120, decay=0.95)
+    supply = profiles[ShockChannel.SUPPLY]["inflation"]
+
+    assert len(supply) == 120
+    assert supply[:6] == RESPONSE_PROFILES[ShockChannel.SUPPLY]["inflation"]
+    assert supply[6] == pytest.approx(RESPONSE_PROFILES[ShockChannel.SUPPLY]["inflation"][-1] * 0.95)
+
+
+def test_baseline_arrays_cover_every_variable():
+    columns = baseline_arrays(12)
+
+    assert set(columns) == {"gdp_growth_baseline", "inflation_baseline", "policy_rate_baseline", "real_rate_baseline", "output_gap_baseline"}
+    np.testing.assert_allclose(columns["real_rate_baseline"], columns["policy_rate_baseline"] - columns["inflation_baseline"])
+
+
+def test_month_starts_roll_forward_like_pandas_month_start():
+    assert str(month_starts("2026-06-01", 2)[0]) == "2026-06-01"
+    assert str(month_starts("2026-06-15", 2)[0]) == "2026-07-01"
+
+
+def test_importing_quant_does_not_import_pandas():
+    code = "import sys, quant; quant.simulate_arrays([], 12); print('pandas' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert output.strip() == "False"
@@ -0,0 +1,24 @@
+import json
+
+import numpy as np
+
+from quant.core import MacroShock, ShockArrays, ShockChannel, simulate_batch
+from utils.export import PATHS_FORMAT, export_paths
+
+
+def test_path_payload_round_trips_as_float32(tmp_path):
+    scenarios = [[MacroShock("Energy", ShockChannel.SUPPLY, 0.2 * index, duration=4)] for index in range(25)]
+    batch = simulate_batch(ShockArrays.from_scenarios(scenarios), horizon=18)
+    path = export_paths(batch, tmp_path / "paths.bin", max_paths=10)
+
+    data = path.read_bytes()
+    size = int(np.frombuffer(data[:4], dtype="<u4")[0])
+    header = json.loads(data[4 : 4 + size])
+    assert size % 4 == 0
+    assert header["format"] == PATHS_FORMAT
+    assert (header["scenarios"], header["horizon"], header["dates"][0]) == (10, 18, "2026-06-01")
+
+    values = np.frombuffer(data[4 + size :], dtype="<f4")
+    baseline, paths = values[: 5 * 18].reshape(5, 18), values[5 * 18 :].reshape(10, 5, 18)
+    np.testing.assert_allclose(baseline, batch.baseline, rtol=1e-6)
+    np.testing.assert_allclose(paths[[0, -1]], batch.paths()[[0, 24]], rtol=1e-6, atol=1e-6)
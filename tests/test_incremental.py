@@ -0,0 +1,71 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from quant.core import MacroShock, ShockChannel, simulate_arrays
+from quant.incremental import ContributionCache, IncrementalScenario
+from utils import instrumentation
+
+
+SHOCKS = [
+    MacroShock("Energy", ShockChannel.SUPPLY, 1.2, duration=4, persistence=0.8),
+    MacroShock("Hike", ShockChannel.MONETARY, 0.5, duration=3, start_month=5),
+    MacroShock("Risk", ShockChannel.RISK, 0.8, duration=2, start_month=3),
+]
+
+
+def assert_matches_full_simulation(scenario: IncrementalScenario) -> None:
+    expected = simulate_arrays(scenario.shocks, horizon=scenario.horizon, assumptions=scenario.assumptions)
+    actual = scenario.arrays()
+    for column, values in expected.columns.items():
+        np.testing.assert_allclose(actual.columns[column], values, atol=1e-12)
+    assert actual.metrics["regime"] == expected.metrics["regime"]
+    assert actual.warnings == expected.warnings
+
+
+def test_edits_match_full_resimulation():
+    scenario = IncrementalScenario(SHOCKS, horizon=24)
+    assert_matches_full_simulation(scenario)
+
+    energy, hike, risk = scenario.keys()
+    scenario.update_shock(energy, replace(SHOCKS[0], magnitude=2.0))
+    assert_matches_full_simulation(scenario)
+
+    scenario.remove_shock(hike)
+    assert_matches_full_simulation(scenario)
+
+    scenario.add_shock(MacroShock("Fiscal", ShockChannel.FISCAL, -0.6))
+    scenario.update_shock(risk, replace(SHOCKS[2], magnitude=0.0))
+    assert_matches_full_simulation(scenario)
+    assert [shock.name for shock in scenario.shocks] == ["Energy", "Fiscal"]
+
+
+def test_sweep_reuses_cached_blocks(instrumented):
+    cache = ContributionCache()
+    scenario = IncrementalScenario(SHOCKS, horizon=24, cache=cache)
+    key = scenario.keys()[0]
+    for magnitude in (0.5, 1.0, 0.5, 1.0):
+        scenario.update_shock(key, replace(SHOCKS[0], magnitude=magnitude))
+    assert len(cache) == 5
+    assert instrumentation.snapshot()["counters"]["cache_hits"] == 2
+
+
+def test_unknown_key_and_invalid_shock_are_rejected():
+    scenario = IncrementalScenario(horizon=12)
+
+    with pytest.raises(KeyError):
+        scenario.remove_shock(3)
+    with pytest.raises(ValueError, match="too large"):
+        scenario.add_shock(MacroShock("Huge", ShockChannel.DEMAND, 9.0))
+    assert scenario.result().warnings == ["No active shock is configured; the scenario equals the baseline path."]
+
+
+def test_inactive_shocks_skip_validation_like_the_engine():
+    scenario = IncrementalScenario(SHOCKS, horizon=12)
+    energy = scenario.keys()[0]
+
+    scenario.update_shock(energy, replace(SHOCKS[0], magnitude=0.0, duration=40, start_month=30))
+    assert_matches_full_simulation(scenario)
+    with pytest.raises(ValueError, match="duration"):
+        scenario.update_shock(energy, replace(SHOCKS[0], duration=40))
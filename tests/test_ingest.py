@@ -0,0 +1,164 @@
+import json
+
+import numpy as np
+
+from quant.core import scenario_from_spec, simulate_arrays
+from quant.ingest import iter_chunks, parse_specs, read_specs
+
+
+def _spec(name, horizon=24, baseline=None, shocks=()):
+    return {"scenario_name": name, "horizon": horizon, "baseline": baseline or {}, "shocks": list(shocks)}
+
+
+def test_ingested_batches_match_single_scenarios(tmp_path):
+    specs = [
+        _spec("energy", shocks=[{"name": " Oil ", "channel": "Supply / energy", "magnitude": 1.6, "duration": 5}]),
+        _spec(
+            "mixed",
+            horizon=36,
+            baseline={"initial_inflation": 3.1},
+            shocks=[
+                {"channel": "Demand", "magnitude": "-1.2", "duration": 0, "persistence": 1.4, "start_month": 4},
+                {"channel": "Monetary policy", "magnitude": 0.0, "duration": 99},
+                {"channel": "Financial risk", "magnitude": 2.0, "duration": 3.7, "persistence": -0.2},
+            ],
+        ),
+        _spec("calm"),
+        _spec("tight", baseline={"initial_inflation": 3.1}, shocks=[{"channel": "Monetary policy", "magnitude": 1.0}]),
+    ]
+    path = tmp_path / "drop.jsonl"
+    path.write_text("\n".join(json.dumps(spec) for spec in specs) + "\n", encoding="utf-8")
+
+    chunks = list(iter_chunks(path, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    assert not any(chunk.errors for chunk in chunks)
+
+    seen = 0
+    for chunk in chunks:
+        for scenarios, batch in chunk.batches():
+            for local, index in enumerate(scenarios.tolist()):
+                spec = specs[int(chunk.lines[index]) - 1]
+                shocks, horizon, assumptions = scenario_from_spec(spec)
+                single = simulate_arrays(shocks, horizon=horizon, assumptions=assumptions)
+                assert chunk.names[index] == spec["scenario_name"]
+                assert batch.scenario(local).shocks == single.shocks
+                for column, values in single.columns.items():
+                    if column != "date":
+                        np.testing.assert_allclose(batch.scenario(local).columns[column], values, atol=1e-12)
+                seen += 1
+    assert seen == len(specs)
+
+
+def test_bad_rows_are_reported_and_their_scenarios_dropped(tmp_path):
+    good = {"channel": "Demand", "magnitude": 1.0}
+    lines = [
+        json.dumps(_spec("ok", shocks=[good])),
+        "{not json",
+        json.dumps(_spec("channel", shocks=[good, {"channel": "Weather", "magnitude": 1.0}])),
+        json.dumps(_spec("large", shocks=[{"channel": "Demand", "magnitude": 9.0}, {"magnitude": None}])),
+        json.dumps(_spec("late", horizon=12, shocks=[{"channel": "Demand", "magnitude": 1.0, "start_month": 13}])),
+        json.dumps(_spec("horizon", horizon=90)),
+        json.dumps(_spec("baseline", baseline={"inflation_target": 2.0})),
+        "",
+        json.dumps(_spec("also ok", shocks=[good])),
+    ]
+    path = tmp_path / "drop.jsonl"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    chunk = read_specs(path)
+    assert list(chunk.names) == ["ok", "also ok"]
+    assert list(chunk.lines) == [1, 9]
+    assert [(error.line, error.shock) for error in chunk.errors] == [
+        (2, None),
+        (3, 1),
+        (4, 0),
+        (4, 1),
+        (5, 0),
+        (6, None),
+        (7, None),
+    ]
+    messages = [error.message for error in chunk.errors]
+    assert messages[1] == "Unsupported shock channel: Weather"
+    assert messages[2] == "Shock is too large for this calibrated engine."
+    assert messages[3] == "Shock magnitude must be a finite number."
+    assert messages[4] == "Shock start month must be inside the horizon."
+    assert messages[5] == "Horizon must be between 6 and 60 months."
+    assert messages[6].startswith("Invalid baseline: Unknown baseline fields: inflation_target")
+    assert list(chunk.shocks.scenario) == [0, 1]
+    assert [len(batch) for _, batch in chunk.batches()] == [2]
+
+
+def test_a_repeated_invalid_baseline_is_rejected_every_time():
+    specs = [
+        _spec("a", baseline={"inflation_target": 2.0}),
+        _spec("b", baseline={"initial_inflation": 3.5}),
+        _spec("c", baseline={"inflation_target": 2.0}),
+    ]
+    chunk = parse_specs(specs)
+    assert list(chunk.names) == ["b"]
+    assert [(error.line, error.shock) for error in chunk.errors] == [(1, None), (3, None)]
+
+    rejected = parse_specs([specs[0], specs[2]])
+    assert len(rejected) == 0
+    assert list(rejected.batches()) == []
+
+
+def test_an_unparseable_start_date_rejects_only_its_spec():
+    specs = [
+        _spec("a", baseline={"start_date": "2026-03-15"}),
+        _spec("bad", baseline={"start_date": "not-a-date"}),
+        _spec("null", baseline={"start_date": None}),
+        _spec("empty", baseline={"start_date": ""}),
+        _spec("b"),
+    ]
+    chunk = parse_specs(specs)
+    assert list(chunk.names) == ["a", "b"]
+    assert [(error.line, error.shock) for error in chunk.errors] == [(2, None), (3, None), (4, None)]
+    assert chunk.errors[0].message == "Invalid baseline: Baseline start_date must be a date, got 'not-a-date'."
+    assert [str(batch.dates[0]) for _, batch in chunk.batches()] == ["2026-04-01", "2026-06-01"]
+
+
+def test_list_valued_shock_fields_are_rejected_per_shock():
+    specs = [
+        _spec("listed", shocks=[{"channel": "Demand", "magnitude": [1.0]}]),
+        _spec("nested", shocks=[{"channel": "Demand", "magnitude": [-0.5], "duration": [[2]]}]),
+        _spec("ok", shocks=[{"channel": "Demand", "magnitude": 1.0}]),
+    ]
+    chunk = parse_specs(specs[:2])
+    assert len(chunk) == 0
+    assert [(error.line, error.shock, error.message) for error in chunk.errors] == [
+        (1, 0, "Shock magnitude must be a finite number."),
+        (2, 0, "Shock magnitude must be a finite number."),
+        (2, 0, "Shock duration must be a finite number."),
+    ]
+    assert list(parse_specs(specs).names) == ["ok"]
+
+
+def test_a_non_utf8_line_is_reported_without_ending_the_stream(tmp_path):
+    path = tmp_path / "drop.jsonl"
+    path.write_bytes(
+        json.dumps(_spec("before")).encode("utf-8")
+        + b'\n{"scenario_name": "caf\xe9"}\n'
+        + json.dumps(_spec("after")).encode("utf-8")
+        + b"\n"
+    )
+
+    chunks = list(iter_chunks(path, chunk_size=2))
+    assert [list(chunk.names) for chunk in chunks] == [["before"], ["after"]]
+    assert [(error.line, error.message) for error in chunks[0].errors] == [(2, "Line is not valid UTF-8.")]
+    assert not chunks[1].errors
+
+
+def test_huge_finite_months_are_rejected_per_shock():
+    specs = [
+        _spec("ok", shocks=[{"channel": "Demand", "magnitude": 1.0}]),
+        _spec("long", shocks=[{"channel": "Demand", "magnitude": 1.0, "duration": 1e20}]),
+        _spec("late", shocks=[{"channel": "Demand", "magnitude": 1.0, "start_month": 1e19}]),
+    ]
+    chunk = parse_specs(specs)
+    assert list(chunk.names) == ["ok"]
+    assert [(error.line, error.shock, error.message) for error in chunk.errors] == [
+        (2, 0, "Shock duration must be between 1 and the horizon."),
+        (3, 0, "Shock start month must be inside the horizon."),
+    ]
+    assert [len(batch) for _, batch in chunk.batches()] == [1]
@@ -0,0 +1,40 @@
+from quant.core import ShockArrays, simulate_batch
+from quant.macro_engine import MacroShock, ShockChannel, simulate_scenario
+from utils import instrumentation
+from utils.export import export_scenario
+
+
+def test_disabled_instrumentation_records_nothing():
+    instrumentation.reset()
+    simulate_scenario([MacroShock("Energy", ShockChannel.SUPPLY, 1.0)], horizon=12)
+
+    assert instrumentation.snapshot() == {"spans": {}, "counters": {}}
+
+
+def test_spans_and_counters_cover_the_pipeline(instrumented, tmp_path):
+    shocks = [MacroShock("Energy", ShockChannel.SUPPLY, 1.0), MacroShock("Hike", ShockChannel.MONETARY, 0.5)]
+    result = simulate_scenario(shocks, horizon=12)
+    paths = export_scenario(result, tmp_path)
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot["spans"]["engine.apply_shock"]["count"] == 2
+    assert {"engine.baseline_path", "engine.scenario_metrics", "narrative.generate_analyst_note", "export.export_scenario"} <= set(snapshot["spans"])
+    assert snapshot["counters"]["scenarios_simulated"] == 1
+    assert snapshot["counters"]["bytes_written"] == sum(path.stat().st_size for path in paths.values())
+
+
+def test_profile_dumps_stats_file(tmp_path):
+    output = tmp_path / "run.prof"
+    with instrumentation.profile(output):
+        simulate_scenario([], horizon=12)
+
+    assert output.stat().st_size > 0
+
+
+def test_batch_scenarios_are_counted_once(instrumented):
+    scenarios = [[MacroShock("Energy", ShockChannel.SUPPLY, 1.0)], [], [MacroShock("Hike", ShockChannel.MONETARY, 0.5)]]
+    batch = simulate_batch(ShockArrays.from_scenarios(scenarios), horizon=12)
+    for index in range(len(batch)):
+        batch.scenario(index)
+
+    assert instrumentation.snapshot()["counters"]["scenarios_simulated"] == 3
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from quant.core import BaselineAssumptions, MacroShock, ShockArrays, ShockChannel, simulate_arrays, simulate_batch
+from quant.macro_engine import simulate_scenario
+from utils.library import ScenarioLibrary
+
+
+def _batch(count: int = 300):
+    rng = np.random.default_rng(6)
+    channels = list(ShockChannel)
+    scenarios = [
+        [
+            MacroShock(
+                f"S{index}-{j}", channels[int(rng.integers(5))], float(rng.uniform(-3, 3)), int(rng.integers(1, 6))
+            )
+            for j in range(int(rng.integers(1, 3)))
+        ]
+        for index in range(count)
+    ]
+    assumptions = BaselineAssumptions(initial_inflation=3.0)
+    return scenarios, simulate_batch(ShockArrays.from_scenarios(scenarios), horizon=18, assumptions=assumptions)
+
+
+def test_bulk_insert_queries_match_the_batch(tmp_path):
+    scenarios, batch = _batch()
+    with ScenarioLibrary(tmp_path / "library.sqlite") as library:
+        ids = library.add_batch(batch, names=[f"run-{index}" for index in range(len(batch))])
+        assert len(library) == len(batch)
+        assert list(ids) == list(range(1, len(batch) + 1))
+
+        metrics = batch.metrics()
+        regimes = batch.regimes().labels()
+        supply = np.array([any(shock.channel == ShockChannel.SUPPLY for shock in shocks) for shocks in scenarios])
+        expected = np.flatnonzero((metrics["inflation_peak"] > 3.5) & (metrics["growth_trough"] < 0.5) & supply)
+        found = library.query([("inflation_peak", ">", 3.5), ("growth_trough", "<", 0.5)], channel=ShockChannel.SUPPLY)
+        assert len(expected) > 0
+        assert sorted(found["id"]) == list(ids[expected])
+        peaks = found.set_index("id").loc[ids[expected], "inflation_peak"]
+        np.testing.assert_allclose(peaks, metrics["inflation_peak"][expected])
+
+        regime = regimes[0]
+        assert library.count(regime=regime) == int(np.sum(regimes == regime))
+        ordered = library.query(order_by="output_gap_trough", limit=5)
+        assert list(ordered["output_gap_trough"]) == sorted(metrics["output_gap_trough"])[:5]
+
+        index = int(expected[0])
+        single = batch.scenario(index)
+        row = found.set_index("id").loc[ids[index]]
+        assert library.warnings(row["warnings"]) == single.warnings
+        assert library.shocks(ids[index]) == single.shocks
+        assert library.baseline(ids[index]) == batch.assumptions
+        np.testing.assert_allclose(library.paths(ids[index]), batch.paths()[index], rtol=1e-6, atol=1e-6)
+        np.testing.assert_allclose(library.paths(ids[[3, 200, 70]]), batch.paths()[[3, 200, 70]], rtol=1e-6, atol=1e-6)
+
+
+def test_single_results_append_after_a_batch():
+    _, batch = _batch(70)
+    library = ScenarioLibrary(":memory:")
+    library.add_batch(batch, store_paths=False)
+
+    arrays = simulate_arrays([MacroShock("Energy", ShockChannel.SUPPLY, 1.6, duration=5)], horizon=24)
+    frame_result = simulate_scenario([], horizon=12)
+    first = library.add(arrays, name="energy")
+    second = library.add(frame_result)
+
+    assert (first, second) == (71, 72)
+    np.testing.assert_allclose(library.paths(first)[1], arrays.columns["inflation_scenario"], rtol=1e-6)
+    assert library.query(regime=arrays.metrics["regime"], conditions=[("inflation_peak", ">=", 0)])["id"].max() == first
+    no_shock = "No active shock is configured; the scenario equals the baseline path."
+    assert library.query(warning=no_shock)["id"].tolist() == [second]
+    assert library.shocks(second) == []
+
+    with pytest.raises(KeyError, match="No stored paths for scenario 5"):
+        library.paths(5)
+    with pytest.raises(ValueError, match="Unknown metric"):
+        library.query([("peak_everything", ">", 1.0)])
+    with pytest.raises(ValueError, match="Cannot order by"):
+        library.query(order_by="name; DROP TABLE scenarios")
+    library.close()
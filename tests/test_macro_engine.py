@@ -1,3 +1,6 @@
+import json
+from pathlib import Path
+
 import pandas as pd
 import pytest
 
@@ -5,7 +8,9 @@ from quant.macro_engine import (
     BaselineAssumptions,
     MacroShock,
     ShockChannel,
+    attribution_to_long_frame,
     scenario_from_preset,
+    scenario_from_spec,
     simulate_scenario,
     result_to_long_frame,
     shocks_from_frame,
@@ -47,6 +52,18 @@ def test_long_frame_has_expected_shape():
     assert len(long_frame) == horizon * 5
 
 
+def test_attribution_long_frame_rows_sum_to_deltas():
+    shocks, horizon = scenario_from_preset("Soft landing")
+    result = simulate_scenario(shocks, horizon=horizon, attribution="shock")
+    long_frame = attribution_to_long_frame(result)
+
+    assert list(long_frame.columns) == ["date", "shock", "variable", "label", "unit", "contribution"]
+    assert len(long_frame) == len(shocks) * horizon * 5
+    totals = long_frame.groupby(["date", "variable"])["contribution"].sum()
+    deltas = result_to_long_frame(result).set_index(["date", "variable"])["delta"]
+    pd.testing.assert_series_equal(totals, deltas.loc[totals.index], check_names=False)
+
+
 def test_validation_rejects_extreme_shocks():
     shock = MacroShock("Too large", ShockChannel.DEMAND, 9.0)
 
@@ -74,3 +91,18 @@ def test_blank_editor_rows_are_ignored():
     shocks = shocks_from_frame(frame)
     assert len(shocks) == 1
     assert shocks[0].name == "Demand"
+
+
+def test_scenario_template_spec_is_parsed():
+    spec = json.loads((Path(__file__).resolve().parents[1] / "input" / "scenario_template.json").read_text(encoding="utf-8"))
+    shocks, horizon, assumptions = scenario_from_spec(spec)
+
+    assert horizon == 24
+    assert assumptions.initial_inflation == 2.4
+    assert shocks[0].channel == ShockChannel.SUPPLY
+    assert simulate_scenario(shocks, horizon=horizon, assumptions=assumptions).metrics["inflation_peak"] > 3.0
+
+
+def test_spec_with_unknown_baseline_field_is_rejected():
+    with pytest.raises(ValueError, match="Unknown baseline"):
+        scenario_from_spec({"baseline": {"inflation": 2.0}, "shocks": []})
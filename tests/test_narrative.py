@@ -1,5 +1,5 @@
 from quant.macro_engine import MacroShock, ShockChannel, simulate_scenario
-from quant.narrative import generate_analyst_note, generate_markdown_report
+from quant.narrative import generate_analyst_note, generate_markdown_report, summarize_result
 
 
 def test_analyst_note_contains_macro_sections():
@@ -20,3 +20,14 @@ def test_markdown_report_contains_shocks_and_metrics():
     assert "## Shocks" in report
     assert "Demand" in report
     assert "Peak inflation" in report
+
+
+def test_narrative_summary_matches_frame_extremes():
+    result = simulate_scenario([MacroShock("Hike", ShockChannel.MONETARY, 1.0, duration=4)], horizon=24)
+    summary = summarize_result(result)
+    frame = result.frame
+
+    assert summary.policy_peak_month == frame.loc[frame["policy_rate_scenario"].idxmax(), "date"].strftime("%b %Y")
+    assert summary.delta_min["inflation"] == frame["inflation_delta"].min()
+    assert summary.dominant_delta("policy_rate") == frame["policy_rate_delta"].max()
+    assert generate_analyst_note(result, summary) == generate_analyst_note(result)
@@ -0,0 +1,64 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from quant.nowcast import NowcastCache, nowcast, smoothed_states
+from utils import instrumentation
+from utils.export import export_nowcast
+
+
+def _realized(months: int = 240) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    trend = 1.5 + np.cumsum(0.01 * rng.standard_normal(months))
+    gap = np.zeros(months)
+    for month in range(1, months):
+        gap[month] = 0.95 * gap[month - 1] + 0.2 * rng.standard_normal()
+    core = 2.0 + np.cumsum(0.05 * rng.standard_normal(months))
+    frame = pd.DataFrame(
+        {
+            "gdp_growth": trend + 0.35 * gap + 0.1 * rng.standard_normal(months),
+            "inflation": core + 0.08 * gap + 0.1 * rng.standard_normal(months),
+            "policy_rate": 3.0,
+        },
+        index=pd.date_range("2005-01-01", periods=months, freq="MS"),
+    )
+    frame.iloc[:12, 0] = np.nan
+    frame.attrs["gap"] = gap
+    return frame
+
+
+def test_smoothed_gap_tracks_the_simulated_cycle():
+    realized = _realized()
+    states = smoothed_states(realized)
+
+    assert list(states.columns) == ["trend_growth", "output_gap", "core_inflation"]
+    assert np.corrcoef(states["output_gap"], realized.attrs["gap"])[0, 1] > 0.8
+
+
+def test_one_new_month_is_an_incremental_update_matching_a_full_refit(instrumented):
+    realized = _realized()
+    cache = NowcastCache()
+    nowcast(realized.iloc[:-1], cache=cache)
+    updated = nowcast(realized, cache=cache)
+
+    assert nowcast(realized, cache=cache) is updated
+    assert instrumentation.snapshot()["counters"] == {"nowcast_incremental_updates": 1, "cache_hits": 1}
+    refit = nowcast(realized, cache=NowcastCache())
+    np.testing.assert_allclose(
+        [updated.trend_growth, updated.output_gap, updated.inflation],
+        [refit.trend_growth, refit.output_gap, refit.inflation],
+        atol=1e-12,
+    )
+
+
+def test_nowcast_seeds_baseline_assumptions_and_dashboard_payload(tmp_path):
+    estimate = nowcast(_realized(), cache=NowcastCache())
+    assumptions = estimate.assumptions()
+
+    assert assumptions.start_date == "2025-01-01"
+    assert assumptions.initial_output_gap == estimate.output_gap
+    assert assumptions.target_inflation == 2.0
+    payload = json.loads(export_nowcast(estimate, tmp_path / "nowcast.json").read_text())
+    assert payload["as_of"] == "2024-12-01"
+    assert payload["baseline"]["initial_policy_rate"] == 3.0
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from quant.core import BaselineAssumptions, MacroShock, ShockArrays, ShockChannel, simulate_arrays, simulate_batch
+from quant.optimal_policy import MAX_MAGNITUDE, PolicyLoss, optimal_policy, optimal_policy_shocks
+
+
+def _loss(shocks: list[MacroShock], loss: PolicyLoss, horizon: int = 24) -> float:
+    columns = simulate_arrays(shocks, horizon).columns
+    inflation_gap = columns["inflation_scenario"] - BaselineAssumptions().target_inflation
+    rate_moves = np.diff(columns["policy_rate_scenario"] - columns["policy_rate_baseline"], prepend=0.0)
+    return float(
+        loss.inflation * np.sum(inflation_gap**2)
+        + loss.output_gap * np.sum(columns["output_gap_scenario"] ** 2)
+        + loss.rate_change * np.sum(rate_moves**2)
+    )
+
+
+def test_optimal_path_reproduces_its_loss_and_beats_perturbations():
+    energy = [MacroShock("Energy", ShockChannel.SUPPLY, 1.6, duration=5, persistence=0.82)]
+    loss = PolicyLoss()
+    result = optimal_policy(ShockArrays.from_scenarios([energy]), horizon=24, loss=loss)
+    policy = result.shocks(0)
+
+    assert not result.bounded[0]
+    assert all(shock.duration == 1 and shock.channel == ShockChannel.MONETARY for shock in policy)
+    assert result.loss[0] == pytest.approx(_loss(energy + policy, loss))
+    assert result.unmanaged_loss[0] == pytest.approx(_loss(energy, loss))
+    assert result.loss[0] < result.unmanaged_loss[0]
+
+    rng = np.random.default_rng(2)
+    for _ in range(5):
+        nudged = [
+            MacroShock(shock.name, shock.channel, shock.magnitude + 0.05 * rng.standard_normal(), 1, 0.75, shock.start_month)
+            for shock in policy
+        ]
+        assert _loss(energy + nudged, loss) > result.loss[0]
+
+
+def test_bounded_paths_satisfy_the_box_optimality_conditions():
+    extreme = [MacroShock("Extreme", ShockChannel.SUPPLY, 6.0, duration=24, persistence=0.98)]
+    loss = PolicyLoss(rate_change=0.01)
+    result = optimal_policy(ShockArrays.from_scenarios([extreme]), horizon=24, loss=loss)
+    impulses = result.impulses[0]
+
+    assert result.bounded[0]
+    assert np.all(np.abs(impulses) <= MAX_MAGNITUDE)
+    # Gradient of the quadratic: zero off the bounds, pointing outwards on them.
+    # Differences stay inside the box, so they are one-sided at the bounds.
+    upper, lower = impulses >= MAX_MAGNITUDE - 1e-9, impulses <= -MAX_MAGNITUDE + 1e-9
+    interior = ~(upper | lower)
+    nudge = 1e-4
+    gradient = np.array(
+        [
+            (
+                _loss(extreme + _bump(impulses, month, 0.0 if upper[month] else nudge), loss)
+                - _loss(extreme + _bump(impulses, month, 0.0 if lower[month] else -nudge), loss)
+            )
+            / (nudge if upper[month] or lower[month] else 2 * nudge)
+            for month in range(24)
+        ]
+    )
+    assert upper.any()
+    np.testing.assert_allclose(gradient[interior], 0.0, atol=1e-3)
+    assert np.all(gradient[upper] <= 1e-3)
+    assert np.all(gradient[lower] >= -1e-3)
+
+    # The combined shocks pass the engine's validation.
+    simulate_batch(result.combined(ShockArrays.from_scenarios([extreme])), horizon=24)
+
+
+def test_batch_solution_matches_single_scenario_solves():
+    scenarios = [
+        [MacroShock("Demand cooling", ShockChannel.DEMAND, -0.45, duration=4, persistence=0.70)],
+        [],
+        [MacroShock("Stress", ShockChannel.RISK, 1.2, duration=4), MacroShock("Fiscal", ShockChannel.FISCAL, 0.5)],
+    ]
+    base = ShockArrays.from_scenarios(scenarios)
+    result = optimal_policy(base, horizon=36, scenarios=3)
+    for index, shocks in enumerate(scenarios):
+        single = optimal_policy_shocks(shocks, horizon=36)
+        impulses = result.impulses[index]
+        np.testing.assert_allclose([shock.magnitude for shock in single], impulses[np.abs(impulses) > 1e-9])
+
+    combined = simulate_batch(result.combined(base), horizon=36)
+    unmanaged = simulate_batch(base, horizon=36, scenarios=3)
+    assert combined.deltas.shape == unmanaged.deltas.shape
+    with pytest.raises(ValueError, match="rate-change or impulse"):
+        PolicyLoss(rate_change=0.0)
+
+
+def _bump(impulses: np.ndarray, month: int, step: float) -> list[MacroShock]:
+    moved = impulses.copy()
+    moved[month] += step
+    return [
+        MacroShock("Policy", ShockChannel.MONETARY, float(value), duration=1, start_month=position + 1)
+        for position, value in enumerate(moved)
+        if abs(value) > 1e-9
+    ]
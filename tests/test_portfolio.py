@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant.core import ShockArrays, simulate_batch
+from quant.macro_engine import MacroShock, ShockChannel
+from quant.portfolio import (
+    book_from_frame,
+    iter_position_pnl,
+    load_positions,
+    portfolio_pnl,
+    worst_scenarios,
+)
+
+
+def _positions(count: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    return pd.DataFrame(
+        {
+            "portfolio": rng.choice(["Balanced", "Growth", "Income"], count),
+            "asset": [f"A{index}" for index in rng.integers(0, 40, count)],
+            "market_value": rng.uniform(1e3, 1e5, count),
+            "asset_class": rng.choice(["equity", "government_bond", "credit", "cash"], count),
+        }
+    )
+
+
+def test_portfolio_pnl_matches_summed_position_pnl():
+    scenarios = [
+        [MacroShock("Energy", ShockChannel.SUPPLY, 0.8, duration=3)],
+        [MacroShock("Hike", ShockChannel.MONETARY, 0.5, duration=2)],
+        [MacroShock("Stress", ShockChannel.RISK, 1.0, start_month=4)],
+    ]
+    batch = simulate_batch(ShockArrays.from_scenarios(scenarios), horizon=12)
+    book = book_from_frame(_positions())
+    pnl = portfolio_pnl(batch, book)
+
+    assert pnl.shape == (3, 12, 3)
+    summed = np.zeros_like(pnl)
+    # A tiny budget forces one scenario per chunk.
+    for chunk, block in iter_position_pnl(batch, book, max_bytes=1):
+        assert block.shape[-1] == len(book)
+        for index, _ in enumerate(book.portfolios):
+            summed[chunk, :, index] = block[..., book.portfolio_index == index].sum(axis=-1)
+    np.testing.assert_allclose(pnl, summed, rtol=1e-12)
+
+
+@pytest.mark.parametrize("measure", ["trough", "terminal"])
+def test_worst_scenarios_match_a_full_ranking(measure):
+    rng = np.random.default_rng(8)
+    deltas = rng.normal(size=(500, 5, 12))
+    book = book_from_frame(_positions())
+    ranked = worst_scenarios(deltas, book, top=4, measure=measure, max_bytes=4096)
+
+    pnl = portfolio_pnl(deltas, book)
+    values = pnl.min(axis=1) if measure == "trough" else pnl[:, -1]
+    assert len(ranked) == 4 * len(book.portfolios)
+    for index, name in enumerate(book.portfolios):
+        rows = ranked[ranked["portfolio"] == name]
+        expected = np.argsort(values[:, index])[:4]
+        assert list(rows["rank"]) == [1, 2, 3, 4]
+        assert list(rows["scenario"]) == list(expected)
+        np.testing.assert_allclose(rows["pnl"], values[expected, index])
+        months = rows["month"].to_numpy() - 1
+        np.testing.assert_allclose(pnl[rows["scenario"], months, index], rows["pnl"])
+
+
+def test_load_positions_fills_betas_from_rows_then_assets_then_classes(tmp_path):
+    frame = pd.DataFrame(
+        {
+            "portfolio": ["Core", "Core", "Core"],
+            "asset": ["Bund", "Oil", "Stocks"],
+            "market_value": [100.0, 100.0, 100.0],
+            "asset_class": ["government_bond", "commodity", "equity"],
+            "beta_policy_rate": [-8.0, np.nan, np.nan],
+        }
+    )
+    frame.to_csv(tmp_path / "book.csv", index=False)
+    betas = pd.DataFrame({"inflation": [5.0]}, index=["Oil"])
+    book = load_positions(tmp_path / "book.csv", betas=betas)
+
+    assert book.betas[0, 2] == -8.0
+    assert book.betas[0, 1] == -2.0
+    assert book.betas[1, 1] == 5.0
+    assert book.betas[2, 0] == 3.0
+    np.testing.assert_allclose(book.exposures()[0], book.betas.sum(axis=0))
+
+    with pytest.raises(ValueError, match="No betas for asset 'Gold'"):
+        book_from_frame(pd.DataFrame({"portfolio": ["Core"], "asset": ["Gold"], "market_value": [1.0]}))
+    with pytest.raises(ValueError, match="Unsupported"):
+        load_positions(tmp_path / "book.xlsx")
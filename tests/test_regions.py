@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from quant.core import BaselineAssumptions, MacroShock, ShockChannel, simulate_arrays
+from quant.regions import Region, Spillovers, regional_shock_arrays, simulate_regions
+
+
+REGIONS = [
+    Region("US", BaselineAssumptions(initial_policy_rate=4.5, trend_growth=1.8)),
+    Region("EA"),
+    Region("UK", BaselineAssumptions(target_inflation=2.0, initial_inflation=3.0)),
+]
+
+
+def test_domestic_responses_match_the_single_economy_engine():
+    shock = MacroShock("Energy", ShockChannel.SUPPLY, 1.2, duration=4, persistence=0.8)
+    result = simulate_regions(REGIONS, regional_shock_arrays(REGIONS, [[("UK", shock)]]), horizon=24)
+    single = simulate_arrays([shock], horizon=24, assumptions=REGIONS[2].assumptions)
+    uk = result.scenario(0, "UK")
+
+    for column, values in single.columns.items():
+        np.testing.assert_allclose(uk.columns[column], values, atol=1e-12)
+    assert not result.deltas[0, :2].any()
+
+
+def test_spillovers_follow_the_lagged_recursion():
+    spillovers = Spillovers.from_links(
+        ["US", "EA", "UK"],
+        {("US", "EA"): (0.3, 2), ("EA", "US"): (0.1, 3), ("EA", "UK"): (0.4, 1)},
+    )
+    shocks = regional_shock_arrays(
+        REGIONS,
+        [[("US", MacroShock("Demand", ShockChannel.DEMAND, -1.0, duration=4))], [("EA", MacroShock("Risk", ShockChannel.RISK, 0.8))]],
+    )
+    result = simulate_regions(REGIONS, shocks, spillovers, horizon=24)
+
+    expected = result.domestic.copy()
+    rows = [0, 1, 4]
+    for month in range(24):
+        for target in range(3):
+            for source in range(3):
+                lag = spillovers.lags[target, source]
+                if spillovers.weights[target, source] and month >= lag:
+                    expected[:, target, rows, month] += spillovers.weights[target, source] * expected[:, source, rows, month - lag]
+    np.testing.assert_allclose(result.deltas[..., rows, :], expected[..., rows, :], atol=1e-12)
+    assert result.spillover()[0, 1, 0, 2] < 0
+    assert not result.spillover()[..., 2, :].any()
+
+
+def test_contemporaneous_spillovers_are_rejected():
+    spillovers = Spillovers(weights=np.array([[0.0, 0.2], [0.2, 0.0]]), lags=np.zeros((2, 2), dtype=int))
+    shocks = regional_shock_arrays(REGIONS[:2], [[("US", MacroShock("Demand", ShockChannel.DEMAND, 1.0))]])
+
+    with pytest.raises(ValueError, match="at least one month"):
+        simulate_regions(REGIONS[:2], shocks, spillovers, horizon=12)
+
+
+def test_regions_must_share_a_calendar_and_cover_every_shock():
+    shocks = regional_shock_arrays(REGIONS[:2], [[], [("EA", MacroShock("Demand", ShockChannel.DEMAND, 1.0))]])
+    shifted = Region("EA", BaselineAssumptions(start_date="2027-01-01"))
+
+    with pytest.raises(ValueError, match="one start date"):
+        simulate_regions([REGIONS[0], shifted], shocks, horizon=12)
+    with pytest.raises(ValueError, match="beyond 1 scenarios"):
+        simulate_regions(REGIONS[:2], shocks, horizon=12, scenarios=1)
@@ -0,0 +1,67 @@
+import json
+
+import numpy as np
+import pytest
+
+from quant.core import BaselineAssumptions, MacroShock, ShockArrays, ShockChannel, simulate_batch
+from quant.rules import REGIME_RULES, Condition, RuleSet, load_rules
+
+
+def test_batch_classification_matches_single_scenario_metrics():
+    rng = np.random.default_rng(4)
+    channels = list(ShockChannel)
+    scenarios = [
+        [
+            MacroShock(f"S{j}", channels[int(rng.integers(5))], float(rng.uniform(-4, 4)), int(rng.integers(1, 6)))
+            for j in range(int(rng.integers(0, 3)))
+        ]
+        for _ in range(200)
+    ]
+    batch = simulate_batch(
+        ShockArrays.from_scenarios(scenarios),
+        horizon=24,
+        assumptions=BaselineAssumptions(initial_inflation=3.2, initial_output_gap=-0.8),
+        scenarios=len(scenarios),
+    )
+    regimes = batch.regimes()
+    warnings = batch.warnings()
+
+    labels = regimes.labels()
+    for index in range(len(scenarios)):
+        single = batch.scenario(index)
+        assert labels[index] == single.metrics["regime"]
+        assert warnings.matched(index) == single.warnings
+
+    counts = regimes.counts()
+    assert sum(counts.values()) == len(scenarios)
+    assert len(set(labels)) > 2
+    assert all(counts[name] <= hits for name, hits in regimes.hits().items())
+
+
+def test_custom_rules_load_from_json_and_respect_priority(tmp_path):
+    spec = {
+        "default": "Calm",
+        "rules": [
+            {"name": "Hot", "when": [["inflation_peak", ">", 3.0]]},
+            {"name": "Very hot", "priority": 5, "when": [["inflation_peak", ">", 5.0]]},
+            {"name": "Hot and weak", "priority": 1, "when": [["inflation_peak", ">", 3.0], ["growth_trough", "<", 0.0]]},
+        ],
+    }
+    (tmp_path / "desk.json").write_text(json.dumps(spec), encoding="utf-8")
+    rules = load_rules(tmp_path / "desk.json")
+
+    metrics = {"inflation_peak": np.array([2.0, 4.0, 4.0, 6.0]), "growth_trough": np.array([1.0, 1.0, -1.0, -1.0])}
+    result = rules.evaluate(metrics)
+    assert list(result.labels()) == ["Calm", "Hot", "Hot and weak", "Very hot"]
+    assert result.hits() == {"Very hot": 1, "Hot and weak": 2, "Hot": 3}
+    assert result.counts() == {"Very hot": 1, "Hot and weak": 1, "Hot": 1, "Calm": 1}
+    assert [rules.first_match({name: values[i] for name, values in metrics.items()}) for i in range(4)] == list(
+        result.labels()
+    )
+    assert RuleSet.from_dict(rules.to_dict()) == rules
+    assert RuleSet.from_dict(REGIME_RULES.to_dict()) == REGIME_RULES
+
+    with pytest.raises(ValueError, match="not supplied: growth_trough"):
+        rules.evaluate({"inflation_peak": 1.0})
+    with pytest.raises(ValueError, match="Unsupported rule operator"):
+        Condition("inflation_peak", "=>", 1.0)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from quant.core import BaselineAssumptions, PolicyRule, ShockArrays, simulate_batch
+from quant.sweep import MetricsReducer, sweep
+
+
+def _shocks(count: int, seed: int = 8) -> ShockArrays:
+    rng = np.random.default_rng(seed)
+    rows = 2 * count
+    return ShockArrays(
+        scenario=rng.permutation(np.repeat(np.arange(count), 2)),
+        channel=rng.integers(0, 5, rows),
+        magnitude=np.where(rng.random(rows) < 0.1, 0.0, rng.uniform(-3.0, 3.0, rows)),
+        duration=rng.integers(1, 6, rows),
+        persistence=rng.uniform(0.4, 0.9, rows),
+        start_month=rng.integers(1, 12, rows),
+    )
+
+
+def test_chunked_sweep_matches_the_full_batch():
+    shocks = _shocks(500)
+    assumptions = BaselineAssumptions(initial_inflation=3.0)
+    batch = simulate_batch(shocks, horizon=24, assumptions=assumptions, policy_rule=PolicyRule(), scenarios=505)
+    summary = sweep(
+        shocks, horizon=24, scenarios=505, chunk_size=64, top=7, assumptions=assumptions, policy_rule=PolicyRule()
+    )
+
+    metrics = batch.metrics()
+    assert len(summary) == 505
+    for name, values in metrics.items():
+        assert summary.metrics[name].dtype == np.float32
+        np.testing.assert_allclose(summary.metrics[name], values, rtol=1e-6, atol=1e-5)
+    assert list(summary.labels()) == list(batch.regimes().labels())
+    assert summary.regime_counts() == batch.regimes().counts()
+    assert summary.warning_hits() == batch.warnings().hits()
+    masks = batch.warnings().masks
+    for bit, label in enumerate(summary.warning_labels):
+        np.testing.assert_array_equal(summary.flagged(label), masks[bit])
+
+    worst = np.argsort(metrics["output_gap_trough"], kind="stable")[:7]
+    np.testing.assert_array_equal(summary.worst, worst)
+    np.testing.assert_allclose(summary.worst_paths, batch.paths()[worst], rtol=1e-6, atol=1e-5)
+    assert summary.nbytes < 60 * 505 + summary.worst_paths.nbytes
+
+
+def test_reducer_streams_batches_and_ranks_peaks():
+    reducer = MetricsReducer(dtype=np.float64, top=3, rank_by="inflation_peak")
+    batches = [simulate_batch(_shocks(40, seed), horizon=12, scenarios=40) for seed in (1, 2, 3)]
+    for batch in batches:
+        reducer.update(batch)
+    summary = reducer.summary()
+
+    peaks = np.concatenate([batch.metrics()["inflation_peak"] for batch in batches])
+    np.testing.assert_array_equal(summary.metrics["inflation_peak"], peaks)
+    np.testing.assert_array_equal(summary.worst, np.argsort(-peaks, kind="stable")[:3])
+    assert summary.worst_paths.shape == (3, 5, 12)
+
+    with pytest.raises(ValueError, match="share one horizon"):
+        reducer.update(simulate_batch(_shocks(40), horizon=24, scenarios=40))
+    after = reducer.summary()
+    assert len(after) == reducer.count == 120
+    np.testing.assert_array_equal(after.worst, summary.worst)
+    reducer.update(batches[0])
+    assert len(reducer.summary()) == reducer.count == 160
+    with pytest.raises(ValueError, match="Unknown rank metric"):
+        MetricsReducer(rank_by="regime")
@@ -2,14 +2,27 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from quant.macro_engine import ScenarioResult, result_to_long_frame
+import numpy as np
+
+from quant.core import DISPLAY_VARIABLES, BatchResult
+from quant.macro_engine import ScenarioResult, attribution_to_long_frame, result_to_long_frame
 from quant.narrative import generate_markdown_report
+from utils.instrumentation import increment, is_enabled, timed
+
+if TYPE_CHECKING:
+    from quant.nowcast import Nowcast
 
 
+@timed("export.export_scenario")
 def export_scenario(result: ScenarioResult, output_dir: str | Path = "output", stem: str = "scenario") -> dict[str, Path]:
-    """Write scenario data and an analyst report to disk."""
+    """Write scenario data and an analyst report to disk.
+
+    Results simulated with ``attribution`` also get a ``{stem}_attribution.csv``.
+    """
 
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -19,5 +32,73 @@ def export_scenario(result: ScenarioResult, output_dir: str | Path = "output", s
 
     result_to_long_frame(result).to_csv(csv_path, index=False)
     report_path.write_text(generate_markdown_report(result), encoding="utf-8")
+    paths = {"data": csv_path, "report": report_path}
+
+    if result.attribution is not None:
+        paths["attribution"] = output_path / f"{stem}_attribution.csv"
+        attribution_to_long_frame(result).to_csv(paths["attribution"], index=False)
+
+    if is_enabled():
+        increment("bytes_written", sum(path.stat().st_size for path in paths.values()))
+
+    return paths
+
+
+def export_nowcast(nowcast: Nowcast, path: str | Path = "web/nowcast.json") -> Path:
+    """Write nowcast baseline fields where the dashboard picks them up on load."""
+
+    assumptions = nowcast.assumptions()
+    payload = {
+        "as_of": str(nowcast.as_of.date()),
+        "version": nowcast.version,
+        "baseline": {
+            "trend_growth": round(assumptions.trend_growth, 4),
+            "initial_gdp_growth": round(assumptions.initial_gdp_growth, 4),
+            "initial_inflation": round(assumptions.initial_inflation, 4),
+            "initial_policy_rate": round(assumptions.initial_policy_rate, 4),
+            "initial_output_gap": round(assumptions.initial_output_gap, 4),
+        },
+    }
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    return output_path
+
+
+PATHS_FORMAT = "msg-paths/1"
+
+
+@timed("export.export_paths")
+def export_paths(batch: BatchResult, path: str | Path = "web/paths.bin", max_paths: int = 10_000) -> Path:
+    """Write batch scenario paths as the dashboard's binary fan-chart payload.
+
+    The file is a little-endian ``uint32`` header length, a JSON header padded
+    to four bytes, then float32 baseline levels ``(variable, month)`` followed
+    by scenario levels ``(scenario, variable, month)``. Batches larger than
+    ``max_paths`` are thinned to evenly spaced scenarios.
+    """
+
+    rows = np.arange(len(batch))
+    if len(rows) > max_paths:
+        rows = np.linspace(0, len(batch) - 1, max_paths).round().astype(np.int64)
+    header = json.dumps(
+        {
+            "format": PATHS_FORMAT,
+            "variables": DISPLAY_VARIABLES,
+            "dates": [str(date) for date in batch.dates],
+            "scenarios": len(rows),
+            "horizon": batch.deltas.shape[-1],
+        }
+    ).encode("utf-8")
+    header += b" " * (-len(header) % 4)
 
-    return {"data": csv_path, "report": report_path}
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("wb") as handle:
+        handle.write(np.uint32(len(header)).astype("<u4").tobytes())
+        handle.write(header)
+        handle.write(batch.baseline.astype("<f4").tobytes())
+        handle.write((batch.baseline + batch.deltas[rows]).astype("<f4").tobytes())
+    if is_enabled():
+        increment("bytes_written", output_path.stat().st_size)
+    return output_path
@@ -0,0 +1,198 @@
+"""Opt-in timing spans, counters and profiling hooks for the scenario pipeline.
+
+Instrumentation is disabled by default. Enable it with ``MSG_INSTRUMENT=1`` or
+``enable()``; while disabled, ``span`` returns a shared no-op object and
+``timed`` wrappers cost one flag check per call.
+
+Spans and counters are aggregated in an in-process registry (``snapshot()``).
+When the ``macro_scenario.instrumentation`` logger is set to DEBUG, every
+finished span is also emitted as a one-line JSON record.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from functools import wraps
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterator, TypeVar
+
+if TYPE_CHECKING:
+    import cProfile
+
+
+logger = logging.getLogger("macro_scenario.instrumentation")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_ENABLED = os.environ.get("MSG_INSTRUMENT", "").strip().lower() not in {"", "0", "false", "no"}
+
+
+class MetricsRegistry:
+    """Thread-safe aggregation of span timings and counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._spans: dict[str, list[float]] = {}
+        self._counters: dict[str, float] = {}
+
+    def record_span(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                self._spans[name] = [1, elapsed, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "spans": {
+                    name: {"count": int(count), "total_s": total, "mean_s": total / count, "max_s": peak}
+                    for name, (count, total, peak) in sorted(self._spans.items())
+                },
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        REGISTRY.record_span(self.name, elapsed)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps({"span": self.name, "elapsed_s": elapsed}))
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable(flag: bool = True) -> None:
+    global _ENABLED
+    _ENABLED = bool(flag)
+
+
+def disable() -> None:
+    enable(False)
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def span(name: str) -> _Span | _NullSpan:
+    """Time a block: ``with span("etl.save.hicp_ea"): ...``."""
+
+    return _Span(name) if _ENABLED else _NULL_SPAN
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorate a function so each call is recorded as a span when enabled."""
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _ENABLED:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def increment(name: str, value: float = 1) -> None:
+    if _ENABLED:
+        REGISTRY.increment(name, value)
+
+
+def snapshot() -> dict[str, Any]:
+    return REGISTRY.snapshot()
+
+
+def reset() -> None:
+    REGISTRY.reset()
+
+
+def write_snapshot(path: str | Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(snapshot(), indent=2), encoding="utf-8")
+    return path
+
+
+@contextmanager
+def profile(output: str | Path | None = None, top: int = 25) -> Iterator["cProfile.Profile"]:
+    """Capture a cProfile run of the enclosed block.
+
+    With ``output`` the raw stats are dumped to a ``.prof`` file that flamegraph
+    viewers such as snakeviz or flameprof can open; otherwise the ``top``
+    cumulative entries are printed.
+    """
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if output is not None:
+            output = Path(output)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(output))
+        else:
+            stats = pstats.Stats(profiler).sort_stats("cumulative")
+            stats.print_stats(top)
+
+
+@contextmanager
+def profile_if_requested() -> Iterator[None]:
+    """Profile the block when ``MSG_PROFILE`` names an output ``.prof`` path."""
+
+    target = os.environ.get("MSG_PROFILE", "").strip()
+    if not target:
+        yield
+        return
+    with profile(target):
+        yield
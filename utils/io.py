@@ -2,6 +2,8 @@
 import pandas as pd
 from pathlib import Path
 
+from utils.instrumentation import increment, is_enabled
+
 # Root /data directory.
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
@@ -26,6 +28,8 @@ def save_series(df: pd.DataFrame, name: str) -> None:
     # Guarda en disco
     df.to_csv(csv_path, index=False)
     df.to_pickle(pkl_path)
+    if is_enabled():
+        increment("bytes_written", csv_path.stat().st_size + pkl_path.stat().st_size)
 
     print(f"Saved {name}:")
     print(f"   - CSV: {csv_path}")
@@ -0,0 +1,390 @@
+"""Local SQLite library of simulated scenarios.
+
+Each stored scenario keeps its shocks, baseline assumptions, horizon, the
+``_scenario_metrics`` fields, regime and coherence warnings. Metric and
+regime columns are indexed, and shocks live in their own table indexed by
+channel, so filters such as "inflation_peak > 3.5 and growth_trough < 0 with
+a supply shock" resolve from indexes alone. Warnings are stored as a bitmask
+over the ``warning_labels`` table.
+
+Scenario paths are kept out of the metric rows, in a separate table of
+blocks of consecutive scenarios, read only when ``paths`` asks for them.
+Each block is float32 with its bytes shuffled by significance before zlib,
+which compresses far better than one blob per scenario. Bulk inserts run in
+one transaction per call.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+import json
+from pathlib import Path
+import sqlite3
+from typing import Iterable, Sequence
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from quant.core import (
+    CHANNEL_ORDER,
+    DISPLAY_VARIABLES,
+    SCENARIO_METRICS,
+    BaselineAssumptions,
+    BatchResult,
+    MacroShock,
+    ScenarioArrays,
+    ShockChannel,
+)
+from quant.macro_engine import ScenarioResult
+from quant.rules import OPERATORS, REGIME_RULES, WARNING_RULES
+from utils.instrumentation import increment, timed
+
+
+SCENARIO_COLUMNS = ["id", "name", "horizon", "regime", *SCENARIO_METRICS, "warnings"]
+
+# Scenarios per compressed path block.
+PATH_BLOCK = 64
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS baselines (id INTEGER PRIMARY KEY, spec TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE IF NOT EXISTS warning_labels (bit INTEGER PRIMARY KEY, label TEXT NOT NULL UNIQUE)",
+    f"""CREATE TABLE IF NOT EXISTS scenarios (
+        id INTEGER PRIMARY KEY,
+        name TEXT,
+        baseline_id INTEGER NOT NULL REFERENCES baselines(id),
+        horizon INTEGER NOT NULL,
+        regime TEXT NOT NULL,
+        {", ".join(f"{metric} REAL NOT NULL" for metric in SCENARIO_METRICS)},
+        warnings INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS shocks (
+        scenario_id INTEGER NOT NULL REFERENCES scenarios(id),
+        name TEXT NOT NULL,
+        channel INTEGER NOT NULL,
+        magnitude REAL NOT NULL,
+        duration INTEGER NOT NULL,
+        persistence REAL NOT NULL,
+        start_month INTEGER NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS path_blocks (
+        first_id INTEGER PRIMARY KEY,
+        count INTEGER NOT NULL,
+        horizon INTEGER NOT NULL,
+        data BLOB NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS scenarios_regime ON scenarios (regime)",
+    *(f"CREATE INDEX IF NOT EXISTS scenarios_{metric} ON scenarios ({metric})" for metric in SCENARIO_METRICS),
+    "CREATE INDEX IF NOT EXISTS shocks_channel ON shocks (channel, scenario_id)",
+    "CREATE INDEX IF NOT EXISTS shocks_scenario ON shocks (scenario_id)",
+]
+
+
+class ScenarioLibrary:
+    """Scenario store in one SQLite file; ``":memory:"`` keeps it in RAM."""
+
+    def __init__(self, path: str | Path = "output/scenarios.sqlite") -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(str(path))
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        with self._connection:
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+
+    def __enter__(self) -> "ScenarioLibrary":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def add(self, result: ScenarioResult | ScenarioArrays, name: str | None = None, store_paths: bool = True) -> int:
+        """Store one simulated scenario and return its id."""
+
+        source = result.columns if isinstance(result, ScenarioArrays) else result.frame
+        paths = np.stack([np.asarray(source[f"{variable}_scenario"], dtype=float) for variable in DISPLAY_VARIABLES])
+        scenario_id = self._next_id()
+        with self._connection:
+            warnings = self._warning_bits(result.warnings)
+            self._connection.execute(
+                f"INSERT INTO scenarios VALUES ({', '.join('?' * (len(SCENARIO_COLUMNS) + 1))})",
+                (
+                    scenario_id,
+                    name,
+                    self._baseline_id(result.baseline),
+                    paths.shape[-1],
+                    str(result.metrics["regime"]),
+                    *(float(result.metrics[metric]) for metric in SCENARIO_METRICS),
+                    warnings,
+                ),
+            )
+            self._connection.executemany(
+                "INSERT INTO shocks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        scenario_id,
+                        shock.name,
+                        CHANNEL_ORDER.index(shock.channel),
+                        shock.magnitude,
+                        shock.duration,
+                        shock.persistence,
+                        shock.start_month,
+                    )
+                    for shock in result.shocks
+                ],
+            )
+            if store_paths:
+                self._connection.execute(
+                    "INSERT INTO path_blocks VALUES (?, 1, ?, ?)", (scenario_id, paths.shape[-1], _pack(paths[None]))
+                )
+        increment("library_rows_written")
+        return scenario_id
+
+    @timed("library.add_batch")
+    def add_batch(
+        self,
+        batch: BatchResult,
+        names: Sequence[str] | None = None,
+        store_paths: bool = True,
+    ) -> np.ndarray:
+        """Store every scenario of a batch in one transaction; returns their ids.
+
+        Metrics, regimes and warnings are computed for the whole batch at once.
+        """
+
+        count = len(batch)
+        if names is not None and len(names) != count:
+            raise ValueError("Provide one name per scenario.")
+        metrics = batch.metrics()
+        regimes = REGIME_RULES.evaluate(metrics).labels()
+        flags = WARNING_RULES.evaluate(metrics)
+        start = self._next_id()
+        ids = start + np.arange(count, dtype=np.int64)
+
+        with self._connection:
+            warnings = self._warning_mask(flags.names, flags.masks)
+            baseline_id = self._baseline_id(batch.assumptions)
+            horizon = batch.deltas.shape[-1]
+            columns = [
+                ids.tolist(),
+                list(names) if names is not None else [None] * count,
+                [baseline_id] * count,
+                [horizon] * count,
+                regimes.tolist(),
+                *(metrics[metric].tolist() for metric in SCENARIO_METRICS),
+                warnings.tolist(),
+            ]
+            self._connection.executemany(
+                f"INSERT INTO scenarios VALUES ({', '.join('?' * len(columns))})",
+                zip(*columns),
+            )
+
+            shocks = batch.shocks
+            active = (np.abs(shocks.magnitude) > 1e-9) & (shocks.scenario < count)
+            shock_names = (
+                shocks.names[active].tolist()
+                if shocks.names is not None
+                else [CHANNEL_ORDER[channel].value for channel in shocks.channel[active]]
+            )
+            self._connection.executemany(
+                "INSERT INTO shocks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                zip(
+                    (start + shocks.scenario[active]).tolist(),
+                    shock_names,
+                    shocks.channel[active].tolist(),
+                    shocks.magnitude[active].tolist(),
+                    shocks.duration[active].tolist(),
+                    shocks.persistence[active].tolist(),
+                    shocks.start_month[active].tolist(),
+                ),
+            )
+
+            if store_paths:
+                self._connection.executemany(
+                    "INSERT INTO path_blocks VALUES (?, ?, ?, ?)", _packed_blocks(batch, start)
+                )
+        # Refresh planner statistics once the table has grown noticeably.
+        if count * 10 >= len(self):
+            with self._connection:
+                self._connection.execute("ANALYZE")
+        increment("library_rows_written", count)
+        return ids
+
+    @timed("library.query")
+    def query(
+        self,
+        conditions: Iterable[tuple[str, str, float]] = (),
+        regime: str | None = None,
+        channel: ShockChannel | str | None = None,
+        warning: str | None = None,
+        order_by: str | None = None,
+        descending: bool = False,
+        limit: int | None = None,
+    ) -> pd.DataFrame:
+        """Scenario rows matching every filter, without paths.
+
+        ``conditions`` are ``(metric, operator, threshold)`` triples in the
+        ``quant.rules`` syntax; ``channel`` keeps scenarios with at least one
+        shock in that channel and ``warning`` those raising that warning.
+        """
+
+        sql, parameters = self._select(", ".join(SCENARIO_COLUMNS), conditions, regime, channel, warning)
+        if order_by is not None:
+            if order_by not in SCENARIO_COLUMNS:
+                raise ValueError(f"Cannot order by {order_by!r}.")
+            sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(int(limit))
+        rows = self._connection.execute(sql, parameters).fetchall()
+        return pd.DataFrame.from_records(rows, columns=SCENARIO_COLUMNS)
+
+    def count(
+        self,
+        conditions: Iterable[tuple[str, str, float]] = (),
+        regime: str | None = None,
+        channel: ShockChannel | str | None = None,
+        warning: str | None = None,
+    ) -> int:
+        """Number of scenarios ``query`` would return for the same filters."""
+
+        sql, parameters = self._select("COUNT(*)", conditions, regime, channel, warning)
+        return self._connection.execute(sql, parameters).fetchone()[0]
+
+    def paths(self, scenario_ids: int | Sequence[int]) -> np.ndarray:
+        """Scenario levels ``(variable, month)``, or ``(scenario, variable, month)`` for a list of ids.
+
+        Each path block is read and decompressed once per call.
+        """
+
+        single = np.ndim(scenario_ids) == 0
+        ids = [int(scenario_ids)] if single else [int(value) for value in scenario_ids]
+        blocks: dict[int, np.ndarray] = {}
+        stacked = []
+        for value in ids:
+            row = self._connection.execute(
+                "SELECT first_id, count, horizon FROM path_blocks WHERE first_id <= ? ORDER BY first_id DESC LIMIT 1",
+                (value,),
+            ).fetchone()
+            if row is None or value >= row[0] + row[1]:
+                raise KeyError(f"No stored paths for scenario {value}")
+            first, count, horizon = row
+            if first not in blocks:
+                blob = self._connection.execute("SELECT data FROM path_blocks WHERE first_id = ?", (first,)).fetchone()
+                blocks[first] = _unpack(blob[0], count, horizon)
+            stacked.append(blocks[first][value - first])
+        if single:
+            return stacked[0]
+        return np.stack(stacked) if stacked else np.empty((0, len(DISPLAY_VARIABLES), 0))
+
+    def shocks(self, scenario_id: int) -> list[MacroShock]:
+        rows = self._connection.execute(
+            "SELECT name, channel, magnitude, duration, persistence, start_month FROM shocks WHERE scenario_id = ?",
+            (int(scenario_id),),
+        ).fetchall()
+        return [
+            MacroShock(name, CHANNEL_ORDER[channel], magnitude, duration, persistence, start_month)
+            for name, channel, magnitude, duration, persistence, start_month in rows
+        ]
+
+    def baseline(self, scenario_id: int) -> BaselineAssumptions:
+        row = self._connection.execute(
+            "SELECT spec FROM baselines JOIN scenarios ON scenarios.baseline_id = baselines.id WHERE scenarios.id = ?",
+            (int(scenario_id),),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown scenario {scenario_id}")
+        return BaselineAssumptions(**json.loads(row[0]))
+
+    def warnings(self, mask: int) -> list[str]:
+        """Decode a ``warnings`` bitmask from ``query`` into warning texts."""
+
+        labels = self._connection.execute("SELECT bit, label FROM warning_labels ORDER BY bit").fetchall()
+        return [label for bit, label in labels if int(mask) >> bit & 1]
+
+    def _select(
+        self,
+        columns: str,
+        conditions: Iterable[tuple[str, str, float]],
+        regime: str | None,
+        channel: ShockChannel | str | None,
+        warning: str | None,
+    ) -> tuple[str, list[object]]:
+        clauses: list[str] = []
+        parameters: list[object] = []
+        for metric, comparison, threshold in conditions:
+            if metric not in SCENARIO_METRICS:
+                raise ValueError(f"Unknown metric: {metric}")
+            if comparison not in OPERATORS:
+                raise ValueError(f"Unsupported operator: {comparison}")
+            clauses.append(f"{metric} {'=' if comparison == '==' else comparison} ?")
+            parameters.append(float(threshold))
+        if regime is not None:
+            clauses.append("regime = ?")
+            parameters.append(regime)
+        if channel is not None:
+            clauses.append("id IN (SELECT scenario_id FROM shocks WHERE channel = ?)")
+            parameters.append(CHANNEL_ORDER.index(ShockChannel(channel)))
+        if warning is not None:
+            bit = self._connection.execute("SELECT bit FROM warning_labels WHERE label = ?", (warning,)).fetchone()
+            clauses.append("warnings & ? != 0")
+            parameters.append(1 << bit[0] if bit else 0)
+        sql = f"SELECT {columns} FROM scenarios"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return sql, parameters
+
+    def _next_id(self) -> int:
+        return self._connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM scenarios").fetchone()[0]
+
+    def _baseline_id(self, assumptions: BaselineAssumptions) -> int:
+        spec = json.dumps(asdict(assumptions), sort_keys=True)
+        self._connection.execute("INSERT OR IGNORE INTO baselines (spec) VALUES (?)", (spec,))
+        return self._connection.execute("SELECT id FROM baselines WHERE spec = ?", (spec,)).fetchone()[0]
+
+    def _bits(self, labels: Sequence[str]) -> list[int]:
+        known = dict(self._connection.execute("SELECT label, bit FROM warning_labels").fetchall())
+        for label in labels:
+            if label not in known:
+                known[label] = len(known)
+                if known[label] >= 63:
+                    raise ValueError("The library supports at most 63 distinct warnings.")
+                self._connection.execute("INSERT INTO warning_labels VALUES (?, ?)", (known[label], label))
+        return [known[label] for label in labels]
+
+    def _warning_bits(self, warnings: Sequence[str]) -> int:
+        return sum(1 << bit for bit in set(self._bits(warnings)))
+
+    def _warning_mask(self, labels: Sequence[str], masks: np.ndarray) -> np.ndarray:
+        bits = np.array(self._bits(labels), dtype=np.int64)
+        if not len(bits):
+            return np.zeros(masks.shape[1], dtype=np.int64)
+        return (masks.astype(np.int64) << bits[:, None]).sum(axis=0)
+
+
+def _pack(paths: np.ndarray) -> bytes:
+    """Compress ``(scenario, variable, month)`` levels, grouping bytes by significance."""
+
+    raw = np.ascontiguousarray(paths, dtype=np.float32).view(np.uint8).reshape(len(paths), -1, 4)
+    return zlib.compress(np.ascontiguousarray(raw.transpose(2, 1, 0)).tobytes(), 1)
+
+
+def _unpack(blob: bytes, count: int, horizon: int) -> np.ndarray:
+    raw = np.frombuffer(zlib.decompress(blob), dtype=np.uint8).reshape(4, len(DISPLAY_VARIABLES) * horizon, count)
+    levels = np.ascontiguousarray(raw.transpose(2, 1, 0)).view(np.float32)
+    return levels.reshape(count, len(DISPLAY_VARIABLES), horizon).astype(float)
+
+
+def _packed_blocks(batch: BatchResult, start: int) -> Iterable[tuple[int, int, int, bytes]]:
+    horizon = batch.deltas.shape[-1]
+    for first in range(0, len(batch), PATH_BLOCK):
+        levels = batch.baseline + batch.deltas[first : first + PATH_BLOCK]
+        yield start + first, len(levels), horizon, _pack(levels)
@@ -10,6 +10,8 @@ const VARIABLES = {
 
 const DISPLAY_VARIABLES = ["gdp_growth", "inflation", "policy_rate", "real_rate", "output_gap"];
 
+const ATTRIBUTION_COLORS = ["#19d9ff", "#ff9f1a", "#22ff72", "#ff13d1", "#f4e04d", "#8f7bff", "#ff5c5c", "#d7dde0"];
+
 const EUR_FORMAT = new Intl.NumberFormat("es-ES", {
   style: "currency",
   currency: "EUR",
@@ -118,6 +120,9 @@ let state = {
   shocks: structuredClone(PRESETS["Energy price shock"].shocks),
   baseline: { ...BASELINE },
   selectedVariables: ["gdp_growth", "inflation", "policy_rate", "real_rate"],
+  impactMode: "lines",
+  impactVariable: "inflation",
+  fan: { source: "draws", draws: 5000, variable: "inflation", view: "both", batch: null, cache: null },
   result: null,
 };
 
@@ -127,11 +132,59 @@ function init() {
   hydratePresetSelect();
   hydrateBaselineInputs();
   hydrateVariableToggles();
+  hydrateImpactControls();
+  hydrateFanControls();
   bindGlobalEvents();
   renderStockTicker(MARKET_TICKER);
   updateClock();
   setInterval(updateClock, 1000);
   renderAll();
+  loadNowcast();
+  loadPathPayload();
+}
+
+// Optional nowcast written by utils.export.export_nowcast; the hand-set baseline stays when it is absent.
+async function loadNowcast() {
+  try {
+    const response = await fetch("nowcast.json", { cache: "no-cache" });
+    if (!response.ok) return;
+    const payload = await response.json();
+    for (const [key, value] of Object.entries(payload.baseline || {})) {
+      if (key in BASELINE && Number.isFinite(Number(value))) state.baseline[key] = Number(value);
+    }
+    hydrateBaselineValues();
+    renderAll();
+  } catch (error) {
+    // Static hosting without a nowcast file, or opened from file://.
+  }
+}
+
+// Optional batch written by utils.export.export_paths; the fan tab falls back to Monte Carlo draws.
+async function loadPathPayload() {
+  try {
+    const response = await fetch("paths.bin", { cache: "no-cache" });
+    if (!response.ok) return;
+    state.fan.batch = parsePathPayload(await response.arrayBuffer());
+    $("fanSource").querySelector('option[value="batch"]').disabled = false;
+  } catch (error) {
+    // Static hosting without an exported batch, or opened from file://.
+  }
+}
+
+// Layout: uint32 header length, JSON header padded to 4 bytes, float32 baseline
+// (variable, month), then float32 scenario levels (scenario, variable, month).
+function parsePathPayload(buffer) {
+  const size = new DataView(buffer).getUint32(0, true);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, size)));
+  const cells = header.variables.length * header.horizon;
+  return {
+    count: header.scenarios,
+    horizon: header.horizon,
+    variables: header.variables,
+    dates: header.dates.map((date) => Date.parse(date)),
+    baseline: new Float32Array(buffer, 4 + size, cells),
+    paths: new Float32Array(buffer, 4 + size + 4 * cells, header.scenarios * cells),
+  };
 }
 
 function hydratePresetSelect() {
@@ -140,23 +193,30 @@ function hydratePresetSelect() {
   select.value = state.preset;
 }
 
+const BASELINE_INPUTS = {
+  trendGrowth: "trend_growth",
+  initialGrowth: "initial_gdp_growth",
+  initialInflation: "initial_inflation",
+  targetInflation: "target_inflation",
+  initialPolicy: "initial_policy_rate",
+  neutralReal: "neutral_real_rate",
+  initialGap: "initial_output_gap",
+};
+
 function hydrateBaselineInputs() {
-  const map = {
-    trendGrowth: "trend_growth",
-    initialGrowth: "initial_gdp_growth",
-    initialInflation: "initial_inflation",
-    targetInflation: "target_inflation",
-    initialPolicy: "initial_policy_rate",
-    neutralReal: "neutral_real_rate",
-    initialGap: "initial_output_gap",
-  };
-  for (const [inputId, key] of Object.entries(map)) {
-    $(inputId).value = state.baseline[key];
+  for (const [inputId, key] of Object.entries(BASELINE_INPUTS)) {
     $(inputId).addEventListener("input", (event) => {
       state.baseline[key] = Number(event.target.value);
       renderAll();
     });
   }
+  hydrateBaselineValues();
+}
+
+function hydrateBaselineValues() {
+  for (const [inputId, key] of Object.entries(BASELINE_INPUTS)) {
+    $(inputId).value = state.baseline[key];
+  }
 }
 
 function hydrateVariableToggles() {
@@ -174,6 +234,38 @@ function hydrateVariableToggles() {
   });
 }
 
+function hydrateImpactControls() {
+  $("impactVariable").innerHTML = DISPLAY_VARIABLES.map((variable) => `<option value="${variable}">${VARIABLES[variable].label}</option>`).join("");
+  $("impactVariable").value = state.impactVariable;
+  $("impactMode").value = state.impactMode;
+
+  $("impactMode").addEventListener("change", (event) => {
+    state.impactMode = event.target.value;
+    $("impactVariable").disabled = state.impactMode === "lines";
+    renderCharts();
+  });
+  $("impactVariable").addEventListener("change", (event) => {
+    state.impactVariable = event.target.value;
+    renderCharts();
+  });
+}
+
+function hydrateFanControls() {
+  $("fanVariable").innerHTML = DISPLAY_VARIABLES.map((variable) => `<option value="${variable}">${VARIABLES[variable].label}</option>`).join("");
+  $("fanVariable").value = state.fan.variable;
+  $("fanDraws").value = String(state.fan.draws);
+  $("fanView").value = state.fan.view;
+
+  const controls = { fanSource: "source", fanDraws: "draws", fanVariable: "variable", fanView: "view" };
+  for (const [inputId, key] of Object.entries(controls)) {
+    $(inputId).addEventListener("change", (event) => {
+      state.fan[key] = key === "draws" ? Number(event.target.value) : event.target.value;
+      $("fanDraws").disabled = state.fan.source === "batch";
+      renderFanChart();
+    });
+  }
+}
+
 function bindGlobalEvents() {
   $("presetSelect").addEventListener("change", (event) => {
     const preset = PRESETS[event.target.value];
@@ -279,9 +371,17 @@ function renderShockList() {
 
 function simulateScenario(shocks, horizon, baseline) {
   const frame = baselinePath(horizon, baseline);
-  const contributions = Object.fromEntries(DISPLAY_VARIABLES.map((variable) => [variable, Array(horizon).fill(0)]));
-
-  shocks.filter((shock) => Math.abs(Number(shock.magnitude || 0)) > 1e-9).forEach((shock) => applyShock(contributions, normalizeShock(shock), horizon));
+  const contributions = emptyContributions(horizon);
+
+  // Each shock keeps its own block so the impact tab can stack per-shock bars.
+  const attribution = shocks.filter((shock) => Math.abs(Number(shock.magnitude || 0)) > 1e-9).map((shock) => {
+    const normalized = normalizeShock(shock);
+    const block = emptyContributions(horizon);
+    applyShock(block, normalized, horizon);
+    block.real_rate = block.policy_rate.map((value, index) => value - block.inflation[index]);
+    DISPLAY_VARIABLES.forEach((variable) => block[variable].forEach((value, index) => { contributions[variable][index] += value; }));
+    return { shock: normalized, contributions: block };
+  });
 
   for (const variable of DISPLAY_VARIABLES) {
     if (variable === "real_rate") continue;
@@ -296,9 +396,30 @@ function simulateScenario(shocks, horizon, baseline) {
     row.real_rate_delta = row.real_rate_scenario - row.real_rate_baseline;
   });
 
-  const metrics = scenarioMetrics(frame);
-  const warnings = coherenceWarnings(frame, shocks);
-  return { frame, shocks, baseline, metrics, warnings };
+  const values = ruleMetrics(frame, shocks);
+  const metrics = scenarioMetrics(values);
+  const warnings = coherenceWarnings(values);
+  return { frame, shocks, baseline, metrics, warnings, attribution };
+}
+
+function emptyContributions(horizon) {
+  return Object.fromEntries(DISPLAY_VARIABLES.map((variable) => [variable, Array(horizon).fill(0)]));
+}
+
+function attributionGroups(attribution, by) {
+  if (by === "shock") {
+    return attribution.map(({ shock, contributions }) => ({ label: shock.name, contributions }));
+  }
+  const groups = new Map();
+  attribution.forEach(({ shock, contributions }) => {
+    const group = groups.get(shock.channel);
+    if (!group) {
+      groups.set(shock.channel, { label: shock.channel, contributions: structuredClone(contributions) });
+      return;
+    }
+    DISPLAY_VARIABLES.forEach((variable) => contributions[variable].forEach((value, index) => { group.contributions[variable][index] += value; }));
+  });
+  return CHANNELS.filter((channel) => groups.has(channel)).map((channel) => groups.get(channel));
 }
 
 function baselinePath(horizon, baseline) {
@@ -357,39 +478,77 @@ function applyShock(contributions, shock, horizon) {
   }
 }
 
-function scenarioMetrics(frame) {
-  const inflationPeak = max(frame, "inflation_scenario");
-  const inflationPeakDelta = max(frame, "inflation_delta");
-  const growthTrough = min(frame, "gdp_growth_scenario");
-  const growthTroughDelta = min(frame, "gdp_growth_delta");
-  const policyPeak = max(frame, "policy_rate_scenario");
-  const realRatePeak = max(frame, "real_rate_scenario");
-  const outputGapTrough = min(frame, "output_gap_scenario");
+// Mirrors RULE_METRICS in quant/core.py and the rule tables in quant/rules.py,
+// in the RuleSet.to_dict layout with rules listed in priority order.
+const RULE_METRICS = {
+  inflation_peak: ["inflation_scenario", "max"],
+  inflation_peak_delta: ["inflation_delta", "max"],
+  growth_trough: ["gdp_growth_scenario", "min"],
+  growth_trough_delta: ["gdp_growth_delta", "min"],
+  policy_peak: ["policy_rate_scenario", "max"],
+  policy_peak_delta: ["policy_rate_delta", "max"],
+  real_rate_peak: ["real_rate_scenario", "max"],
+  output_gap_trough: ["output_gap_scenario", "min"],
+};
+
+const RULE_OPERATORS = {
+  ">": (value, threshold) => value > threshold,
+  ">=": (value, threshold) => value >= threshold,
+  "<": (value, threshold) => value < threshold,
+  "<=": (value, threshold) => value <= threshold,
+  "==": (value, threshold) => value === threshold,
+  "!=": (value, threshold) => value !== threshold,
+};
 
-  let regime = "Contained adjustment";
-  if (inflationPeak >= 3.5 && outputGapTrough <= -1.0) regime = "Stagflation stress";
-  else if (growthTrough < 0.0) regime = "Recession risk";
-  else if (inflationPeakDelta > 0.7) regime = "Inflation pressure";
-  else if (realRatePeak > 2.0) regime = "Restrictive policy";
+const REGIME_RULES = {
+  default: "Contained adjustment",
+  rules: [
+    { name: "Stagflation stress", when: [["inflation_peak", ">=", 3.5], ["output_gap_trough", "<=", -1.0]] },
+    { name: "Recession risk", when: [["growth_trough", "<", 0.0]] },
+    { name: "Inflation pressure", when: [["inflation_peak_delta", ">", 0.7]] },
+    { name: "Restrictive policy", when: [["real_rate_peak", ">", 2.0]] },
+  ],
+};
+
+const WARNING_RULES = {
+  default: null,
+  rules: [
+    { name: "Inflation rises materially while the policy path barely responds.", when: [["inflation_peak_delta", ">", 0.7], ["policy_peak_delta", "<", 0.05]] },
+    { name: "The scenario combines above-baseline inflation with a negative output gap.", when: [["inflation_peak_delta", ">", 0.7], ["output_gap_trough", "<", -1.0]] },
+    { name: "Real rates enter a clearly restrictive zone and activity weakens.", when: [["real_rate_peak", ">", 2.5], ["growth_trough_delta", "<", -0.5]] },
+    { name: "The output gap falls below -2%, so recession risk dominates the scenario.", when: [["output_gap_trough", "<", -2.0]] },
+    { name: "No active shock is configured; the scenario equals the baseline path.", when: [["shock_count", "==", 0]] },
+  ],
+};
 
-  return { regime, inflationPeak, inflationPeakDelta, growthTrough, growthTroughDelta, policyPeak, realRatePeak, outputGapTrough };
+function ruleMetrics(frame, shocks) {
+  const values = Object.fromEntries(
+    Object.entries(RULE_METRICS).map(([name, [column, reduction]]) => [name, reduction === "max" ? max(frame, column) : min(frame, column)]),
+  );
+  values.shock_count = shocks.length;
+  return values;
 }
 
-function coherenceWarnings(frame, shocks) {
-  const warnings = [];
-  const inflationDeltaPeak = max(frame, "inflation_delta");
-  const policyDeltaPeak = max(frame, "policy_rate_delta");
-  const growthDeltaTrough = min(frame, "gdp_growth_delta");
-  const outputGapTrough = min(frame, "output_gap_scenario");
-  const realRatePeak = max(frame, "real_rate_scenario");
+function ruleHolds(rule, values) {
+  return rule.when.every(([metric, operator, threshold]) => RULE_OPERATORS[operator](values[metric], threshold));
+}
 
-  if (inflationDeltaPeak > 0.7 && policyDeltaPeak < 0.05) warnings.push("Inflation rises materially while the policy path barely responds.");
-  if (inflationDeltaPeak > 0.7 && outputGapTrough < -1.0) warnings.push("The scenario combines above-baseline inflation with a negative output gap.");
-  if (realRatePeak > 2.5 && growthDeltaTrough < -0.5) warnings.push("Real rates enter a clearly restrictive zone and activity weakens.");
-  if (outputGapTrough < -2.0) warnings.push("The output gap falls below -2%, so recession risk dominates the scenario.");
-  if (shocks.length === 0) warnings.push("No active shock is configured; the scenario equals the baseline path.");
+function scenarioMetrics(values) {
+  const match = REGIME_RULES.rules.find((rule) => ruleHolds(rule, values));
+  return {
+    regime: match ? match.name : REGIME_RULES.default,
+    inflationPeak: values.inflation_peak,
+    inflationPeakDelta: values.inflation_peak_delta,
+    growthTrough: values.growth_trough,
+    growthTroughDelta: values.growth_trough_delta,
+    policyPeak: values.policy_peak,
+    realRatePeak: values.real_rate_peak,
+    outputGapTrough: values.output_gap_trough,
+  };
+}
 
-  return warnings;
+function coherenceWarnings(values) {
+  return WARNING_RULES.rules.filter((rule) => ruleHolds(rule, values)).map((rule) => rule.name);
 }
 
 function renderMetrics() {
@@ -497,15 +656,171 @@ function renderCharts() {
 
   Plotly.react("pathsChart", traces, chartLayout("Macro paths"), { responsive: true, displayModeBar: false });
 
-  const deltaTraces = DISPLAY_VARIABLES.map((variable) => ({
+  renderImpactChart(frame, dates);
+  renderFanChart();
+}
+
+function renderImpactChart(frame, dates) {
+  const zeroLine = { type: "line", xref: "paper", x0: 0, x1: 1, y0: 0, y1: 0, line: { color: "#9ba59d", width: 1 } };
+
+  if (state.impactMode === "lines") {
+    const deltaTraces = DISPLAY_VARIABLES.map((variable) => ({
+      x: dates,
+      y: frame.map((row) => row[`${variable}_delta`]),
+      name: `${VARIABLES[variable].label} (${VARIABLES[variable].unit})`,
+      type: "scatter",
+      mode: "lines",
+      line: { color: VARIABLES[variable].color, width: 2.6 },
+    }));
+    Plotly.react("impactChart", deltaTraces, { ...chartLayout("Deviation from baseline"), shapes: [zeroLine] }, { responsive: true, displayModeBar: false });
+    return;
+  }
+
+  const variable = state.impactVariable;
+  const info = VARIABLES[variable];
+  const barTraces = attributionGroups(state.result.attribution, state.impactMode).map((group, index) => ({
+    x: dates,
+    y: group.contributions[variable],
+    name: group.label,
+    type: "bar",
+    marker: { color: ATTRIBUTION_COLORS[index % ATTRIBUTION_COLORS.length] },
+  }));
+  barTraces.push({
     x: dates,
     y: frame.map((row) => row[`${variable}_delta`]),
-    name: `${VARIABLES[variable].label} (${VARIABLES[variable].unit})`,
+    name: "Total deviation",
     type: "scatter",
     mode: "lines",
-    line: { color: VARIABLES[variable].color, width: 2.6 },
-  }));
-  Plotly.react("impactChart", deltaTraces, { ...chartLayout("Deviation from baseline"), shapes: [{ type: "line", xref: "paper", x0: 0, x1: 1, y0: 0, y1: 0, line: { color: "#9ba59d", width: 1 } }] }, { responsive: true, displayModeBar: false });
+    line: { color: info.color, width: 2.6 },
+  });
+
+  const layout = { ...chartLayout(`${info.label} deviation by ${state.impactMode} (${info.unit})`), barmode: "relative", bargap: 0.15, shapes: [zeroLine] };
+  Plotly.react("impactChart", barTraces, layout, { responsive: true, displayModeBar: false });
+}
+
+// Spaghetti lines are thinned to at most FAN_MAX_DRAWN paths; the bands always use every path.
+const FAN_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95];
+const FAN_MAX_DRAWN = 2500;
+const FAN_MAGNITUDE_SPREAD = 0.35;
+
+function renderFanChart() {
+  if (!$("fanTab").classList.contains("active")) return;
+  const payload = fanPayload();
+  const variable = state.fan.variable;
+  const info = VARIABLES[variable];
+  const row = payload.variables.indexOf(variable);
+  const dates = payload.dates;
+  const traces = [];
+
+  if (state.fan.view !== "fan") {
+    traces.push(pathTrace(payload, row, info.color));
+  }
+  if (state.fan.view !== "paths") {
+    const [p5, p25, p50, p75, p95] = pathQuantiles(payload, row, FAN_QUANTILES);
+    const band = (lower, upper, name, alpha) => [
+      { x: dates, y: lower, type: "scatter", mode: "lines", line: { width: 0 }, showlegend: false, name: `${name} low` },
+      { x: dates, y: upper, type: "scatter", mode: "lines", line: { width: 0 }, fill: "tonexty", fillcolor: rgba(info.color, alpha), name: `${name} high` },
+    ];
+    traces.push(...band(p5, p95, "5-95%", 0.18), ...band(p25, p75, "25-75%", 0.32));
+    traces.push({ x: dates, y: p50, name: "Median", type: "scatter", mode: "lines", line: { color: info.color, width: 2.7 } });
+  }
+  traces.push({
+    x: dates,
+    y: payload.baseline.subarray(row * payload.horizon, (row + 1) * payload.horizon),
+    name: "Baseline",
+    type: "scatter",
+    mode: "lines",
+    line: { color: "#d7dde0", width: 1.6, dash: "dot" },
+  });
+
+  const drawn = Math.ceil(payload.count / Math.max(1, Math.ceil(payload.count / FAN_MAX_DRAWN)));
+  const source = state.fan.source === "batch" && state.fan.batch ? "exported batch scenarios" : "Monte Carlo draws";
+  $("fanSummary").textContent = `${payload.count.toLocaleString("en-US")} ${source}; ${drawn.toLocaleString("en-US")} paths drawn.`;
+  const base = chartLayout(`${info.label} distribution (${info.unit})`);
+  const layout = { ...base, xaxis: { ...base.xaxis, type: "date" } };
+  Plotly.react("fanChart", traces, layout, { responsive: true, displayModeBar: false, scrollZoom: true });
+}
+
+function fanPayload() {
+  if (state.fan.source === "batch" && state.fan.batch) return state.fan.batch;
+  const key = JSON.stringify([state.shocks, state.horizon, state.baseline, state.fan.draws]);
+  if (state.fan.cache?.key !== key) {
+    state.fan.cache = { key, payload: monteCarloPaths(state.shocks, state.horizon, state.baseline, state.fan.draws) };
+  }
+  return state.fan.cache.payload;
+}
+
+// Draws rescale every shock magnitude by (1 + spread * z); paths share the payload layout of parsePathPayload.
+function monteCarloPaths(shocks, horizon, baseline, count) {
+  const frame = baselinePath(horizon, baseline);
+  const cells = DISPLAY_VARIABLES.length * horizon;
+  const base = new Float32Array(cells);
+  DISPLAY_VARIABLES.forEach((variable, row) => frame.forEach((point, t) => { base[row * horizon + t] = point[`${variable}_baseline`]; }));
+
+  const active = shocks.filter((shock) => Math.abs(Number(shock.magnitude || 0)) > 1e-9).map(normalizeShock);
+  const normal = seededNormal(20260515);
+  const [policy, inflation, real] = ["policy_rate", "inflation", "real_rate"].map((variable) => DISPLAY_VARIABLES.indexOf(variable) * horizon);
+  const paths = new Float32Array(count * cells);
+  for (let draw = 0; draw < count; draw += 1) {
+    const offset = draw * cells;
+    const path = paths.subarray(offset, offset + cells);
+    const contributions = Object.fromEntries(DISPLAY_VARIABLES.map((variable, row) => [variable, path.subarray(row * horizon, (row + 1) * horizon)]));
+    active.forEach((shock) => {
+      const magnitude = clamp(shock.magnitude * (1 + FAN_MAGNITUDE_SPREAD * normal()), -6, 6);
+      applyShock(contributions, { ...shock, magnitude }, horizon);
+    });
+    for (let index = 0; index < cells; index += 1) path[index] += base[index];
+    for (let t = 0; t < horizon; t += 1) path[real + t] = path[policy + t] - path[inflation + t];
+  }
+  return { count, horizon, variables: DISPLAY_VARIABLES, dates: frame.map((point) => point.date.getTime()), baseline: base, paths };
+}
+
+// One scattergl trace with NaN breaks between paths, thinned by a fixed stride.
+function pathTrace(payload, row, color) {
+  const { count, horizon, paths } = payload;
+  const cells = payload.variables.length * horizon;
+  const stride = Math.max(1, Math.ceil(count / FAN_MAX_DRAWN));
+  const drawn = Math.ceil(count / stride);
+  const x = new Float64Array(drawn * (horizon + 1));
+  const y = new Float32Array(drawn * (horizon + 1));
+  for (let path = 0, line = 0; path < count; path += stride, line += 1) {
+    const start = line * (horizon + 1);
+    x.set(payload.dates, start);
+    y.set(paths.subarray(path * cells + row * horizon, path * cells + (row + 1) * horizon), start);
+    x[start + horizon] = NaN;
+    y[start + horizon] = NaN;
+  }
+  return { x, y, name: "Paths", type: "scattergl", mode: "lines", hoverinfo: "skip", line: { color: rgba(color, 0.08), width: 1 } };
+}
+
+function pathQuantiles(payload, row, quantiles) {
+  const { count, horizon, paths } = payload;
+  const cells = payload.variables.length * horizon;
+  const column = new Float32Array(count);
+  const bands = quantiles.map(() => new Float32Array(horizon));
+  for (let t = 0; t < horizon; t += 1) {
+    for (let path = 0; path < count; path += 1) column[path] = paths[path * cells + row * horizon + t];
+    column.sort();
+    quantiles.forEach((quantile, index) => { bands[index][t] = column[Math.round(quantile * (count - 1))]; });
+  }
+  return bands;
+}
+
+// Mulberry32 uniforms through Box-Muller, so draws repeat for the same design.
+function seededNormal(seed) {
+  let stateBits = seed >>> 0;
+  const uniform = () => {
+    stateBits = (stateBits + 0x6d2b79f5) >>> 0;
+    let t = Math.imul(stateBits ^ (stateBits >>> 15), stateBits | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+  return () => Math.sqrt(-2 * Math.log(1 - uniform())) * Math.cos(2 * Math.PI * uniform());
+}
+
+function rgba(hex, alpha) {
+  const value = parseInt(hex.slice(1), 16);
+  return `rgba(${value >> 16}, ${(value >> 8) & 255}, ${value & 255}, ${alpha})`;
 }
 
 function chartLayout(title) {